@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from dotenv import load_dotenv
 from pathlib import Path
+from time import monotonic
+import logging
 import os
 
 load_dotenv()
@@ -21,11 +24,101 @@ engine = create_engine(
 
 Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replica (اختياري): endpoints القراءة والتقارير تستخدمه بدلاً من الـ primary
+# بدون READ_DATABASE_URL كل شيء يعمل على الـ primary كما هو
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+# أقصى تأخير (ثواني) مقبول للـ replica، أكثر من ذلك يتم الرجوع للـ primary
+READ_REPLICA_MAX_LAG = float(os.getenv("READ_REPLICA_MAX_LAG_SECONDS", "2"))
+# كل كم ثانية يتم فحص تأخير الـ replica (النتيجة محفوظة بين الفحوصات)
+READ_REPLICA_CHECK_INTERVAL = float(os.getenv("READ_REPLICA_CHECK_SECONDS", "5"))
+
+read_engine = create_engine(
+    READ_DATABASE_URL,
+    pool_pre_ping=True,
+    echo=False
+) if READ_DATABASE_URL else None
+
+ReadSession = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
+
+# التأخير = 0 إذا استقبل الـ replica كل الـ WAL (حتى لو لم تحدث كتابة منذ فترة)،
+# وإلا الوقت منذ آخر transaction تم تطبيقه. قاعدة ليست replica (مثلاً Postgres ثاني للتجارب) = 0
+# NULL إذا لم يكن هناك WAL receiver يعمل (الاتصال بالـ primary انقطع): receive_lsn يتوقف عند
+# آخر قيمة ويساوي replay_lsn فيبدو الـ replica محدثاً وهو متوقف
+# (pg_stat_wal_receiver يحتوي على صف فقط أثناء عمل الـ receiver، حتى بدون صلاحية pg_read_all_stats)
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+logger = logging.getLogger(__name__)
+
+_replica_usable = False
+_replica_checked_at = None
+
 class Base(DeclarativeBase):
     pass
 
 def get_db():
     db = Session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def replica_usable() -> bool:
+    """الـ replica متاح وتأخيره ضمن READ_REPLICA_MAX_LAG (يُفحص كل READ_REPLICA_CHECK_INTERVAL)"""
+    global _replica_usable, _replica_checked_at
+
+    if read_engine is None:
+        return False
+
+    now = monotonic()
+    if _replica_checked_at is not None and now - _replica_checked_at < READ_REPLICA_CHECK_INTERVAL:
+        return _replica_usable
+
+    _replica_checked_at = now
+    try:
+        with read_engine.connect() as connection:
+            lag = connection.execute(REPLICA_LAG_SQL).scalar()
+    except SQLAlchemyError as e:
+        if _replica_usable:
+            logger.warning("الـ read replica غير متاح، الرجوع للـ primary: %s", type(e).__name__)
+        _replica_usable = False
+        return False
+
+    if lag is None:
+        if _replica_usable:
+            logger.warning("الـ read replica لا يستقبل WAL من الـ primary، الرجوع للـ primary")
+        _replica_usable = False
+        return False
+
+    lag = float(lag)
+    usable = lag <= READ_REPLICA_MAX_LAG
+    if usable != _replica_usable:
+        if usable:
+            logger.info("الـ read replica متاح (التأخير %.1f ثانية)", lag)
+        else:
+            logger.warning("تأخير الـ read replica %.1f ثانية أكبر من المسموح، الرجوع للـ primary", lag)
+    _replica_usable = usable
+    return usable
+
+
+def open_read_session():
+    """Session على الـ replica إذا كان صالحاً، وإلا على الـ primary"""
+    return ReadSession() if replica_usable() else Session()
+
+
+def get_read_db():
+    """
+    Dependency لـ endpoints القراءة فقط (GET والتقارير)
+    - لا تستخدمها في أي endpoint يكتب: الـ replica للقراءة فقط
+    """
+    db = open_read_session()
     try:
         yield db
     finally:
@@ -0,0 +1,48 @@
+"""
+Migration script to add unique indexes used by the catalog importer
+- products: (CategoryID, Name)
+- product_variants: (ProductID, SizeID, TypeID)
+
+Static_Data/import_catalog.py relies on these indexes for INSERT ... ON CONFLICT.
+If the migration fails, the tables already contain duplicates that must be merged first.
+
+Usage:
+    Run from the Backend directory:
+    python App/Database/migrations/add_catalog_unique_indexes.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from sqlalchemy import text
+from App.Database import db_connect
+
+def add_catalog_unique_indexes():
+    """Create the unique indexes on products and product_variants"""
+
+    engine = db_connect.engine
+
+    with engine.connect() as connection:
+        connection.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_products_category_name
+            ON products ("CategoryID", "Name");
+        """))
+        connection.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_product_variants_product_size_type
+            ON product_variants ("ProductID", "SizeID", "TypeID");
+        """))
+
+        connection.commit()
+        print("✅ Successfully added unique indexes to products and product_variants")
+
+if __name__ == "__main__":
+    print("Starting migration: Adding catalog unique indexes...")
+    try:
+        add_catalog_unique_indexes()
+        print("Migration completed successfully!")
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        sys.exit(1)
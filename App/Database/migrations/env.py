@@ -0,0 +1,54 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from Database.db_connect import Base, engine
+
+# تحميل كل الـ models حتى تكون كل الجداول في Base.metadata
+import Database.models.user_model
+import Database.models.address_zone_model
+import Database.models.payment_model
+import Database.models.shift_model
+import Database.models.product_model
+import Database.models.orders_info_model
+import Database.models.order_item_model
+import Database.models.idempotency_model
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """توليد SQL فقط بدون اتصال (alembic upgrade head --sql)"""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        compare_type=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,178 @@
+"""baseline schema
+
+الجداول كما كانت تُنشأ بـ Base.metadata.create_all في main.py.
+قاعدة بيانات موجودة بالفعل: alembic stamp 0001 (بعد add_catalog_unique_indexes.py)
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('categories',
+    sa.Column('CategoryID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('CategoryName', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('CategoryID'),
+    sa.UniqueConstraint('CategoryName')
+    )
+    op.create_table('delivery_zone',
+    sa.Column('ZoneID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('ZoneName', sa.String(length=100), nullable=False),
+    sa.Column('DeliveryCost', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('ZoneID'),
+    sa.UniqueConstraint('ZoneName')
+    )
+    op.create_table('idempotency_keys',
+    sa.Column('Key', sa.String(length=255), nullable=False),
+    sa.Column('RequestHash', sa.String(length=64), nullable=False),
+    sa.Column('StatusCode', sa.Integer(), nullable=True),
+    sa.Column('ResponseBody', sa.JSON(), nullable=True),
+    sa.Column('CreatedAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('ExpiresAt', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('Key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_ExpiresAt'), 'idempotency_keys', ['ExpiresAt'], unique=False)
+    op.create_table('payment_method',
+    sa.Column('PaymentID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('PaymentName', sa.String(length=50), nullable=False),
+    sa.Column('IsActive', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('PaymentID'),
+    sa.UniqueConstraint('PaymentName')
+    )
+    op.create_table('shifts',
+    sa.Column('ShiftID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('Shift_Date', sa.Date(), nullable=False),
+    sa.Column('Shift_Number', sa.String(length=10), nullable=False),
+    sa.Column('Start_Time', sa.Time(), nullable=False),
+    sa.Column('End_Time', sa.Time(), nullable=True),
+    sa.Column('IsActive', sa.Boolean(), server_default='true', nullable=False),
+    sa.PrimaryKeyConstraint('ShiftID'),
+    sa.UniqueConstraint('Shift_Date', 'Shift_Number', name='unique_daily_shift')
+    )
+    op.create_index(op.f('ix_shifts_Shift_Date'), 'shifts', ['Shift_Date'], unique=False)
+    op.create_table('sizes',
+    sa.Column('SizeID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('SizeName', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('SizeID'),
+    sa.UniqueConstraint('SizeName')
+    )
+    op.create_table('types',
+    sa.Column('TypeID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('TypeName', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('TypeID'),
+    sa.UniqueConstraint('TypeName')
+    )
+    op.create_table('users',
+    sa.Column('UserID', sa.UUID(), nullable=False),
+    sa.Column('FName', sa.String(), nullable=False),
+    sa.Column('LName', sa.String(), nullable=False),
+    sa.Column('PhoneNumber', sa.String(), nullable=False),
+    sa.Column('Email', sa.String(), nullable=True),
+    sa.Column('createdAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('lastLogin', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('UserID'),
+    sa.UniqueConstraint('PhoneNumber')
+    )
+    op.create_table('address',
+    sa.Column('AddressID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('UserID', sa.UUID(), nullable=False),
+    sa.Column('RecipientName', sa.String(length=50), nullable=False),
+    sa.Column('Street', sa.String(length=100), nullable=False),
+    sa.Column('Building', sa.String(length=100), nullable=False),
+    sa.Column('City', sa.String(length=100), nullable=False),
+    sa.Column('RecipientPhone', sa.String(length=20), nullable=False),
+    sa.Column('Phone2', sa.String(length=20), nullable=True),
+    sa.Column('DeliveryNotes', sa.Text(), nullable=True),
+    sa.Column('ZoneID', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['UserID'], ['users.UserID'], ),
+    sa.ForeignKeyConstraint(['ZoneID'], ['delivery_zone.ZoneID'], ),
+    sa.PrimaryKeyConstraint('AddressID')
+    )
+    op.create_table('products',
+    sa.Column('ProductID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('CategoryID', sa.Integer(), nullable=False),
+    sa.Column('Name', sa.String(length=50), nullable=False),
+    sa.Column('Description', sa.Text(), nullable=False),
+    sa.Column('ImageUrl', sa.String(length=255), nullable=False),
+    sa.ForeignKeyConstraint(['CategoryID'], ['categories.CategoryID'], ),
+    sa.PrimaryKeyConstraint('ProductID')
+    )
+    op.create_index('uq_products_category_name', 'products', ['CategoryID', 'Name'], unique=True)
+    op.create_table('orders',
+    sa.Column('OrderID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('UserID', sa.UUID(), nullable=False),
+    sa.Column('AddressID', sa.Integer(), nullable=False),
+    sa.Column('PaymentID', sa.Integer(), nullable=False),
+    sa.Column('ShiftID', sa.Integer(), nullable=False),
+    sa.Column('OrderNumber', sa.Integer(), nullable=False),
+    sa.Column('OrderTimestamp', sa.DateTime(), nullable=False, comment='وقت إنشاء الطلب'),
+    sa.Column('DeliveryFee', sa.Numeric(precision=10, scale=2), nullable=False, comment='رسوم التوصيل'),
+    sa.Column('TotalPrice', sa.Numeric(precision=10, scale=2), nullable=False, comment='السعر الإجمالي'),
+    sa.Column('OrderStatus', sa.Enum('PREPARING', 'IN_DELIVERY', 'DELIVERED', 'CANCELLED', name='order_status_enum', create_constraint=True), nullable=False, comment='حالة الطلب الحالية'),
+    sa.Column('OrderNotes', sa.Text(), nullable=True),
+    sa.Column('ExternalNotes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['AddressID'], ['address.AddressID'], ),
+    sa.ForeignKeyConstraint(['PaymentID'], ['payment_method.PaymentID'], ),
+    sa.ForeignKeyConstraint(['ShiftID'], ['shifts.ShiftID'], ),
+    sa.ForeignKeyConstraint(['UserID'], ['users.UserID'], ),
+    sa.PrimaryKeyConstraint('OrderID')
+    )
+    op.create_table('product_variants',
+    sa.Column('VariantID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('ProductID', sa.Integer(), nullable=False),
+    sa.Column('SizeID', sa.Integer(), nullable=False),
+    sa.Column('TypeID', sa.Integer(), nullable=False),
+    sa.Column('Price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('IsAvailable', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['ProductID'], ['products.ProductID'], ),
+    sa.ForeignKeyConstraint(['SizeID'], ['sizes.SizeID'], ),
+    sa.ForeignKeyConstraint(['TypeID'], ['types.TypeID'], ),
+    sa.PrimaryKeyConstraint('VariantID')
+    )
+    op.create_index('uq_product_variants_product_size_type', 'product_variants', ['ProductID', 'SizeID', 'TypeID'], unique=True)
+    op.create_table('order_items',
+    sa.Column('OrderItemID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('OrderID', sa.Integer(), nullable=False),
+    sa.Column('VariantID', sa.Integer(), nullable=False),
+    sa.Column('Quantity', sa.Integer(), nullable=False),
+    sa.Column('UnitPrice', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('Subtotal', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('IsSada', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['OrderID'], ['orders.OrderID'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['VariantID'], ['product_variants.VariantID'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('OrderItemID')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('order_items')
+    op.drop_index('uq_product_variants_product_size_type', table_name='product_variants')
+    op.drop_table('product_variants')
+    op.drop_table('orders')
+    op.drop_index('uq_products_category_name', table_name='products')
+    op.drop_table('products')
+    op.drop_table('address')
+    op.drop_table('users')
+    op.drop_table('types')
+    op.drop_table('sizes')
+    op.drop_index(op.f('ix_shifts_Shift_Date'), table_name='shifts')
+    op.drop_table('shifts')
+    op.drop_table('payment_method')
+    op.drop_index(op.f('ix_idempotency_keys_ExpiresAt'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    op.drop_table('delivery_zone')
+    op.drop_table('categories')
+    sa.Enum(name='order_status_enum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""address UserID index
+
+عرض عناوين المستخدم والتحقق من ملكية العنوان بدون scan لجدول العناوين.
+يتم إنشاء الـ index بـ CONCURRENTLY حتى لا يتم قفل الجدول أثناء التشغيل.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_address_UserID', 'address', ['UserID'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_address_UserID', table_name='address',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,56 @@
+"""product search: NormalizedName + trigram index
+
+بحث المنتجات بالاسم (/products/search) بعد توحيد الكتابة العربية:
+- عمود NormalizedName = normalize_arabic(Name) ويتم حسابه للمنتجات الموجودة هنا بنفس القواعد
+- extension pg_trgm و GIN index (gin_trgm_ops) لـ LIKE '%..%' و similarity
+  (CREATE EXTENSION يتطلب صلاحية على قاعدة البيانات)
+- الـ index يتم إنشاؤه بـ CONCURRENTLY حتى لا يتم قفل جدول المنتجات أثناء التشغيل
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# نفس قواعد Service/Search/arabic_text.py وقت كتابة هذا الـ migration
+# (نسخة ثابتة هنا حتى لا يتغير الـ migration مع تعديل الكود لاحقاً)
+REPLACE_FROM = "أإآٱةىؤئ"
+REPLACE_TO = "ااااهيوي"
+# التشكيل (U+064B - U+065F) + الألف الخنجرية + التطويل
+REMOVE_PATTERN = "[\u064B-\u065F\u0670\u0640]"
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('NormalizedName', sa.String(length=50), nullable=False, server_default=''))
+
+    op.execute(sa.text(
+        'UPDATE products SET "NormalizedName" = btrim(regexp_replace('
+        "lower(translate(regexp_replace(\"Name\", :remove, '', 'g'), :replace_from, :replace_to)), "
+        "'\\s+', ' ', 'g'))"
+    ).bindparams(remove=REMOVE_PATTERN, replace_from=REPLACE_FROM, replace_to=REPLACE_TO))
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_products_NormalizedName_trgm', 'products', ['NormalizedName'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'NormalizedName': 'gin_trgm_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_products_NormalizedName_trgm', table_name='products',
+                      postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('products', 'NormalizedName')
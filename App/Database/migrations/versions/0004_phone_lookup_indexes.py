@@ -0,0 +1,54 @@
+"""phone lookup indexes
+
+البحث عن العميل بجزء من رقم الهاتف (/users/lookup):
+- text_pattern_ops على PhoneNumber و RecipientPhone لـ LIKE 'prefix%' (مستقل عن الـ collation)
+- index على reverse(...) لنفس الأعمدة: البحث بآخر الأرقام يصبح LIKE 'reversed%'
+- (UserID, OrderTimestamp) على الطلبات: آخر طلب للمستخدم وقائمة طلباته بدون scan
+يتم إنشاء الـ indexes بـ CONCURRENTLY حتى لا يتم قفل الجداول أثناء التشغيل.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_PhoneNumber_pattern', 'users', ['PhoneNumber'], unique=False,
+                        postgresql_ops={'PhoneNumber': 'text_pattern_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_users_PhoneNumber_reverse', 'users',
+                        [sa.text('reverse("PhoneNumber") text_pattern_ops')], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_address_RecipientPhone_pattern', 'address', ['RecipientPhone'], unique=False,
+                        postgresql_ops={'RecipientPhone': 'text_pattern_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_address_RecipientPhone_reverse', 'address',
+                        [sa.text('reverse("RecipientPhone") text_pattern_ops')], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_orders_UserID_OrderTimestamp', 'orders', ['UserID', 'OrderTimestamp'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ('ix_orders_UserID_OrderTimestamp', 'orders'),
+            ('ix_address_RecipientPhone_reverse', 'address'),
+            ('ix_address_RecipientPhone_pattern', 'address'),
+            ('ix_users_PhoneNumber_reverse', 'users'),
+            ('ix_users_PhoneNumber_pattern', 'users'),
+        ):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
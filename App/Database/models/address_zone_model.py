@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Text, Numeric, ForeignKey
+from sqlalchemy import String, Integer, Text, Numeric, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from typing import List
@@ -12,6 +12,12 @@ from ..db_connect import Base
 #==============================
 class Address(Base):
     __tablename__ = "address"
+    # عرض عناوين المستخدم (WHERE UserID = ...)
+    # البحث بأول أرقام هاتف المستلم (/users/lookup)، وبآخر الأرقام: ix_address_RecipientPhone_reverse بعد الـ class
+    __table_args__ = (
+        Index("ix_address_UserID", "UserID"),
+        Index("ix_address_RecipientPhone_pattern", "RecipientPhone", postgresql_ops={"RecipientPhone": "text_pattern_ops"}),
+    )
     AddressID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     UserID: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.UserID"), nullable=False)
 
@@ -37,6 +43,13 @@ class Address(Base):
     def __repr__(self):
         return f"<Address(id={self.AddressID}, recipient_name='{self.RecipientName}')>"
 
+# البحث بآخر أرقام هاتف المستلم (Postgres فقط، نفس الـ index في migration 0004)
+Index(
+    "ix_address_RecipientPhone_reverse",
+    func.reverse(Address.RecipientPhone).label("RecipientPhone_reverse"),
+    postgresql_ops={"RecipientPhone_reverse": "text_pattern_ops"},
+).ddl_if(dialect="postgresql")
+
 #==============================
 # DeliveryZone table
 #==============================
@@ -0,0 +1,28 @@
+from sqlalchemy import String, Integer, DateTime, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from ..db_connect import Base
+
+"""
+مفاتيح منع التكرار (Idempotency-Key):
+- العميل يرسل نفس المفتاح عند إعادة المحاولة
+- نخزن الاستجابة الأصلية ونعيدها بدلاً من إنشاء طلب جديد
+- المفتاح له مدة صلاحية قصيرة (ExpiresAt)
+"""
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    Key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    RequestHash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # NULL أثناء تنفيذ الطلب الأصلي
+    StatusCode: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ResponseBody: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    CreatedAt: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    ExpiresAt: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key='{self.Key}', status={self.StatusCode})>"
@@ -1,5 +1,5 @@
 # orders_info_model.py
-from sqlalchemy import Integer, Numeric, DateTime, Enum as SQLEnum, ForeignKey, Text
+from sqlalchemy import Integer, Numeric, DateTime, Enum as SQLEnum, ForeignKey, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -28,6 +28,10 @@ class OrderStatus(enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    # طلبات المستخدم وآخر طلب له (WHERE UserID = ... ORDER BY OrderTimestamp DESC)
+    __table_args__ = (
+        Index("ix_orders_UserID_OrderTimestamp", "UserID", "OrderTimestamp"),
+    )
     
     # Primary Key
     OrderID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Text, Boolean, Numeric, ForeignKey
+from sqlalchemy import String, Integer, Text, Boolean, Numeric, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import List
 from decimal import Decimal
@@ -28,9 +28,18 @@ class Category(Base):
 #==============================
 class Products(Base):
      __tablename__ = "products"
+     # اسم المنتج فريد داخل القسم (يعتمد عليه استيراد المنيو بـ ON CONFLICT)
+     __table_args__ = (
+          Index("uq_products_category_name", "CategoryID", "Name", unique=True),
+          # البحث بالاسم (/products/search): ILIKE '%..%' و similarity على الاسم بعد التوحيد
+          Index("ix_products_NormalizedName_trgm", "NormalizedName",
+                postgresql_using="gin", postgresql_ops={"NormalizedName": "gin_trgm_ops"}),
+     )
      ProductID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
      CategoryID: Mapped[int] = mapped_column(Integer, ForeignKey("categories.CategoryID"), nullable=False)
      Name: Mapped[str] = mapped_column(String(50), nullable=False)
+     # normalize_arabic(Name) من Service.Search - يتم تحديثه مع كل تعديل على Name
+     NormalizedName: Mapped[str] = mapped_column(String(50), nullable=False, server_default="")
      Description: Mapped[str] = mapped_column(Text)
      ImageUrl: Mapped[str] = mapped_column(String(255),nullable=False)
 
@@ -53,6 +62,10 @@ class Products(Base):
 #==============================
 class ProductVariant(Base):
      __tablename__ = "product_variants"
+     # لكل منتج نسخة واحدة فقط لكل (حجم، نوع)
+     __table_args__ = (
+          Index("uq_product_variants_product_size_type", "ProductID", "SizeID", "TypeID", unique=True),
+     )
      VariantID: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
      ProductID: Mapped[int] = mapped_column(Integer, ForeignKey("products.ProductID"), nullable=False)
      SizeID: Mapped[int] = mapped_column(Integer, ForeignKey("sizes.SizeID"), nullable=False)
@@ -4,7 +4,7 @@
 
 """
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from typing import List
 from datetime import datetime
@@ -23,6 +23,11 @@ class user:
 
 class User(Base):
     __tablename__ = "users"
+    # البحث بأول أرقام الهاتف (/users/lookup): LIKE 'prefix%' مع أي collation
+    # البحث بآخر الأرقام: ix_users_PhoneNumber_reverse بعد تعريف الـ class
+    __table_args__ = (
+        Index("ix_users_PhoneNumber_pattern", "PhoneNumber", postgresql_ops={"PhoneNumber": "text_pattern_ops"}),
+    )
     UserID: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     FName: Mapped[str] = mapped_column(nullable=False)
     LName: Mapped[str] = mapped_column(nullable=False)
@@ -42,3 +47,12 @@ class User(Base):
     
     def __repr__(self):
         return f"<User(UserID={self.UserID}, phone={self.PhoneNumber})>"
+
+
+# البحث بآخر أرقام الهاتف: reverse("PhoneNumber") LIKE 'reversed%'
+# (Postgres فقط: SQLite لا يدعم reverse، نفس الـ index في migration 0004)
+Index(
+    "ix_users_PhoneNumber_reverse",
+    func.reverse(User.PhoneNumber).label("PhoneNumber_reverse"),
+    postgresql_ops={"PhoneNumber_reverse": "text_pattern_ops"},
+).ddl_if(dialect="postgresql")
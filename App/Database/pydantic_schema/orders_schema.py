@@ -36,17 +36,21 @@ class ProductVariantInfo(BaseModel):
     @classmethod
     def extract_from_relationships(cls, data: Any) -> Any:
         """استخراج البيانات من العلاقات في ProductVariant Model"""
-        if hasattr(data, 'VariantID'):
-            # إذا كان data هو ProductVariant object
-            return {
-                'VariantID': data.VariantID,
-                'ProductID': data.ProductID,
-                'Name': data.products.Name if hasattr(data, 'products') and data.products else None,
-                'SizeName': data.sizes.SizeName if hasattr(data, 'sizes') and data.sizes else None,
-                'TypeName': data.types.TypeName if hasattr(data, 'types') and data.types else None,
-                'Price': data.Price
-            }
-        return data
+        if isinstance(data, dict):
+            return data
+
+        # إذا كان data هو ProductVariant object
+        products = getattr(data, 'products', None)
+        sizes = getattr(data, 'sizes', None)
+        types = getattr(data, 'types', None)
+        return {
+            'VariantID': data.VariantID,
+            'ProductID': data.ProductID,
+            'Name': products.Name if products else None,
+            'SizeName': sizes.SizeName if sizes else None,
+            'TypeName': types.TypeName if types else None,
+            'Price': data.Price
+        }
     
     class Config:
         from_attributes = True
@@ -161,4 +165,35 @@ class OrderListResponse(BaseModel):
                 "OrderTimestamp": "2024-11-03T10:30:00",
                 "is_completed": False
             }
-        }
\ No newline at end of file
+        }
+
+
+# =========================================
+#  Bulk Status Update
+# =========================================
+
+class OrderStatusBulkUpdate(BaseModel):
+    OrderIDs: List[int] = Field(..., min_length=1, max_length=500, description="أرقام الطلبات المراد تحديثها")
+    NewStatus: OrderStatus = Field(..., description="الحالة الجديدة")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "OrderIDs": [120, 121, 125],
+                "NewStatus": "in_delivery"
+            }
+        }
+
+
+class OrderStatusBulkItem(BaseModel):
+    OrderID: int
+    Updated: bool
+    CurrentStatus: Optional[OrderStatus] = Field(None, description="الحالة بعد التنفيذ (None إذا كان الطلب غير موجود)")
+    Reason: Optional[str] = Field(None, description="سبب الرفض")
+
+
+class OrderStatusBulkResponse(BaseModel):
+    NewStatus: OrderStatus
+    UpdatedCount: int
+    RejectedCount: int
+    results: List[OrderStatusBulkItem]
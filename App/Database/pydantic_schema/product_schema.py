@@ -1,6 +1,8 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 from decimal import Decimal
-from typing import Optional, List
+from typing import Optional, List, Dict
+
+from Service.Images.image_urls import image_variant_urls
 
 class BaseSchema(BaseModel):
      model_config = ConfigDict(from_attributes=True)
@@ -49,6 +51,16 @@ class ProductResponse(ProductBase):
 
      model_config = ConfigDict(from_attributes=True)
 
+     @computed_field
+     @property
+     def ImageVariants(self) -> Optional[Dict[str, str]]:
+          """
+          روابط الصورة بمقاسات مختلفة: thumb / medium / full، و original = الصورة الأصلية
+          كلها تحتوي على hash المحتوى (Cache-Control immutable)،
+          و ImageUrl يبقى المسار المخزن كما هو (نفس قيمة الإنشاء والتعديل)
+          """
+          return image_variant_urls(self.ImageUrl)
+
 class ProductWithVariants(ProductResponse):
      variants: List["ProductVariantResponse"] = []
 
@@ -5,9 +5,12 @@
 """
 from pydantic import BaseModel, Field, field_validator, ConfigDict, EmailStr
 from pydantic.types import UUID4
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+from .address_zone_schema import AddressWithZone
+from .orders_schema import OrderListResponse
+
 class UserBase(BaseModel):
     FName: str
     LName: str
@@ -59,6 +62,21 @@ class UserResponse(UserBase):
     lastLogin: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
+class LoginResponse(UserResponse):
+    """
+    استجابة تسجيل الدخول: بيانات المستخدم + session token موقّع
+    (يُرسل في Authorization: Bearer <token> لطلبات الطلبات، None إذا كانت الـ tokens غير مفعلة)
+    """
+    access_token: Optional[str] = None
+    token_type: str = "bearer"
+
+class UserLookupResponse(UserResponse):
+    """
+    نتيجة البحث برقم الهاتف (الكاشير): المستخدم + عناوينه مع المناطق + آخر طلب
+    """
+    addresses: List[AddressWithZone] = []
+    last_order: Optional[OrderListResponse] = None
+
 class UserGetResponse(BaseModel):
     """
     استجابة GET لبيانات المستخدم - الاسم والبريد والهاتف فقط
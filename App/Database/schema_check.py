@@ -0,0 +1,71 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from pathlib import Path
+import logging
+import re
+import os
+
+"""
+التحقق من إصدار الـ schema عند التشغيل (بدلاً من create_all في كل worker):
+- الإصدار المطلوب = آخر migration في Database/migrations/versions (بدون تحميل Alembic)
+- الإصدار الحالي = جدول alembic_version (استعلام واحد)
+- عند عدم التطابق يتوقف التشغيل برسالة واضحة: alembic upgrade head
+
+SKIP_SCHEMA_CHECK=1 لتعطيل التحقق (مثلاً مع SQLite في التجارب المحلية)
+"""
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = Path(__file__).resolve().parent / "migrations" / "versions"
+
+_REVISION_RE = re.compile(r"^revision(?:\s*:\s*str)?\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision(?:\s*:[^=]+)?\s*=\s*['\"]?([^'\"\n]+?)['\"]?\s*$", re.MULTILINE)
+
+
+class SchemaVersionError(RuntimeError):
+    """إصدار قاعدة البيانات لا يطابق الـ migrations الموجودة في الكود"""
+
+
+def expected_revision() -> str:
+    """آخر revision (الـ head) من ملفات الـ migrations"""
+    revisions = {}
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_RE.search(source)
+        down = _DOWN_REVISION_RE.search(source)
+        if revision:
+            revisions[revision.group(1)] = down.group(1) if down and down.group(1) != "None" else None
+
+    heads = set(revisions) - set(revisions.values())
+    if len(heads) != 1:
+        raise SchemaVersionError(f"يجب وجود head واحد فقط في الـ migrations، الموجود: {sorted(heads)}")
+    return heads.pop()
+
+
+def current_revision(engine: Engine) -> str | None:
+    with engine.connect() as connection:
+        try:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except SQLAlchemyError:
+            return None
+
+
+def check_schema_revision(engine: Engine) -> None:
+    """
+    Raises:
+        SchemaVersionError: قاعدة البيانات ليست على آخر migration
+    """
+    if os.getenv("SKIP_SCHEMA_CHECK", "").lower() in ("1", "true", "yes"):
+        logger.warning("تم تعطيل التحقق من إصدار قاعدة البيانات (SKIP_SCHEMA_CHECK)")
+        return
+
+    expected = expected_revision()
+    current = current_revision(engine)
+    if current != expected:
+        raise SchemaVersionError(
+            f"إصدار قاعدة البيانات {current or 'غير معروف'} لا يطابق المطلوب {expected}. "
+            f"قم بتشغيل: cd App && alembic upgrade head"
+        )
+
+    logger.info("إصدار قاعدة البيانات مطابق: %s", current)
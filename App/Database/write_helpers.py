@@ -0,0 +1,71 @@
+from sqlalchemy import insert, update, select, inspect
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+"""
+الكتابة بجملة واحدة مع RETURNING بدلاً من (SELECT ثم commit ثم refresh):
+- insert_returning / update_returning يرجعان dict بأسماء الأعمدة (جاهز لـ response_model)
+- update_returning يحل محل "البحث عن الصف ثم تعديله": None = لا يوجد صف مطابق
+- الـ caller مسؤول عن commit و rollback كالمعتاد
+
+الاستخدام داخل الـ router:
+    category = update_returning(db, Category, [Category.CategoryID == category_id], {"CategoryName": name})
+    if category is None:
+        raise HTTPException(404, ...)
+    db.commit()
+    return category
+"""
+
+_model_columns: Dict[type, Tuple] = {}
+
+
+def model_columns(model) -> Tuple:
+    """كل أعمدة الجدول كـ ORM attributes (لـ RETURNING أو SELECT)"""
+    columns = _model_columns.get(model)
+    if columns is None:
+        columns = tuple(getattr(model, attr.key) for attr in inspect(model).column_attrs)
+        _model_columns[model] = columns
+    return columns
+
+
+def insert_returning(db: Session, model, values: Mapping[str, Any],
+                     columns: Optional[Sequence] = None) -> Dict[str, Any]:
+    """
+    INSERT ... RETURNING (الـ defaults في الـ model و server defaults ترجع مع الصف)
+
+    Args:
+        columns: أعمدة الاستجابة (افتراضياً كل أعمدة الجدول)
+    """
+    row = db.execute(
+        insert(model).values(**values).returning(*(columns or model_columns(model)))
+    ).one()
+    return row._asdict()
+
+
+def update_returning(db: Session, model, criteria: Sequence, values: Mapping[str, Any],
+                     columns: Optional[Sequence] = None) -> Optional[Dict[str, Any]]:
+    """
+    UPDATE ... WHERE criteria RETURNING
+
+    Args:
+        criteria: شروط الصف (عادةً الـ primary key + شروط الملكية أو الحالة)
+        values: الأعمدة المراد تعديلها، فارغة = SELECT فقط بنفس الشروط
+        columns: أعمدة الاستجابة (افتراضياً كل أعمدة الجدول)
+
+    Returns:
+        الصف بعد التعديل، أو None إذا لم يطابق أي صف الشروط
+    """
+    columns = columns or model_columns(model)
+    if values:
+        stmt = (
+            update(model)
+            .where(*criteria)
+            .values(**values)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*columns).where(*criteria)
+
+    row = db.execute(stmt).first()
+    return row._asdict() if row is not None else None
@@ -0,0 +1,119 @@
+"""
+حفظ النتائج كـ baseline ومقارنة أي تشغيل جديد بها
+(تُستخدم لنتائج اختبار الحمل وللـ benchmarks)
+
+شكل ملف النتائج:
+    {"kind": "load", "results": {"<name>": {"p50": ..., "p95": ..., "rps": ...}}}
+
+cd App
+python Performance/baseline.py save Performance/results/load_20250101_120000.json
+python Performance/baseline.py compare Performance/results/load_20250101_130000.json --threshold 15
+
+compare يرجع exit code = 1 عند وجود تراجع (مناسب للـ CI)
+"""
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import json
+import sys
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# المقاييس التي يعتبر ارتفاعها تراجعاً (زمن) والعكس (throughput)
+LOWER_IS_BETTER = ("mean", "median", "p50", "p95", "p99", "min")
+HIGHER_IS_BETTER = ("rps", "ops")
+
+# فروق أصغر من هذا (ms) لا تُحسب تراجعاً (ضوضاء القياس)
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+def load_results(path: Path) -> Dict:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def baseline_path(kind: str) -> Path:
+    return BASELINES_DIR / f"{kind}.json"
+
+
+def save_baseline(results: Dict) -> Path:
+    path = baseline_path(results["kind"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def compare(current: Dict, baseline: Dict, threshold_pct: float,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[str]:
+    """
+    مقارنة كل مقياس مشترك بين التشغيلين
+
+    Returns:
+        قائمة برسائل التراجع (فارغة إذا لم يوجد تراجع)
+    """
+    regressions = []
+    limit = threshold_pct / 100
+
+    for name, metrics in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        if metrics.get("failures", 0) > 0 and base.get("failures", 0) == 0:
+            regressions.append(f"{name}: {metrics['failures']} failures (baseline had none)")
+
+        for metric in LOWER_IS_BETTER:
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            if new - old > min_delta_ms and (new - old) / old > limit:
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} (+{(new - old) / old:.0%})")
+
+        for metric in HIGHER_IS_BETTER:
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            if (old - new) / old > limit:
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} (-{(old - new) / old:.0%})")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save or compare performance baselines")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    save = sub.add_parser("save", help="store a results file as the baseline for its kind")
+    save.add_argument("results", type=Path)
+
+    cmp = sub.add_parser("compare", help="compare a results file against the baseline")
+    cmp.add_argument("results", type=Path)
+    cmp.add_argument("--baseline", type=Path, help="default: baselines/<kind>.json")
+    cmp.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    cmp.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+
+    args = parser.parse_args()
+    current = load_results(args.results)
+
+    if args.command == "save":
+        print(f"✅ Baseline saved to: {save_baseline(current)}")
+        return
+
+    base_file = args.baseline or baseline_path(current["kind"])
+    if not base_file.exists():
+        print(f"⚠️ No baseline found at: {base_file}")
+        sys.exit(2)
+
+    regressions = compare(current, load_results(base_file), args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over {args.threshold}%:")
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+
+    print(f"✅ No regressions over {args.threshold}% (baseline: {base_file})")
+
+
+if __name__ == "__main__":
+    main()
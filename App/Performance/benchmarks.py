@@ -0,0 +1,332 @@
+"""
+Micro-benchmarks للدوال الأكثر استهلاكاً للـ CPU
+
+- price_order_items: تسعير طلب بعدد كبير من الأصناف
+- ProductSearchIndex.search: بحث أثناء الكتابة في كتالوج 500 / 5,000 منتج
+- get_shift_report_data: شفت به 100 / 1,000 / 10,000 طلب
+- extract_order_data + create_invoice_in_memory: فاتورة طلب به 30 صنف
+- create_shift_report_in_memory
+- تحويل OrderResponse إلى JSON (Pydantic)
+
+البيانات المطلوبة للدوال التي تقرأ من قاعدة البيانات يتم إدخالها داخل Transaction
+ويتم عمل rollback في النهاية (لا يتغير شيء في قاعدة البيانات)
+
+النتائج تحفظ في Performance/results/bench_<timestamp>.json وتقارن بالـ baseline عبر baseline.py
+
+cd App
+python Performance/benchmarks.py
+python Performance/benchmarks.py --quick --compare --threshold 15
+python Performance/benchmarks.py --no-db --only pricing
+"""
+from collections import namedtuple
+from datetime import datetime, date, time as dt_time
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict
+import statistics
+import argparse
+import platform
+import random
+import json
+import uuid
+import time
+import sys
+
+# إضافة المجلد الأب (App) إلى Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from baseline import compare, load_results, baseline_path, RESULTS_DIR
+
+from Database.pydantic_schema.orders_schema import OrderItemCreate, OrderResponse
+from Service.Orders import price_order_items
+from Service.Cache.price_table import PriceTable
+from Service.Cache.search_index import ProductSearchIndex
+from Service.Search import normalize_arabic
+from Service.CreateDocx import create_invoice_in_memory
+from Service.CreateDocx.shift_report_docx import create_shift_report_in_memory
+
+SHIFT_SIZES = (100, 1_000, 10_000)
+INVOICE_ITEMS = 30
+
+
+def measure(fn: Callable, repeat: int, min_round_seconds: float = 0.2) -> Dict:
+    """
+    تشغيل الدالة على عدة جولات (مثل timeit)
+
+    عدد مرات التشغيل في كل جولة يُحسب تلقائياً حتى تستغرق الجولة min_round_seconds تقريباً
+    النتائج بالـ ms لكل استدعاء
+    """
+    start = time.perf_counter()
+    fn()
+    single = time.perf_counter() - start
+    number = max(1, int(min_round_seconds / single)) if single > 0 else 1000
+
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - start) / number * 1000)
+
+    return {
+        "mean": round(statistics.mean(per_call), 4),
+        "median": round(statistics.median(per_call), 4),
+        "min": round(min(per_call), 4),
+        "rounds": repeat,
+        "number": number,
+    }
+
+
+# ======================================
+# بيانات بدون قاعدة بيانات
+# ======================================
+
+def pricing_case(item_count: int):
+    variants = PriceTable((
+        SimpleNamespace(VariantID=variant_id, Price=Decimal(random.randint(5, 80)), IsAvailable=True, SizeName="افتراضي")
+        for variant_id in range(1, 201)
+    ), version=1)
+    items = [
+        OrderItemCreate(VariantID=random.randint(1, 200), Quantity=random.randint(1, 5))
+        for _ in range(item_count)
+    ]
+    return lambda: price_order_items(items, variants)
+
+
+SEARCH_WORDS = ("ساندوتش", "فول", "طعمية", "بطاطس", "جبنة", "بيض", "سجق", "كبدة", "شاورما", "فطيرة")
+SearchRow = namedtuple("SearchRow", "ProductID CategoryID Name Description ImageUrl NormalizedName")
+
+
+def search_case(product_count: int):
+    rows = []
+    for product_id in range(1, product_count + 1):
+        name = " ".join(random.sample(SEARCH_WORDS, 3)) + f" {product_id}"
+        rows.append(SearchRow(product_id, 1, name, None, "bench.jpg", normalize_arabic(name)))
+    index = ProductSearchIndex(rows)
+    return lambda: index.search(normalize_arabic("طعميه ف"), 20)
+
+
+def order_response_payload(item_count: int) -> Dict:
+    items = [
+        {
+            "OrderItemID": i,
+            "OrderID": 1,
+            "VariantID": i,
+            "Quantity": 2,
+            "UnitPrice": Decimal("12.50"),
+            "Subtotal": Decimal("25.00"),
+            "IsSada": False,
+            "product_variants": {
+                "VariantID": i, "ProductID": i, "Name": f"ساندوتش {i}",
+                "SizeName": "افتراضي", "TypeName": "شامي", "Price": Decimal("12.50"),
+            },
+        }
+        for i in range(1, item_count + 1)
+    ]
+    return {
+        "OrderID": 1, "OrderNumber": 1, "UserID": uuid.uuid4(), "AddressID": 1, "PaymentID": 1,
+        "ShiftID": 1, "OrderTimestamp": datetime.now(), "OrderStatus": "preparing",
+        "OrderNotes": None, "ExternalNotes": None,
+        "DeliveryFee": Decimal("20.00"), "TotalPrice": Decimal("25.00") * item_count + 20,
+        "is_completed": False, "is_cancelled": False, "order_items": items,
+    }
+
+
+def invoice_payload(item_count: int) -> Dict:
+    return {
+        "order_number": 17, "order_date": "2025-01-01 12:00", "order_status": "preparing",
+        "shift_number": "1", "shift_date": "2025-01-01",
+        "recipient_name": "محمد أحمد", "recipient_phone": "01012345678", "recipient_phone2": "",
+        "city": "القاهرة", "street": "شارع التحرير", "building": "12", "delivery_notes": "الدور الثالث",
+        "zone_name": "منطقة أ", "zone_delivery_cost": 20.0,
+        "payment_method": "كاش", "payment_id": 1,
+        "order_notes": "لا توجد ملاحظات", "external_notes": "",
+        "delivery_fee": 20.0, "total_price": 25.0 * item_count + 20,
+        "items": [
+            {"product_name": f"ساندوتش {i}", "variant_info": "شامي", "unit_price": 12.5,
+             "quantity": 2, "subtotal": 25.0, "is_sada": i % 5 == 0}
+            for i in range(item_count)
+        ],
+        "items_subtotal": 25.0 * item_count,
+    }
+
+
+def run_pure_benchmarks(results: Dict, repeat: int, selected: Callable[[str], bool]):
+    for count in (30, 1_000):
+        name = f"pricing/{count}_items"
+        if selected(name):
+            results[name] = measure(pricing_case(count), repeat)
+
+    for count in (500, 5_000):
+        name = f"product_search/{count}_products"
+        if selected(name):
+            results[name] = measure(search_case(count), repeat)
+
+    for count in (1, 30):
+        name = f"order_response_json/{count}_items"
+        if selected(name):
+            payload = order_response_payload(count)
+            results[name] = measure(lambda: OrderResponse.model_validate(payload).model_dump_json(), repeat)
+
+    name = f"create_invoice_in_memory/{INVOICE_ITEMS}_items"
+    if selected(name):
+        payload = invoice_payload(INVOICE_ITEMS)
+        results[name] = measure(lambda: create_invoice_in_memory(payload), repeat)
+
+
+# ======================================
+# بيانات في قاعدة البيانات (rollback في النهاية)
+# ======================================
+
+def seed_benchmark_data(connection, shift_sizes) -> Dict:
+    """إدخال بيانات القياس داخل الـ transaction الحالية"""
+    from sqlalchemy import insert, select
+    from Database.models.user_model import User
+    from Database.models.address_zone_model import Address, DeliveryZone
+    from Database.models.payment_model import PaymentMethod
+    from Database.models.shift_model import Shift
+    from Database.models.product_model import Category, Products, ProductVariant, Sizes, Types
+    from Database.models.orders_info_model import Order, OrderStatus
+    from Database.models.order_item_model import OrderItem
+
+    tag = uuid.uuid4().hex[:8]
+
+    def insert_one(model, pk, **values):
+        return connection.execute(insert(model).values(**values).returning(pk)).scalar_one()
+
+    user_id = insert_one(User, User.UserID, UserID=uuid.uuid4(), FName="Bench", LName=tag,
+                         PhoneNumber=f"bench-{tag}")
+    zone_id = insert_one(DeliveryZone, DeliveryZone.ZoneID, ZoneName=f"bench-{tag}", DeliveryCost=Decimal("20"))
+    address_id = insert_one(Address, Address.AddressID, UserID=user_id, RecipientName="Bench", Street="s",
+                            Building="1", City="c", RecipientPhone="01000000000", ZoneID=zone_id)
+    payment_ids = [insert_one(PaymentMethod, PaymentMethod.PaymentID, PaymentName=f"bench-{tag}-{i}")
+                   for i in range(3)]
+
+    category_id = insert_one(Category, Category.CategoryID, CategoryName=f"bench-{tag}")
+    product_id = insert_one(Products, Products.ProductID, CategoryID=category_id, Name=f"bench-{tag}",
+                            Description="bench", ImageUrl="bench.jpg")
+    size_id = insert_one(Sizes, Sizes.SizeID, SizeName=f"bench-{tag}")
+    type_ids = [insert_one(Types, Types.TypeID, TypeName=f"bench-{tag}-{i}") for i in range(INVOICE_ITEMS)]
+    variant_ids = [insert_one(ProductVariant, ProductVariant.VariantID, ProductID=product_id, SizeID=size_id,
+                              TypeID=type_id, Price=Decimal("12.50"), IsAvailable=True)
+                   for type_id in type_ids]
+
+    statuses = list(OrderStatus)
+    shifts = {}
+    for index, size in enumerate(shift_sizes):
+        shift_id = insert_one(Shift, Shift.ShiftID, Shift_Date=date(2000, 1, 1 + index),
+                              Shift_Number=f"b{tag[:4]}{index}", Start_Time=dt_time(8), End_Time=dt_time(16),
+                              IsActive=False)
+        connection.execute(insert(Order), [
+            {
+                "UserID": user_id, "AddressID": address_id, "PaymentID": random.choice(payment_ids),
+                "ShiftID": shift_id, "OrderNumber": number, "OrderTimestamp": datetime(2000, 1, 1),
+                "DeliveryFee": Decimal("20"), "TotalPrice": Decimal(random.randint(30, 400)),
+                "OrderStatus": random.choice(statuses),
+            }
+            for number in range(1, size + 1)
+        ])
+        shifts[size] = shift_id
+
+    invoice_order_id = connection.execute(
+        select(Order.OrderID).where(Order.ShiftID == shifts[shift_sizes[0]]).limit(1)
+    ).scalar_one()
+    connection.execute(insert(OrderItem), [
+        {"OrderID": invoice_order_id, "VariantID": variant_id, "Quantity": 2,
+         "UnitPrice": Decimal("12.50"), "Subtotal": Decimal("25.00"), "IsSada": False}
+        for variant_id in variant_ids
+    ])
+
+    return {"shifts": shifts, "invoice_order_id": invoice_order_id}
+
+
+def run_db_benchmarks(results: Dict, repeat: int, selected: Callable[[str], bool], shift_sizes):
+    from sqlalchemy.orm import Session
+    from Database.db_connect import engine
+    from Service.CreateDocx import extract_order_data
+    from Service.ShiftReport.shift_report_service import get_shift_report_data
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        seeded = seed_benchmark_data(connection, shift_sizes)
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+        for size, shift_id in seeded["shifts"].items():
+            name = f"get_shift_report_data/{size}_orders"
+            if selected(name):
+                results[name] = measure(lambda: get_shift_report_data(db, shift_id), repeat)
+            db.expunge_all()
+
+        name = "create_shift_report_in_memory"
+        if selected(name):
+            report = get_shift_report_data(db, seeded["shifts"][shift_sizes[-1]])
+            results[name] = measure(lambda: create_shift_report_in_memory(report), repeat)
+
+        name = f"extract_order_data/{INVOICE_ITEMS}_items"
+        if selected(name):
+            def extract():
+                extract_order_data(db, seeded["invoice_order_id"])
+                db.expunge_all()
+            results[name] = measure(extract, repeat)
+
+        db.close()
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for hot service functions")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per benchmark")
+    parser.add_argument("--only", help="run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="skip the 10,000-order shift and use 3 rounds")
+    parser.add_argument("--no-db", action="store_true", help="skip benchmarks that need DATABASE_URL")
+    parser.add_argument("--output", type=Path, help="default: Performance/results/bench_<timestamp>.json")
+    parser.add_argument("--compare", action="store_true", help="compare against baselines/bench.json")
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    random.seed(42)
+    repeat = 3 if args.quick else args.repeat
+    shift_sizes = SHIFT_SIZES[:-1] if args.quick else SHIFT_SIZES
+    selected = (lambda name: args.only in name) if args.only else (lambda name: True)
+
+    results = {}
+    run_pure_benchmarks(results, repeat, selected)
+    if not args.no_db:
+        run_db_benchmarks(results, repeat, selected, shift_sizes)
+
+    for name, metrics in results.items():
+        print(f"   {name:<45} median {metrics['median']:>10.3f} ms   min {metrics['min']:>10.3f} ms")
+
+    output = {
+        "kind": "bench",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    path = args.output or RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"📊 Benchmark results saved to: {path}")
+
+    if args.compare:
+        base_file = args.baseline or baseline_path("bench")
+        if not base_file.exists():
+            print(f"⚠️ No baseline found at: {base_file}")
+            sys.exit(2)
+        # النتائج متوسط عدة جولات، فلا نحتاج حد أدنى للفرق بالـ ms
+        regressions = compare(output, load_results(base_file), args.threshold, min_delta_ms=0.0)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.threshold}%:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ No regressions over {args.threshold}%")
+
+
+if __name__ == "__main__":
+    main()
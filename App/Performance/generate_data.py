@@ -0,0 +1,304 @@
+"""
+توليد بيانات وهمية بأحجام كبيرة لاختبارات الأداء (Postgres فقط)
+
+- عملاء، عناوين لكل منطقة، ورديات لكل يوم، طلبات وعناصر طلبات
+- التحميل عبر COPY (psycopg2 copy_expert) على دفعات، فالذاكرة ثابتة مهما كان العدد
+- الـ IDs تُحدد مسبقاً (بعد أكبر ID موجود) ثم يتم تحديث الـ sequences بـ setval
+- أسماء الجداول والأعمدة من Database/models (لا يوجد SQL مكتوب يدوياً للجداول)
+
+يتطلب وجود منيو ومناطق توصيل وطرق دفع (Static_Data/import_catalog.py و bulk_insert.py)
+
+cd App
+python Performance/generate_data.py --users 50000 --addresses-per-zone 2000 --days 365 --orders-per-shift 400
+python Performance/generate_data.py --users 1000 --days 7 --orders-per-shift 50 --seed 1
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence
+import argparse
+import random
+import uuid
+import io
+import sys
+
+# إضافة المجلد الأب (App) إلى Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, func, text
+
+from Database.db_connect import engine
+from Database.models.user_model import User
+from Database.models.address_zone_model import Address, DeliveryZone
+from Database.models.payment_model import PaymentMethod
+from Database.models.shift_model import Shift
+from Database.models.orders_info_model import Order, OrderStatus
+from Database.models.order_item_model import OrderItem
+from Database.models.product_model import ProductVariant, Sizes
+from Service.Orders import CUSTOM_SIZE_NAME
+
+# عدد الطلبات في كل COPY (الطلبات + عناصرها في الذاكرة لدفعة واحدة فقط)
+ORDER_CHUNK_SIZE = 50_000
+
+# توزيع حالات الطلبات القديمة (الورديات المنتهية)
+STATUS_WEIGHTS = {
+    OrderStatus.DELIVERED: 88,
+    OrderStatus.CANCELLED: 7,
+    OrderStatus.IN_DELIVERY: 2,
+    OrderStatus.PREPARING: 3,
+}
+
+MAX_ITEMS_PER_ORDER = 30
+
+FIRST_NAMES = ["محمد", "أحمد", "محمود", "مصطفى", "علي", "عمر", "سارة", "مريم", "نور", "ياسمين", "هدى", "خالد"]
+LAST_NAMES = ["حسن", "إبراهيم", "عبدالله", "السيد", "منصور", "فؤاد", "سليمان", "رمضان", "شريف", "عادل"]
+STREETS = ["شارع التحرير", "شارع الجمهورية", "شارع النصر", "شارع المدارس", "شارع الجيش", "شارع السوق"]
+NOTES = ["بدون بصل", "زيادة طحينة", "عيش سخن", "بدون شطة", "الباب الخلفي"]
+
+
+class IteratorFile(io.TextIOBase):
+    """ملف للقراءة فقط من iterator أسطر (يستخدمه COPY بدون تجميع كل البيانات في الذاكرة)"""
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = iter(lines)
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _value(value) -> str:
+    """تحويل القيمة لصيغة COPY text"""
+    if value is None:
+        return r"\N"
+    if isinstance(value, OrderStatus):
+        # SQLAlchemy Enum يخزن اسم العنصر وليس قيمته
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value)
+
+
+def copy_rows(cursor, model, columns: Sequence[str], rows: Iterable[Sequence]) -> None:
+    """COPY لجدول من Database/models بالأعمدة المحددة"""
+    table = model.__table__
+    missing = [c for c in columns if c not in table.c]
+    if missing:
+        raise ValueError(f"أعمدة غير موجودة في {table.name}: {missing}")
+
+    column_sql = ", ".join(f'"{c}"' for c in columns)
+    lines = ("\t".join(_value(v) for v in row) + "\n" for row in rows)
+    cursor.copy_expert(f'COPY "{table.name}" ({column_sql}) FROM STDIN', IteratorFile(lines))
+
+
+def next_id(connection, column) -> int:
+    return (connection.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def reset_sequence(connection, column) -> None:
+    """تحديث الـ sequence بعد إدخال IDs صريحة"""
+    table = column.table.name
+    connection.execute(text(
+        f"""SELECT setval(pg_get_serial_sequence('"{table}"', '{column.name}'),
+                          COALESCE((SELECT MAX("{column.name}") FROM "{table}"), 1))"""
+    ))
+
+
+def random_item_count(rng: random.Random) -> int:
+    """أغلب الطلبات 1-4 أصناف، وأحياناً طلبات كبيرة حتى 30"""
+    return min(MAX_ITEMS_PER_ORDER, 1 + int(rng.expovariate(1 / 2.5)))
+
+
+def generate_users(rng: random.Random, count: int, phone_offset: int) -> Iterator[tuple]:
+    for i in range(count):
+        yield (
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            f"015{(phone_offset + i) % 10**8:08d}",
+            None,
+            datetime.now() - timedelta(days=rng.randint(0, 730)),
+        )
+
+
+def load(args) -> None:
+    rng = random.Random(args.seed)
+
+    with engine.connect() as connection:
+        if connection.dialect.name != "postgresql":
+            sys.exit("⚠️ generate_data.py يعمل مع Postgres فقط (COPY)")
+
+        zones = connection.execute(select(DeliveryZone.ZoneID, DeliveryZone.DeliveryCost)).all()
+        payment_ids = connection.execute(
+            select(PaymentMethod.PaymentID).where(PaymentMethod.IsActive.is_(True))
+        ).scalars().all()
+        variants = connection.execute(
+            select(ProductVariant.VariantID, ProductVariant.Price)
+            .join(Sizes, Sizes.SizeID == ProductVariant.SizeID)
+            .where(ProductVariant.IsAvailable.is_(True), Sizes.SizeName != CUSTOM_SIZE_NAME)
+        ).all()
+        if not zones or not payment_ids or not variants:
+            sys.exit("⚠️ قاعدة البيانات تحتاج منيو ومناطق وطرق دفع قبل توليد البيانات")
+
+        user_start = connection.execute(select(func.count()).select_from(User)).scalar()
+        address_start = next_id(connection, Address.AddressID)
+        shift_start = next_id(connection, Shift.ShiftID)
+        order_start = next_id(connection, Order.OrderID)
+        item_start = next_id(connection, OrderItem.OrderItemID)
+
+        existing_shifts = set(connection.execute(select(Shift.Shift_Date, Shift.Shift_Number)).all())
+        connection.commit()
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+
+        # 1. العملاء
+        users = list(generate_users(rng, args.users, user_start))
+        copy_rows(cursor, User, ["UserID", "FName", "LName", "PhoneNumber", "Email", "createdAt"], users)
+        user_ids = [u[0] for u in users]
+        phones = {u[0]: u[3] for u in users}
+        del users
+        raw.commit()
+        print(f"   users        {len(user_ids):>12,}")
+
+        # 2. العناوين: عدد ثابت لكل منطقة، موزعة على العملاء بالتناوب
+        address_rows = []
+        addresses = []  # (AddressID, UserID, DeliveryCost)
+        address_id = address_start
+        for zone_id, delivery_cost in zones:
+            for _ in range(args.addresses_per_zone):
+                user_id = user_ids[(address_id - address_start) % len(user_ids)]
+                address_rows.append((
+                    address_id, user_id, rng.choice(FIRST_NAMES), rng.choice(STREETS),
+                    str(rng.randint(1, 200)), "القاهرة", phones[user_id], None,
+                    rng.choice(NOTES) if rng.random() < 0.2 else None, zone_id,
+                ))
+                addresses.append((address_id, user_id, delivery_cost))
+                address_id += 1
+        copy_rows(cursor, Address, ["AddressID", "UserID", "RecipientName", "Street", "Building", "City",
+                                    "RecipientPhone", "Phone2", "DeliveryNotes", "ZoneID"], address_rows)
+        del address_rows
+        raw.commit()
+        print(f"   address      {len(addresses):>12,}")
+
+        # 3. الورديات: آخر --days يوم، --shifts-per-day وردية لكل يوم
+        shift_rows = []
+        shift_id = shift_start
+        today = date.today()
+        for day in range(args.days, 0, -1):
+            shift_date = today - timedelta(days=day)
+            for number in range(1, args.shifts_per_day + 1):
+                shift_number = f"G{number}"
+                if (shift_date, shift_number) in existing_shifts:
+                    continue
+                start_hour = 8 + (number - 1) * (16 // args.shifts_per_day)
+                shift_rows.append((shift_id, shift_date, shift_number, time(start_hour),
+                                   time((start_hour + 16 // args.shifts_per_day) % 24), False))
+                shift_id += 1
+        copy_rows(cursor, Shift, ["ShiftID", "Shift_Date", "Shift_Number", "Start_Time", "End_Time", "IsActive"],
+                  shift_rows)
+        raw.commit()
+        print(f"   shifts       {len(shift_rows):>12,}")
+
+        # 4. الطلبات وعناصرها على دفعات
+        statuses = list(STATUS_WEIGHTS)
+        status_weights = list(STATUS_WEIGHTS.values())
+        order_id, item_id = order_start, item_start
+        order_columns = ["OrderID", "UserID", "AddressID", "PaymentID", "ShiftID", "OrderNumber",
+                         "OrderTimestamp", "DeliveryFee", "TotalPrice", "OrderStatus", "OrderNotes", "ExternalNotes"]
+        item_columns = ["OrderItemID", "OrderID", "VariantID", "Quantity", "UnitPrice", "Subtotal", "IsSada"]
+
+        def flush(order_rows: List[tuple], item_rows: List[tuple]) -> None:
+            copy_rows(cursor, Order, order_columns, order_rows)
+            copy_rows(cursor, OrderItem, item_columns, item_rows)
+            raw.commit()
+
+        order_rows, item_rows = [], []
+        total_orders = total_items = 0
+        for shift in shift_rows:
+            shift_id, shift_date, _, start_time = shift[:4]
+            shift_start_dt = datetime.combine(shift_date, start_time)
+            orders_in_shift = max(0, int(rng.gauss(args.orders_per_shift, args.orders_per_shift * 0.2)))
+
+            for order_number in range(1, orders_in_shift + 1):
+                address_id, user_id, delivery_cost = rng.choice(addresses)
+                items_total = Decimal("0")
+                for _ in range(random_item_count(rng)):
+                    variant_id, price = rng.choice(variants)
+                    quantity = rng.choices((1, 2, 3, 4), weights=(60, 25, 10, 5))[0]
+                    subtotal = price * quantity
+                    items_total += subtotal
+                    item_rows.append((item_id, order_id, variant_id, quantity, price, subtotal, rng.random() < 0.1))
+                    item_id += 1
+
+                order_rows.append((
+                    order_id, user_id, address_id, rng.choice(payment_ids), shift_id, order_number,
+                    shift_start_dt + timedelta(seconds=rng.randint(0, 8 * 3600)),
+                    delivery_cost, items_total + delivery_cost,
+                    rng.choices(statuses, weights=status_weights)[0],
+                    rng.choice(NOTES) if rng.random() < 0.15 else None, None,
+                ))
+                order_id += 1
+
+                if len(order_rows) >= ORDER_CHUNK_SIZE:
+                    total_orders += len(order_rows)
+                    total_items += len(item_rows)
+                    flush(order_rows, item_rows)
+                    order_rows, item_rows = [], []
+                    print(f"   ... {total_orders:,} orders", flush=True)
+
+        if order_rows:
+            total_orders += len(order_rows)
+            total_items += len(item_rows)
+            flush(order_rows, item_rows)
+        print(f"   orders       {total_orders:>12,}")
+        print(f"   order_items  {total_items:>12,}")
+    finally:
+        raw.close()
+
+    with engine.connect() as connection:
+        for column in (Address.AddressID, Shift.ShiftID, Order.OrderID, OrderItem.OrderItemID):
+            reset_sequence(connection, column)
+        connection.commit()
+
+        if args.analyze:
+            connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+                text("ANALYZE users, address, shifts, orders, order_items")
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a local Postgres database with synthetic orders")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--addresses-per-zone", type=int, default=500)
+    parser.add_argument("--days", type=int, default=30, help="days of history, ending yesterday")
+    parser.add_argument("--shifts-per-day", type=int, default=2)
+    parser.add_argument("--orders-per-shift", type=int, default=200, help="average, +/- 20%%")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible data")
+    parser.add_argument("--no-analyze", dest="analyze", action="store_false", help="skip ANALYZE at the end")
+    args = parser.parse_args()
+
+    if args.users < 1 or args.addresses_per_zone < 1 or not 1 <= args.shifts_per_day <= 8:
+        parser.error("--users and --addresses-per-zone must be >= 1, --shifts-per-day between 1 and 8")
+
+    print(f"📂 Generating synthetic data into: {engine.url.render_as_string(hide_password=True)}")
+    started = datetime.now()
+    load(args)
+    print(f"✅ Done in {datetime.now() - started}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+اختبار الحمل بسيناريوهات الاستخدام الحقيقية (Locust)
+
+- CustomerUser: تسجيل دخول، تصفح المنيو، العناوين، إنشاء طلب (1-30 صنف)، متابعة الطلبات
+- AdminUser: متابعة الطلبات، تحميل فاتورة، تقرير الشفت
+
+عند انتهاء التشغيل يتم حفظ p50/p95/p99 و requests/s لكل endpoint في ملف JSON
+(Performance/results/) لمقارنته بالـ baseline عبر baseline.py
+
+يتطلب: بيانات منيو + منطقة توصيل + طريقة دفع (Static_Data/import_catalog.py و bulk_insert.py)
+الوردية المفتوحة يتم إنشاؤها تلقائياً إذا لم توجد
+
+cd App
+locust -f Performance/locustfile.py --host http://127.0.0.1:8000 --headless -u 50 -r 10 -t 5m
+"""
+from locust import HttpUser, task, between, events
+from datetime import datetime
+from pathlib import Path
+import itertools
+import requests
+import random
+import json
+import os
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# عدد العملاء المختلفين (أرقام الهواتف) المستخدمين في الاختبار
+CUSTOMER_POOL_SIZE = int(os.getenv("LOADTEST_CUSTOMERS", "500"))
+MAX_ITEMS_PER_ORDER = 30
+
+CUSTOM_SIZE_NAME = "حسب الطلب"
+
+_customer_counter = itertools.count()
+
+# بيانات مشتركة يتم تحميلها مرة واحدة في بداية الاختبار
+shared = {
+    "variant_ids": [],
+    "custom_variant_ids": [],
+    "zone_ids": [],
+    "payment_ids": [],
+    "shift_id": None,
+}
+
+
+def customer_phone(index: int) -> str:
+    return f"0109{index % CUSTOMER_POOL_SIZE:07d}"
+
+
+def random_item_count() -> int:
+    """أغلب الطلبات صغيرة (2-4 أصناف) مع طلبات كبيرة أحياناً حتى 30"""
+    return min(MAX_ITEMS_PER_ORDER, 1 + int(random.expovariate(1 / 3)))
+
+
+@events.test_start.add_listener
+def load_shared_data(environment, **kwargs):
+    """تحميل الـ variants والمناطق وطرق الدفع والوردية المفتوحة (خارج إحصائيات الاختبار)"""
+    client = requests.Session()
+    client.headers["Accept-Encoding"] = "gzip"
+
+    def get_json(path):
+        response = client.get(environment.host.rstrip("/") + path, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    variants = get_json("/product_variants/all_products")
+    for variant in variants:
+        if not variant["IsAvailable"]:
+            continue
+        if variant["sizes"]["SizeName"] == CUSTOM_SIZE_NAME:
+            shared["custom_variant_ids"].append(variant["VariantID"])
+        else:
+            shared["variant_ids"].append(variant["VariantID"])
+
+    shared["zone_ids"] = [z["ZoneID"] for z in get_json("/zones/all_zones")]
+    shared["payment_ids"] = [p["PaymentID"] for p in get_json("/payment/all_payment_methods")]
+
+    open_shifts = [s for s in get_json("/shifts/all_shifts") if s["End_Time"] is None and s["IsActive"]]
+    if open_shifts:
+        shared["shift_id"] = open_shifts[0]["ShiftID"]
+    else:
+        response = client.post(environment.host.rstrip("/") + "/shifts/start_shift",
+                               json={"Shift_Number": "loadtest"}, timeout=30)
+        response.raise_for_status()
+        shared["shift_id"] = response.json()["ShiftID"]
+
+    if not shared["variant_ids"] or not shared["zone_ids"] or not shared["payment_ids"]:
+        raise RuntimeError("قاعدة البيانات تحتاج منيو ومناطق وطرق دفع قبل اختبار الحمل")
+
+
+@events.quitting.add_listener
+def save_results(environment, **kwargs):
+    """حفظ النتائج لكل endpoint بصيغة JSON"""
+    stats = environment.stats
+    if not stats.total.num_requests:
+        return
+
+    def summarize(entry):
+        return {
+            "requests": entry.num_requests,
+            "failures": entry.num_failures,
+            "rps": round(entry.total_rps, 2),
+            "mean": round(entry.avg_response_time, 2),
+            "p50": entry.get_response_time_percentile(0.50),
+            "p95": entry.get_response_time_percentile(0.95),
+            "p99": entry.get_response_time_percentile(0.99),
+        }
+
+    results = {
+        "kind": "load",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "host": environment.host,
+        "users": getattr(environment.parsed_options, "num_users", None),
+        "results": {
+            f"{entry.method} {entry.name}": summarize(entry)
+            for entry in stats.entries.values()
+        },
+        "total": summarize(stats.total),
+    }
+
+    path = Path(os.getenv("LOADTEST_RESULTS", RESULTS_DIR / f"load_{datetime.now():%Y%m%d_%H%M%S}.json"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"📊 Load test results saved to: {path}")
+
+
+class CustomerUser(HttpUser):
+    """عميل من تطبيق الموبايل"""
+    weight = 10
+    wait_time = between(1, 5)
+
+    def on_start(self):
+        phone = customer_phone(next(_customer_counter))
+
+        with self.client.post("/users/login", json={"PhoneNumber": phone},
+                              name="/users/login", catch_response=True) as response:
+            if response.status_code == 404:
+                response.success()
+                self.client.post("/users/register", json={
+                    "FName": "Load", "LName": "Test", "PhoneNumber": phone
+                }, name="/users/register")
+                response = self.client.post("/users/login", json={"PhoneNumber": phone}, name="/users/login")
+        self.user_id = response.json()["UserID"]
+
+        # مثل تطبيق الموبايل: الـ token يُرسل مع كل طلب (إذا كان SESSION_TOKEN_SECRET مضبوطاً على السيرفر)
+        token = response.json().get("access_token")
+        if token:
+            self.client.headers["Authorization"] = f"Bearer {token}"
+
+        addresses = self.client.get(f"/addresses/user/{self.user_id}", name="/addresses/user/{user_id}").json()
+        if not addresses:
+            addresses = [self.client.post(f"/addresses/create/{self.user_id}", json={
+                "RecipientName": "Load Test",
+                "Street": "Load street",
+                "Building": "1",
+                "City": "Cairo",
+                "RecipientPhone": phone,
+                "ZoneID": random.choice(shared["zone_ids"]),
+            }, name="/addresses/create/{user_id}").json()]
+        self.address_ids = [a["AddressID"] for a in addresses]
+        self.last_order_id = None
+
+    @task(6)
+    def browse_menu(self):
+        self.client.get("/categories/get_all_categories")
+        self.client.get("/products/all_products")
+        self.client.get("/product_variants/all_products")
+
+    @task(2)
+    def list_addresses(self):
+        self.client.get(f"/addresses/user/{self.user_id}", name="/addresses/user/{user_id}")
+
+    @task(3)
+    def create_order(self):
+        items = [
+            {"VariantID": random.choice(shared["variant_ids"]), "Quantity": random.randint(1, 3)}
+            for _ in range(random_item_count())
+        ]
+        if shared["custom_variant_ids"] and random.random() < 0.05:
+            items[0] = {"VariantID": random.choice(shared["custom_variant_ids"]), "Quantity": 1,
+                        "CustomPrice": str(random.randint(10, 100))}
+
+        response = self.client.post("/orders/create", json={
+            "UserID": self.user_id,
+            "ShiftID": shared["shift_id"],
+            "AddressID": random.choice(self.address_ids),
+            "PaymentID": random.choice(shared["payment_ids"]),
+            "items": items,
+        }, headers={"Idempotency-Key": f"load-{self.user_id}-{random.getrandbits(64):x}"})
+        if response.status_code == 201:
+            self.last_order_id = response.json()["OrderID"]
+
+    @task(1)
+    def reorder(self):
+        if self.last_order_id:
+            self.client.post(f"/orders/{self.last_order_id}/reorder", name="/orders/{order_id}/reorder",
+                             headers={"Idempotency-Key": f"load-{self.user_id}-{random.getrandbits(64):x}"})
+
+    @task(2)
+    def active_orders(self):
+        self.client.get(f"/orders/user/{self.user_id}/active", name="/orders/user/{user_id}/active")
+
+
+class AdminUser(HttpUser):
+    """شاشة الكاشير / لوحة التحكم"""
+    weight = 1
+    wait_time = between(2, 4)
+
+    def on_start(self):
+        self.recent_order_ids = []
+
+    @task(10)
+    def poll_orders(self):
+        orders = self.client.get("/orders/all", params={"limit": 100}, name="/orders/all").json()
+        self.recent_order_ids = [o["OrderID"] for o in orders[:20]]
+
+    @task(5)
+    def poll_shift_orders(self):
+        self.client.get(f"/orders/shift/{shared['shift_id']}", name="/orders/shift/{shift_id}")
+
+    @task(3)
+    def lookup_customer(self):
+        # الكاشير يكتب آخر 4 أرقام من هاتف العميل
+        self.client.get("/users/lookup", params={"phone_suffix": f"{random.randint(0, 9999):04d}"},
+                        name="/users/lookup")
+
+    @task(2)
+    def download_invoice(self):
+        if self.recent_order_ids:
+            self.client.get(f"/invoices/order/{random.choice(self.recent_order_ids)}",
+                            name="/invoices/order/{order_id}")
+
+    @task(1)
+    def shift_report(self):
+        self.client.get(f"/shifts/report/{shared['shift_id']}", name="/shifts/report/{shift_id}")
+        self.client.get(f"/shifts/report/{shared['shift_id']}/download",
+                        name="/shifts/report/{shift_id}/download")
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 import logging
 import uuid
 
-from Database.db_connect import get_db
+from Database.db_connect import get_db, get_read_db
+from Database.write_helpers import insert_returning, update_returning
 from Database.models.address_zone_model import Address, DeliveryZone
 from Database.pydantic_schema.address_zone_schema import (
     AddressCreate,
@@ -15,22 +16,29 @@ from Database.pydantic_schema.address_zone_schema import (
     ZoneResponse,
     ZoneUpdate
 )
+from Service.Cache import zone_cache
 
 logger = logging.getLogger("address_zone")
-logger.setLevel(logging.INFO)
 
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
- datefmt='%Y-%m-%d %H:%M:%S')
+address_router = APIRouter(prefix="/addresses", tags=["Addresses"])
+zone_router = APIRouter(prefix="/zones", tags=["Delivery Zones"])
 
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
+# أعمدة العنوان فقط، والمنطقة تأتي من جدول المناطق في الذاكرة (بدون join أو lazy load لكل عنوان)
+ADDRESS_COLUMNS = tuple(Address.__table__.columns)
 
-if not logger.handlers:
-    logger.addHandler(console_handler)
 
-address_router = APIRouter(prefix="/addresses", tags=["Addresses"])
-zone_router = APIRouter(prefix="/zones", tags=["Delivery Zones"])
+def _with_zone(address: dict) -> dict:
+    """إضافة delivery_zone من جدول المناطق في الذاكرة (شكل AddressWithZone)"""
+    address["delivery_zone"] = zone_cache.get_zone(address["ZoneID"])._asdict()
+    return address
+
+
+def _find_address(db: Session, user_id: uuid.UUID, address_id: int) -> Optional[Address]:
+    """العنوان بشرط أن يخص المستخدم (بحث بالـ primary key)"""
+    return db.query(Address).filter(
+        Address.AddressID == address_id,
+        Address.UserID == user_id
+    ).first()
 
 #=======================================
 # Address Routers
@@ -45,22 +53,16 @@ def create_address(
     logger.info(f"محاولة إضافة عنوان جديد للمستخدم ID: {user_id}")
     logger.debug(f"بيانات العنوان المستلمة: {address.model_dump()}")
     try:
-        zone = db.query(DeliveryZone).filter(DeliveryZone.ZoneID == address.ZoneID).first()
-        if not zone:
+        if zone_cache.get_zone(address.ZoneID) is None:
             logger.warning(f"✗ المنطقة غير موجودة - ZoneID: {address.ZoneID}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="المنطقة غير موجودة"
             )
-        db_address = Address(
-            **address.model_dump(),
-            UserID=user_id
-        )
-        db.add(db_address)
+        db_address = insert_returning(db, Address, {**address.model_dump(), "UserID": user_id})
         db.commit()
-        db.refresh(db_address)
-        logger.info(f"✓ تم إضافة العنوان بنجاح - AddressID: {db_address.AddressID}, UserID: {user_id}")
-        return db_address
+        logger.info(f"✓ تم إضافة العنوان بنجاح - AddressID: {db_address['AddressID']}, UserID: {user_id}")
+        return _with_zone(db_address)
     except HTTPException:
         raise
     except Exception as e:
@@ -74,24 +76,24 @@ def create_address(
 @address_router.get("/user/{user_id}", response_model=List[AddressWithZone])
 def get_user_addresses(
     user_id: uuid.UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
      ):
     logger.info(f"عرض عناوين المستخدم ID: {user_id}")
-    addresses = db.query(Address).filter(
+    addresses = db.query(*ADDRESS_COLUMNS).filter(
         Address.UserID == user_id
     ).order_by(Address.AddressID.asc()).all()
     logger.info(f"✓ تم جلب {len(addresses)} عنوان للمستخدم {user_id}")
-    return addresses
+    return [_with_zone(row._asdict()) for row in addresses]
 
 # Get a specific address of a user
 @address_router.get("/detail/{user_id}/{address_id}", response_model=AddressWithZone)
 def get_address_detail(
     user_id: uuid.UUID,
     address_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     logger.info(f"طلب عرض العنوان AddressID: {address_id}, UserID: {user_id}")
-    db_address = db.query(Address).filter(
+    db_address = db.query(*ADDRESS_COLUMNS).filter(
         Address.AddressID == address_id,
         Address.UserID == user_id
     ).first()
@@ -101,7 +103,7 @@ def get_address_detail(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="العنوان غير موجود")
     logger.info(f"✓ تم جلب العنوان - AddressID: {address_id}")
-    return db_address
+    return _with_zone(db_address._asdict())
 
 # Update an address
 @address_router.put("/update/{user_id}/{address_id}", response_model=AddressWithZone)
@@ -112,34 +114,29 @@ def update_address(
     db: Session = Depends(get_db)
      ):
     logger.info(f"محاولة تحديث العنوان AddressID: {address_id}, UserID: {user_id}")
-    db_address = db.query(Address).filter(
-        Address.AddressID == address_id,
-        Address.UserID == user_id
-    ).first()
-    if not db_address:
-        logger.warning(f"✗ العنوان غير موجود للتحديث - AddressID: {address_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="العنوان غير موجود")
     try:
         update_data = address_update.model_dump(exclude_unset=True)
         logger.debug(f"البيانات المرسلة للتحديث: {update_data}")
         if "ZoneID" in update_data:
-            zone = db.query(DeliveryZone).filter(
-                DeliveryZone.ZoneID == update_data["ZoneID"]
-            ).first()
-            if not zone:
+            if zone_cache.get_zone(update_data["ZoneID"]) is None:
                 logger.warning(f"✗ المنطقة غير موجودة - ZoneID: {update_data['ZoneID']}")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="المنطقة غير موجودة")
         logger.info(f"الحقول المراد تحديثها: {list(update_data.keys())}")
-        for field, value in update_data.items():
-            setattr(db_address, field, value)
+        # التحقق من الملكية والتعديل في نفس الجملة
+        db_address = update_returning(db, Address, [
+            Address.AddressID == address_id,
+            Address.UserID == user_id
+        ], update_data)
+        if not db_address:
+            logger.warning(f"✗ العنوان غير موجود للتحديث - AddressID: {address_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="العنوان غير موجود")
         db.commit()
-        db.refresh(db_address)
         logger.info(f"✓ تم تحديث العنوان بنجاح - AddressID: {address_id}")
-        return db_address
+        return _with_zone(db_address)
     except HTTPException:
         raise
     except Exception:
@@ -157,10 +154,7 @@ def delete_address(
     db: Session = Depends(get_db)
 ):
     logger.info(f"محاولة حذف العنوان AddressID: {address_id}, UserID: {user_id}")
-    db_address = db.query(Address).filter(
-        Address.AddressID == address_id,
-        Address.UserID == user_id
-    ).first()
+    db_address = _find_address(db, user_id, address_id)
     if not db_address:
         logger.warning(f"✗ العنوان غير موجود للحذف - AddressID: {address_id}")
         raise HTTPException(
@@ -185,9 +179,9 @@ def delete_address(
 
 # Get all zones
 @zone_router.get("/all_zones", response_model=List[ZoneResponse])
-def get_all_zones(db: Session = Depends(get_db)):
+def get_all_zones():
     logger.info("عرض جميع المناطق")
-    zones = db.query(DeliveryZone).order_by(DeliveryZone.ZoneID.asc()).all()
+    zones = [zone._asdict() for _, zone in sorted(zone_cache.get_zones().items())]
     logger.info(f"✓ تم جلب {len(zones)} منطقة")
     return zones
 
@@ -199,14 +193,13 @@ def create_zone(
     logger.info(f"محاولة إضافة منطقة جديدة: {zone.ZoneName}")
     logger.debug(f"بيانات المنطقة المستلمة: {zone.model_dump()}")
     try:
-        db_zone = DeliveryZone(
-            ZoneName=zone.ZoneName,
-            DeliveryCost=zone.DeliveryCost
-        )
-        db.add(db_zone)
+        db_zone = insert_returning(db, DeliveryZone, {
+            "ZoneName": zone.ZoneName,
+            "DeliveryCost": zone.DeliveryCost
+        })
         db.commit()
-        db.refresh(db_zone)
-        logger.info(f"✓ تم إضافة المنطقة بنجاح - ZoneID: {db_zone.ZoneID}, Name: {db_zone.ZoneName}")
+        zone_cache.invalidate_zones()
+        logger.info(f"✓ تم إضافة المنطقة بنجاح - ZoneID: {db_zone['ZoneID']}, Name: {db_zone['ZoneName']}")
         return db_zone
     except IntegrityError as e:
         db.rollback()
@@ -225,19 +218,16 @@ def create_zone(
 
 # Get zone by ID
 @zone_router.get("/zone/{zone_id}", response_model=ZoneResponse)
-def get_zone(
-    zone_id: int,
-    db: Session = Depends(get_db)
-):
+def get_zone(zone_id: int):
     logger.info(f"طلب عرض المنطقة ZoneID: {zone_id}")
-    zone = db.query(DeliveryZone).filter(DeliveryZone.ZoneID == zone_id).first()
+    zone = zone_cache.get_zone(zone_id)
     if not zone:
         logger.warning(f"✗ المنطقة غير موجودة - ZoneID: {zone_id}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="المنطقة غير موجودة")
     logger.info(f"✓ تم جلب المنطقة - ZoneID: {zone_id}, Name: {zone.ZoneName}")
-    return zone
+    return zone._asdict()
 
 # Update zone
 @zone_router.put("/update_zone/{zone_id}", response_model=ZoneResponse)
@@ -247,22 +237,22 @@ def update_zone(
     db: Session = Depends(get_db)
 ):
     logger.info(f"محاولة تحديث المنطقة ZoneID: {zone_id}")
-    zone = db.query(DeliveryZone).filter(DeliveryZone.ZoneID == zone_id).first()
-    if not zone:
-        logger.warning(f"✗ المنطقة غير موجودة للتحديث - ZoneID: {zone_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="المنطقة غير موجودة")
     try:
         update_data = zone_update.model_dump(exclude_unset=True)
         logger.debug(f"بيانات تحديث المنطقة: {update_data}")
         logger.info(f"الحقول المراد تحديثها: {list(update_data.keys())}")
-        for field, value in update_data.items():
-            setattr(zone, field, value)
+        zone = update_returning(db, DeliveryZone, [DeliveryZone.ZoneID == zone_id], update_data)
+        if not zone:
+            logger.warning(f"✗ المنطقة غير موجودة للتحديث - ZoneID: {zone_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="المنطقة غير موجودة")
         db.commit()
-        db.refresh(zone)
+        zone_cache.invalidate_zones()
         logger.info(f"✓ تم تحديث المنطقة بنجاح - ZoneID: {zone_id}")
         return zone
+    except HTTPException:
+        raise
     except IntegrityError as e:
         db.rollback()
         logger.error(f"✗ فشل التحديث - الاسم مكرر: {str(e)}")
@@ -293,6 +283,7 @@ def delete_zone(
         zone_name = zone.ZoneName
         db.delete(zone)
         db.commit()
+        zone_cache.invalidate_zones()
         logger.info(f"✓ تم حذف المنطقة بنجاح - ZoneID: {zone_id}, Name: {zone_name}")
         return {"message": "تم الحذف"}
     except Exception:
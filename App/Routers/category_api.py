@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List
 from sqlalchemy.exc import IntegrityError
 
-from Database.db_connect import get_db
+from config.fast_json import fast_json_bytes, rows_to_dicts
+from Database.db_connect import get_db, get_read_db
+from Database.write_helpers import insert_returning, update_returning
+from Service.Cache.catalog_cache import catalog_response, invalidate_catalog
+from Service.Cache.search_index import invalidate_search_index
 from Database.models.product_model import Category # db class
 from Database.pydantic_schema.product_schema import(
      CategoryCreate,
@@ -14,11 +19,19 @@ from Database.pydantic_schema.product_schema import(
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryResponse])
+
 @router.get("/get_all_categories", response_model=List[CategoryResponse])
-def get_all_categories(db: Session = Depends(get_db)):
+def get_all_categories(request: Request):
+
+    def build(db: Session) -> bytes:
+        categories = db.query(
+            Category.CategoryID,
+            Category.CategoryName
+        ).order_by(Category.CategoryID.asc()).all()
+        return fast_json_bytes(CATEGORY_LIST_ADAPTER, rows_to_dicts(categories))
 
-    categories = db.query(Category).order_by(Category.CategoryID.asc()).all()
-    return categories
+    return catalog_response(request, "categories", build)
 
 @router.post("/create_category", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 def create_category(category: CategoryCreate,
@@ -28,15 +41,11 @@ def create_category(category: CategoryCreate,
     - يتم انشاء كائن منه ليقوم بكل العمليات
     """
     try:
-        # create object from db class
+        # INSERT ... RETURNING: الاستجابة من نفس الجملة بدون refresh
         # لو اسم الفئة من الكلاس مطابق لتحقق بايدانتك يبقا اضف البيانات
-        db_category = Category(
-            CategoryName=category.CategoryName) # passing ClassName from pydantic_schema to db model
-            
-        # add to database
-        db.add(db_category)
+        db_category = insert_returning(db, Category, {"CategoryName": category.CategoryName})
         db.commit()
-        db.refresh(db_category)
+        invalidate_catalog()
         return db_category
         
     except IntegrityError:
@@ -54,7 +63,7 @@ def create_category(category: CategoryCreate,
 @router.get("/get_category_with_products/{category_name}", response_model=CategoryWithProducts)
 def get_category_with_products(
     category_name: str,
-    db: Session = Depends(get_db)):
+    db: Session = Depends(get_read_db)):
 
     # search for category_name
     db_category = db.query(Category).filter(Category.CategoryName == category_name).first()
@@ -72,21 +81,12 @@ def update_category(
     category_update: CategoryUpdate,
     db: Session = Depends(get_db)):
     
-    db_category = db.query(Category).filter(Category.CategoryName == category_name).first()
-    
-    if db_category is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Category: '{category_name}' not found"
-        )
-    
+    update_data = category_update.model_dump(exclude_none=True)
+
     try:
-        if category_update.CategoryName is not None:
-            db_category.CategoryName = category_update.CategoryName
-        
+        # UPDATE ... RETURNING (بدون تعديل = SELECT فقط)
+        db_category = update_returning(db, Category, [Category.CategoryName == category_name], update_data)
         db.commit()
-        db.refresh(db_category)
-        return db_category
         
     except IntegrityError:
         db.rollback()
@@ -101,6 +101,14 @@ def update_category(
             detail="Failed to update category"
         )
 
+    if db_category is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Category: '{category_name}' not found"
+        )
+    invalidate_catalog()
+    return db_category
+
 @router.delete("/delete_category/{category_name}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_category(
     category_name: str,
@@ -116,6 +124,9 @@ def delete_category(
     try:
         db.delete(db_category)
         db.commit()
+        invalidate_catalog()
+        # حذف القسم يحذف منتجاته (cascade)
+        invalidate_search_index()
         return None
         
     except Exception as e:
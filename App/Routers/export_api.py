@@ -0,0 +1,64 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from datetime import date
+from typing import Literal
+import logging
+
+from Service.Export import stream_orders_csv, stream_orders_xlsx, xlsx_available, ExportLevel
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+# أقصى مدة للتصدير الواحد (بالأيام)
+MAX_EXPORT_DAYS = 366
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# ======================================
+# Exports API
+# ======================================
+
+# Export orders for a date range
+@router.get("/orders")
+def export_orders(
+    date_from: date = Query(..., alias="from", description="من تاريخ (شامل)"),
+    date_to: date = Query(..., alias="to", description="إلى تاريخ (شامل)"),
+    format: Literal["csv", "xlsx"] = Query("csv", description="صيغة الملف"),
+    level: ExportLevel = Query("items", description="orders: صف لكل طلب / items: صف لكل صنف")
+    ):
+    """
+    تصدير الطلبات للحسابات مع اسم المنطقة وطريقة الدفع
+
+    csv: الملف يُرسل على دفعات أثناء القراءة من قاعدة البيانات،
+    فلا يتم تحميل كل الطلبات في الذاكرة
+    xlsx: يتم بناء الملف كاملاً في ملف مؤقت أولاً ثم إرساله
+    """
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "تاريخ النهاية يجب أن يكون بعد تاريخ البداية"})
+
+    if (date_to - date_from).days >= MAX_EXPORT_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": f"أقصى مدة للتصدير {MAX_EXPORT_DAYS} يوم"})
+
+    filename = f"orders_{level}_{date_from.isoformat()}_{date_to.isoformat()}.{format}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    logger.info("تصدير الطلبات %s من %s إلى %s", format, date_from, date_to)
+
+    if format == "xlsx":
+        if not xlsx_available():
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail={"error": "تصدير xlsx غير متاح (openpyxl غير مثبتة)، استخدم format=csv"})
+
+        return StreamingResponse(
+            stream_orders_xlsx(date_from, date_to, level),
+            media_type=XLSX_MEDIA_TYPE,
+            headers=headers)
+
+    return StreamingResponse(
+        stream_orders_csv(date_from, date_to, level),
+        media_type="text/csv; charset=utf-8",
+        headers=headers)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from Service.Images import get_or_create_variant, path_for, ImageNotFound
+
+router = APIRouter(prefix="/image_variants", tags=["Images"])
+
+# الرابط يحتوي على hash المحتوى، فلا يتغير محتواه أبداً
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# ======================================
+# Image Variants API
+# ======================================
+
+# Get original image by content hash
+@router.get("/{digest}/original")
+def get_original_image(digest: str):
+    path = path_for(digest)
+    if path is None or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="الصورة غير موجودة")
+
+    return FileResponse(path, headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+# Get resized image (generated on first request)
+@router.get("/{digest}/{variant}")
+def get_image_variant(digest: str, variant: str):
+    """
+    نسخة مصغرة من صورة المنتج
+    - variant: {size}.{fmt}
+    - size: thumb / medium / full
+    - fmt: webp أو jpg للأجهزة القديمة
+    """
+    size, _, fmt = variant.partition(".")
+    try:
+        path, media_type = get_or_create_variant(digest, size, fmt)
+    except ImageNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="الصورة غير موجودة")
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    )
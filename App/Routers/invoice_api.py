@@ -8,16 +8,8 @@ from sqlalchemy.orm import Session
 import logging
 
 from Database import db_connect
-from Service.CreateDocx import extract_order_data, create_invoice_in_memory
+from Service import CreateDocx
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/invoices", tags=["Invoices"])
 
@@ -28,7 +20,7 @@ router = APIRouter(prefix="/invoices", tags=["Invoices"])
 @router.get("/order/{order_id}")
 def generate_invoice(
     order_id: int,
-    db: Session = Depends(db_connect.get_db)
+    db: Session = Depends(db_connect.get_read_db)
     ):
     """
     توليد فاتورة DOCX للطلب وتحميلها
@@ -43,7 +35,7 @@ def generate_invoice(
         logger.info(f"بدء إنشاء فاتورة للطلب - OrderID: {order_id}")
         
         # استخراج بيانات الطلب
-        invoice_data = extract_order_data(db, order_id)
+        invoice_data = CreateDocx.extract_order_data(db, order_id)
         
         if not invoice_data:
             logger.error(f"الطلب غير موجود - OrderID: {order_id}")
@@ -53,7 +45,7 @@ def generate_invoice(
             )
         
         # إنشاء الفاتورة في الذاكرة (بدون حفظ على القرص)
-        file_stream, filename = create_invoice_in_memory(invoice_data)
+        file_stream, filename = CreateDocx.create_invoice_in_memory(invoice_data)
         
         logger.info(f"تم إنشاء فاتورة للطلب {order_id}: {filename}")
         
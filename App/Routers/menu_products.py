@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-
-from Database.db_connect import get_db
+from typing import List, Optional
+
+from config.fast_json import fast_json_bytes, fast_json_response, rows_to_dicts
+from Database.db_connect import get_db, get_read_db
+from Database.write_helpers import insert_returning, update_returning
+from Service.Cache.catalog_cache import catalog_response, invalidate_catalog
+from Service.Cache.price_table import invalidate_price_table
+from Service.Cache.search_index import SEARCH_COLUMNS, get_search_index, invalidate_search_index
+from Service.Search import normalize_arabic
 from Database.models.product_model import Products, ProductVariant, Sizes, Types
 from Database.pydantic_schema.product_schema import (
     ProductCreate,
@@ -17,14 +25,67 @@ from Database.pydantic_schema.product_schema import (
 products_router = APIRouter(prefix="/products", tags=["Products"])
 variants_router = APIRouter(prefix="/product_variants", tags=["Product Variants"])
 
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
+VARIANT_LIST_ADAPTER = TypeAdapter(List[ProductVariantComplete])
+
 # ======================================
 # Products API
 # ======================================
 
 # Get All Products, not complete product
 @products_router.get("/all_products", response_model=List[ProductResponse])
-def list_products(db: Session = Depends(get_db)):
-    return db.query(Products).order_by(Products.ProductID.asc()).all()
+def list_products(request: Request):
+
+    def build(db: Session) -> bytes:
+        products = db.query(
+            Products.ProductID,
+            Products.CategoryID,
+            Products.Name,
+            Products.Description,
+            Products.ImageUrl
+        ).order_by(Products.ProductID.asc()).all()
+        return fast_json_bytes(PRODUCT_LIST_ADAPTER, rows_to_dicts(products))
+
+    return catalog_response(request, "products", build)
+
+def _search_products_trigram(db: Session, query: str, limit: int) -> list:
+    """
+    البحث عبر الـ trigram index (ix_products_NormalizedName_trgm) للكتالوج الكبير:
+    - جزء من الاسم (LIKE '%..%') أو اسم قريب (similarity، للأخطاء الإملائية)
+    - الأسماء التي تبدأ بالنص أولاً ثم الأقرب
+    """
+    return db.query(*SEARCH_COLUMNS).filter(or_(
+        Products.NormalizedName.contains(query, autoescape=True),
+        Products.NormalizedName.op("%")(query)
+    )).order_by(
+        Products.NormalizedName.startswith(query, autoescape=True).desc(),
+        func.similarity(Products.NormalizedName, query).desc(),
+        Products.ProductID.asc()
+    ).limit(limit).all()
+
+
+# Search Products (الكاشير أثناء الكتابة)
+@products_router.get("/search", response_model=List[ProductResponse])
+def search_products(
+    q: str = Query(..., min_length=1, max_length=50, description="جزء من اسم المنتج"),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_read_db)):
+    """
+    بحث المنتجات بالاسم مع توحيد الكتابة العربية (الهمزات، التاء المربوطة، التشكيل)
+    - الكتالوج الصغير: فهرس في الذاكرة (الكلمات التي تبدأ بكل كلمة من النص، بدون قاعدة البيانات)
+    - الكتالوج الكبير (أكثر من SEARCH_INDEX_MAX_PRODUCTS): الـ trigram index على NormalizedName
+    """
+    query = normalize_arabic(q)
+    if not query:
+        return fast_json_response(PRODUCT_LIST_ADAPTER, [])
+
+    index = get_search_index()
+    if index is not None:
+        products = index.search(query, limit)
+    else:
+        products = rows_to_dicts(_search_products_trigram(db, query, limit))
+
+    return fast_json_response(PRODUCT_LIST_ADAPTER, products)
 
 # Create Product
 @products_router.post("/create_product", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -32,11 +93,13 @@ def create_product(
      product_in: ProductCreate,
      db: Session = Depends(get_db)):
 
-    product = Products(**product_in.model_dump())
     try:
-        db.add(product)
+        values = product_in.model_dump()
+        values["NormalizedName"] = normalize_arabic(values["Name"])
+        product = insert_returning(db, Products, values)
         db.commit()
-        db.refresh(product)
+        invalidate_catalog()
+        invalidate_search_index()
         return product
     except IntegrityError:
         db.rollback()
@@ -57,33 +120,28 @@ def update_product(
     product_update: ProductUpdate,
     db: Session = Depends(get_db)):
 
-    # 1st search product by id
-    product = db.query(Products).filter(Products.ProductID == product_id).first()
-    if product is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id '{product_id}' not found")
-
-    # 2nd update product
     update_data = product_update.model_dump(exclude_unset=True, exclude_none=True)
     if not update_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No data provided for update")
 
-    try:
-        if "CategoryID" in update_data:
-            product.CategoryID = update_data["CategoryID"]
-        if "Name" in update_data:
-            product.Name = update_data["Name"]
-        if "Description" in update_data:
-            product.Description = update_data["Description"]
-        if "ImageUrl" in update_data:
-            product.ImageUrl = update_data["ImageUrl"]
+    if "Name" in update_data:
+        update_data["NormalizedName"] = normalize_arabic(update_data["Name"])
 
+    # UPDATE ... RETURNING: البحث والتعديل والاستجابة في جملة واحدة
+    try:
+        product = update_returning(db, Products, [Products.ProductID == product_id], update_data)
+        if product is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with id '{product_id}' not found")
         db.commit()
-        db.refresh(product)
+        invalidate_catalog()
+        invalidate_search_index()
         return product
+    except HTTPException:
+        raise
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -114,6 +172,9 @@ def delete_product(
     try:
         db.delete(product)
         db.commit()
+        invalidate_catalog()
+        invalidate_price_table()
+        invalidate_search_index()
         return None
     except Exception:
         db.rollback()
@@ -128,44 +189,115 @@ def delete_product(
 
 # Get All Products
 @variants_router.get("/all_products", response_model=List[ProductVariantComplete])
-def list_all_products(db: Session = Depends(get_db)):
-    return db.query(ProductVariant).order_by(ProductVariant.VariantID.asc()).all()
-
-# Create Product Variant
-@variants_router.post("/create_variant", response_model=ProductVariantComplete, status_code=status.HTTP_201_CREATED)
-def create_product_variant(
-    variant_in: ProductVariantCreate,
-    db: Session = Depends(get_db)):
-    """
-    - check if the product, size, and type exist
-       -> put values of FKs 
-    - and create a new Price and Availability
-    """
-    if db.query(Products).filter(Products.ProductID == variant_in.ProductID).first() is None:
+def list_all_products(request: Request):
+    return catalog_response(request, "variants", _build_variants_catalog)
+
+
+def _build_variants_catalog(db: Session) -> bytes:
+    # استعلام واحد بـ JOIN بدلاً من تحميل products/sizes/types لكل variant على حدة
+    rows = db.query(
+        ProductVariant.VariantID,
+        ProductVariant.ProductID,
+        ProductVariant.SizeID,
+        ProductVariant.TypeID,
+        ProductVariant.Price,
+        ProductVariant.IsAvailable,
+        Products.CategoryID,
+        Products.Name,
+        Products.Description,
+        Products.ImageUrl,
+        Sizes.SizeName,
+        Types.TypeName
+    ).join(Products, Products.ProductID == ProductVariant.ProductID)\
+     .join(Sizes, Sizes.SizeID == ProductVariant.SizeID)\
+     .join(Types, Types.TypeID == ProductVariant.TypeID)\
+     .order_by(ProductVariant.VariantID.asc())\
+     .all()
+
+    variants = [_variant_complete(row._asdict()) for row in rows]
+    return fast_json_bytes(VARIANT_LIST_ADAPTER, variants)
+
+
+def _variant_complete(row: dict) -> dict:
+    """شكل ProductVariantComplete من صف مسطح (أعمدة الـ variant + المنتج + SizeName + TypeName)"""
+    return {
+        "VariantID": row["VariantID"],
+        "ProductID": row["ProductID"],
+        "SizeID": row["SizeID"],
+        "TypeID": row["TypeID"],
+        "Price": row["Price"],
+        "IsAvailable": row["IsAvailable"],
+        "products": {
+            "ProductID": row["ProductID"],
+            "CategoryID": row["CategoryID"],
+            "Name": row["Name"],
+            "Description": row["Description"],
+            "ImageUrl": row["ImageUrl"]
+        },
+        "sizes": {"SizeID": row["SizeID"], "SizeName": row["SizeName"]},
+        "types": {"TypeID": row["TypeID"], "TypeName": row["TypeName"]}
+    }
+
+
+def _variant_refs(db: Session, product_id: int, size_id: int, type_id: int) -> Optional[dict]:
+    """بيانات المنتج واسم الحجم والنوع في استعلام واحد، None إذا كان أي منها غير موجود"""
+    row = db.query(
+        Products.CategoryID,
+        Products.Name,
+        Products.Description,
+        Products.ImageUrl,
+        Sizes.SizeName,
+        Types.TypeName
+    ).select_from(Products)\
+     .join(Sizes, Sizes.SizeID == size_id)\
+     .join(Types, Types.TypeID == type_id)\
+     .filter(Products.ProductID == product_id)\
+     .first()
+    return row._asdict() if row is not None else None
+
+
+def _ensure_variant_refs_exist(db: Session, product_id: Optional[int] = None,
+                               size_id: Optional[int] = None, type_id: Optional[int] = None) -> None:
+    """404 برسالة واضحة للمنتج / الحجم / النوع غير الموجود"""
+    if product_id is not None and db.query(Products.ProductID).filter(Products.ProductID == product_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id '{variant_in.ProductID}' not found",
+            detail=f"Product with id '{product_id}' not found",
         )
 
-    if db.query(Sizes).filter(Sizes.SizeID == variant_in.SizeID).first() is None:
+    if size_id is not None and db.query(Sizes.SizeID).filter(Sizes.SizeID == size_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Size with id '{variant_in.SizeID}' not found",
+            detail=f"Size with id '{size_id}' not found",
         )
 
-    if db.query(Types).filter(Types.TypeID == variant_in.TypeID).first() is None:
+    if type_id is not None and db.query(Types.TypeID).filter(Types.TypeID == type_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Type with id '{variant_in.TypeID}' not found",
+            detail=f"Type with id '{type_id}' not found",
         )
 
-    variant = ProductVariant(**variant_in.model_dump())
+# Create Product Variant
+@variants_router.post("/create_variant", response_model=ProductVariantComplete, status_code=status.HTTP_201_CREATED)
+def create_product_variant(
+    variant_in: ProductVariantCreate,
+    db: Session = Depends(get_db)):
+    """
+    - check if the product, size, and type exist
+       -> put values of FKs 
+    - and create a new Price and Availability
+    """
+    # استعلام واحد للتحقق وجلب بيانات الاستجابة (والاستعلامات المنفصلة فقط لرسالة الخطأ)
+    refs = _variant_refs(db, variant_in.ProductID, variant_in.SizeID, variant_in.TypeID)
+    if refs is None:
+        _ensure_variant_refs_exist(db, variant_in.ProductID, variant_in.SizeID, variant_in.TypeID)
 
     try:
-        db.add(variant)
+        variant = insert_returning(db, ProductVariant, variant_in.model_dump())
         db.commit()
-        db.refresh(variant)
-        return variant
+        invalidate_catalog()
+        invalidate_price_table()
+        return _variant_complete({**variant, **refs})
 
     except IntegrityError:
         db.rollback()
@@ -184,7 +316,7 @@ def create_product_variant(
 @variants_router.get("/get_variant/{variant_id}", response_model=ProductVariantComplete)
 def get_product_variant(
     variant_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     variant = db.query(ProductVariant).filter(ProductVariant.VariantID == variant_id).first()
     if variant is None:
@@ -201,13 +333,6 @@ def update_product_variant(
     variant_update: ProductVariantUpdate,
     db: Session = Depends(get_db)):
 
-    variant = db.query(ProductVariant).filter(ProductVariant.VariantID == variant_id).first()
-    if variant is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"ProductVariant with id '{variant_id}' not found",
-        )
-
     update_data = variant_update.model_dump(exclude_unset=True, exclude_none=True)
     if not update_data:
         raise HTTPException(
@@ -215,36 +340,27 @@ def update_product_variant(
             detail="No data provided for update",
         )
      # check if the ProductID, SizeID, TypeID exist in original tables
-    if "ProductID" in update_data and db.query(Products).filter(Products.ProductID == update_data["ProductID"]).first() is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with id '{update_data['ProductID']}' not found")
-
-    if "SizeID" in update_data and db.query(Sizes).filter(Sizes.SizeID == update_data["SizeID"]).first() is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Size with id '{update_data['SizeID']}' not found")
-
-    if "TypeID" in update_data and db.query(Types).filter(Types.TypeID == update_data["TypeID"]).first() is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Type with id '{update_data['TypeID']}' not found")
+    _ensure_variant_refs_exist(
+        db,
+        update_data.get("ProductID"),
+        update_data.get("SizeID"),
+        update_data.get("TypeID")
+    )
 
     try:
-        if "ProductID" in update_data:
-            variant.ProductID = update_data["ProductID"]
-        if "SizeID" in update_data:
-            variant.SizeID = update_data["SizeID"]
-        if "TypeID" in update_data:
-            variant.TypeID = update_data["TypeID"]
-        if "Price" in update_data:
-            variant.Price = update_data["Price"]
-        if "IsAvailable" in update_data:
-            variant.IsAvailable = update_data["IsAvailable"]
-
+        variant = update_returning(db, ProductVariant, [ProductVariant.VariantID == variant_id], update_data)
+        if variant is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"ProductVariant with id '{variant_id}' not found",
+            )
+        refs = _variant_refs(db, variant["ProductID"], variant["SizeID"], variant["TypeID"])
         db.commit()
-        db.refresh(variant)
-        return variant
+        invalidate_catalog()
+        invalidate_price_table()
+        return _variant_complete({**variant, **refs})
+    except HTTPException:
+        raise
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -272,6 +388,8 @@ def delete_product_variant(
     try:
         db.delete(variant)
         db.commit()
+        invalidate_catalog()
+        invalidate_price_table()
         return None
     except Exception:
         db.rollback()
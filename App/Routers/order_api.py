@@ -2,33 +2,171 @@
 # order_api.py
 #======================================
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Header, status
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import update, insert, select, func, bindparam, any_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from decimal import Decimal
 import logging
-from typing import List
+import uuid
+from typing import List, Optional
 
 from Database.pydantic_schema import orders_schema
 from Database.models.orders_info_model import Order, OrderStatus
 
 from Database.models.order_item_model import OrderItem
-from Database.models.product_model import ProductVariant
+from Database.models.product_model import ProductVariant, Sizes
+from Database.models.shift_model import Shift
 from Database.models.address_zone_model import Address
 from Database.models.user_model import User
 from Database import db_connect
+from Database.write_helpers import update_returning
+from Service.Idempotency import hash_request, get_stored_response, claim_key, store_response
+from Service.Orders import price_order_items, PricedItem, PricingError, CUSTOM_SIZE_NAME
+from Service.Cache.price_table import get_price_table, VariantPrice
+from Service.Cache.zone_cache import get_zone
+from Service.Auth import get_token_user_id
+from config.fast_json import fast_json_response, rows_to_dicts
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
+# حالات نهائية لا يمكن تغييرها في التحديث الجماعي
+FINAL_STATUSES = (OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+
+ORDER_LIST_ADAPTER = TypeAdapter(List[orders_schema.OrderListResponse])
+
+# الأعمدة المطلوبة فقط لـ OrderListResponse (بدون تحميل ORM objects)
+ORDER_LIST_COLUMNS = (
+    Order.OrderID,
+    Order.OrderNumber,
+    Order.UserID,
+    Order.OrderStatus,
+    Order.TotalPrice,
+    Order.OrderTimestamp,
+    (Order.OrderStatus == OrderStatus.DELIVERED).label("is_completed")
+)
+
+
+def _replay_stored_order(db: Session, key: str, request_hash: str) -> Optional[JSONResponse]:
+    """إعادة الاستجابة الأصلية لطلب سبق تنفيذه بنفس Idempotency-Key"""
+    stored = get_stored_response(db, key)
+    if stored is None or stored.StatusCode is None:
+        return None
+
+    if stored.RequestHash != request_hash:
+        logger.warning(f"Idempotency-Key مستخدم مع طلب مختلف - Key: {key}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error": "مفتاح Idempotency-Key مستخدم مع طلب مختلف"})
+
+    logger.info(f"إعادة استجابة طلب سابق - Key: {key}")
+    return JSONResponse(
+        status_code=stored.StatusCode,
+        content=stored.ResponseBody,
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+def _begin_idempotent_order(db: Session, key: str, request_hash: str) -> Optional[JSONResponse]:
+    """
+    إعادة الاستجابة المخزنة إن وجدت، وإلا حجز المفتاح لهذا الطلب
+
+    Raises:
+        HTTPException: 409 إذا كان طلب آخر بنفس المفتاح قيد التنفيذ
+    """
+    replay = _replay_stored_order(db, key, request_hash)
+    if replay:
+        return replay
+
+    # حجز المفتاح: الطلبات المتزامنة بنفس المفتاح تنتظر هنا حتى ينتهي الطلب الأول
+    if not claim_key(db, key, request_hash):
+        replay = _replay_stored_order(db, key, request_hash)
+        if replay:
+            return replay
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "طلب بنفس المفتاح قيد التنفيذ"})
+    return None
+
+
+def _store_order_response(db: Session, key: str, response_body: dict) -> None:
+    stored_body = orders_schema.OrderListResponse.model_validate(response_body).model_dump(mode="json", by_alias=True)
+    store_response(db, key, status.HTTP_201_CREATED, stored_body)
+
+
+def _insert_order(db: Session, values: dict, priced_items: List[PricedItem]) -> dict:
+    """
+    إنشاء الطلب وعناصره (بدون commit):
+    - INSERT ... RETURNING واحد للطلب (OrderNumber = آخر رقم في الشفت + 1 داخل نفس الجملة)
+    - INSERT واحد متعدد الصفوف للعناصر
+
+    Returns:
+        أعمدة OrderListResponse للطلب الجديد
+    """
+    next_order_number = select(
+        func.coalesce(func.max(Order.OrderNumber), 0) + 1
+    ).where(Order.ShiftID == values["ShiftID"]).scalar_subquery()
+
+    new_order = db.execute(
+        insert(Order).values(**values, OrderNumber=next_order_number).returning(*ORDER_LIST_COLUMNS)
+    ).one()
+
+    db.execute(insert(OrderItem).values([
+        {
+            "OrderID": new_order.OrderID,
+            "VariantID": item.VariantID,
+            "Quantity": item.Quantity,
+            "UnitPrice": item.UnitPrice,
+            "Subtotal": item.Subtotal,
+            "IsSada": item.IsSada
+        }
+        for item in priced_items
+    ]))
+
+    # بدون refresh: كل بيانات الاستجابة جاءت من RETURNING
+    return new_order._asdict()
+
+def _delivery_cost(zone_id: int):
+    """تكلفة التوصيل من جدول المناطق في الذاكرة (409 إذا لم تعد منطقة العنوان موجودة)"""
+    zone = get_zone(zone_id)
+    if zone is None:
+        logger.warning("منطقة العنوان غير موجودة - ZoneID: %s", zone_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "منطقة التوصيل الخاصة بالعنوان غير موجودة"})
+    return zone.DeliveryCost
+
+def _ensure_user_exists(db: Session, user_id, token_user_id: Optional[uuid.UUID]) -> None:
+    """
+    التحقق من وجود المستخدم:
+    - token صالح لنفس المستخدم -> بدون استعلام (الـ token لا يصدر إلا لمستخدم موجود)
+    - token لمستخدم آخر -> 403
+    - بدون token -> استعلام عن المستخدم كما كان
+
+    Raises:
+        HTTPException: 403 / 404
+    """
+    if token_user_id is not None:
+        try:
+            same_user = uuid.UUID(str(user_id)) == token_user_id
+        except ValueError:
+            same_user = False
+
+        if not same_user:
+            logger.warning("token لا يخص المستخدم المطلوب - UserID: %s", user_id)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"error": "غير مسموح بالوصول لبيانات مستخدم آخر"})
+        return
+
+    if db.query(User.UserID).filter(User.UserID == user_id).first() is None:
+        logger.warning("المستخدم غير موجود - UserID: %s", user_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "المستخدم غير موجود"})
+
 #===========================
 # 1.POST Create Order
 #===========================
@@ -36,129 +174,69 @@ router = APIRouter(prefix="/orders", tags=["Orders"])
 @router.post("/create", response_model=orders_schema.OrderListResponse, status_code=status.HTTP_201_CREATED)
 def create_order(
     order_data: orders_schema.OrderCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    token_user_id: Optional[uuid.UUID] = Depends(get_token_user_id),
     db: Session = Depends(db_connect.get_db)):
+    """
+    إنشاء طلب جديد
+    - يدعم Idempotency-Key: إعادة المحاولة بنفس المفتاح تعيد نفس الاستجابة بدون إنشاء طلب مكرر
+    """
     try:
-        logger.info(f"بدء إنشاء طلب - UserID: {order_data.UserID}")
+        if idempotency_key:
+            replay = _begin_idempotent_order(db, idempotency_key, hash_request(order_data.model_dump_json()))
+            if replay:
+                return replay
+
+        logger.debug("بدء إنشاء طلب - UserID: %s", order_data.UserID)
         
-        # التحقق من المستخدم
-        user = db.query(User).filter(User.UserID == order_data.UserID).first()
-        if not user:
-            logger.error(f"المستخدم غير موجود - UserID: {order_data.UserID}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": "المستخدم غير موجود"}
-            )
+        # التحقق من المستخدم (بدون استعلام إذا أرسل العميل token صالح)
+        _ensure_user_exists(db, order_data.UserID, token_user_id)
         
-        # التحقق من العنوان وجلب تكلفة التوصيل
-        address = db.query(Address).options(
-            joinedload(Address.delivery_zone)
-        ).filter(
+        # التحقق من العنوان (استعلام واحد بالـ primary key) وتكلفة التوصيل من جدول المناطق في الذاكرة
+        zone_id = db.query(Address.ZoneID).filter(
             Address.AddressID == order_data.AddressID,
             Address.UserID == order_data.UserID
-        ).first()
+        ).scalar()
         
-        if not address:
-            logger.error(f"العنوان غير موجود - AddressID: {order_data.AddressID}")
+        if zone_id is None:
+            logger.warning("العنوان غير موجود - AddressID: %s", order_data.AddressID)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail={"error": "العنوان غير موجود أو لا يخص هذا المستخدم"})
         
-        delivery_cost = address.delivery_zone.DeliveryCost
-        logger.info(f"العنوان: {address.City} - تكلفة التوصيل: {delivery_cost}")
+        delivery_cost = _delivery_cost(zone_id)
+        logger.debug("المنطقة: %s - تكلفة التوصيل: %s", zone_id, delivery_cost)
         
-        # التحقق من المنتجات وحساب المجموع
-        order_items_data = []
-        items_total = Decimal('0.00')
-        
-        for item in order_data.items:
-            variant = db.query(ProductVariant).options(
-                joinedload(ProductVariant.sizes)
-            ).filter(
-                ProductVariant.VariantID == item.VariantID
-            ).first()
-            
-            if not variant:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail={"error": f"المنتج رقم {item.VariantID} غير موجود"})
-            
-            if not variant.IsAvailable:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={"error": f"المنتج رقم {item.VariantID} غير متوفر حالياً"})
-            
-            # التحقق: إذا كان الحجم "حسب الطلب"، يجب إرسال CustomPrice
-            is_custom_size = variant.sizes and variant.sizes.SizeName == "حسب الطلب"
-            
-            if is_custom_size:
-                if not item.CustomPrice:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail={"error": f"المنتج رقم {item.VariantID} يتطلب تحديد السعر (الحد الأدنى 10 ج.م)"})
-                
-                if item.CustomPrice < 10:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail={"error": f"السعر المخصص يجب أن يكون 10 ج.م على الأقل"})
-                
-                unit_price = item.CustomPrice
-                logger.info(f"منتج حسب الطلب - VariantID: {item.VariantID}, السعر المخصص: {unit_price}")
-            else:
-                # منتج عادي - استخدم السعر من قاعدة البيانات
-                unit_price = Decimal(str(variant.Price))
-            
-            subtotal = unit_price * item.Quantity
-            items_total += subtotal
-            
-            order_items_data.append({
-                'variant': variant,
-                'quantity': item.Quantity,
-                'unit_price': unit_price,
-                'subtotal': subtotal
-            })
+        # الأسعار والتوفر من جدول الأسعار في الذاكرة (بدون قراءة جداول الكتالوج)
+        variants = get_price_table(db)
+        logger.debug("جدول الأسعار - version: %s", variants.version)
+
+        try:
+            priced_items, items_total = price_order_items(order_data.items, variants)
+        except PricingError as e:
+            raise HTTPException(status_code=e.status_code, detail={"error": e.message})
         
         total_price = items_total + delivery_cost
-        logger.info(f"السعر الإجمالي: {total_price}")
-        
-        # حساب OrderNumber بناءً على الشفت الحالي
-        last_order = db.query(Order).filter(
-            Order.ShiftID == order_data.ShiftID
-        ).order_by(Order.OrderNumber.desc()).first()
-        order_number = (last_order.OrderNumber + 1) if last_order else 1
-        
-        # إنشاء الطلب
-        new_order = Order(
-            UserID=order_data.UserID,
-            AddressID=order_data.AddressID,
-            PaymentID=order_data.PaymentID,
-            ShiftID=order_data.ShiftID,
-            OrderNumber=order_number,
-            DeliveryFee=delivery_cost,
-            TotalPrice=total_price,
-            OrderNotes=order_data.OrderNotes,
-            ExternalNotes=order_data.ExternalNotes
-        )
-        
-        db.add(new_order)
-        db.flush()
-        
-        # إنشاء عناصر الطلب
-        for idx, item_data in enumerate(order_items_data):
-            order_item = OrderItem(
-                OrderID=new_order.OrderID,
-                VariantID=item_data['variant'].VariantID,
-                Quantity=item_data['quantity'],
-                UnitPrice=item_data['unit_price'],
-                Subtotal=item_data['subtotal'],
-                IsSada=order_data.items[idx].IsSada if order_data.items[idx].IsSada is not None else False
-            )
-            db.add(order_item)
+        logger.debug("السعر الإجمالي: %s", total_price)
+        
+        response_body = _insert_order(db, {
+            "UserID": order_data.UserID,
+            "AddressID": order_data.AddressID,
+            "PaymentID": order_data.PaymentID,
+            "ShiftID": order_data.ShiftID,
+            "DeliveryFee": delivery_cost,
+            "TotalPrice": total_price,
+            "OrderNotes": order_data.OrderNotes,
+            "ExternalNotes": order_data.ExternalNotes
+        }, priced_items)
+
+        if idempotency_key:
+            _store_order_response(db, idempotency_key, response_body)
         
         db.commit()
-        db.refresh(new_order)
         
-        logger.info(f"تم إنشاء الطلب - OrderID: {new_order.OrderID}")
-        return new_order
+        logger.info("تم إنشاء الطلب - OrderID: %s, الإجمالي: %s", response_body["OrderID"], total_price)
+        return response_body
         
     except HTTPException:
         db.rollback()
@@ -193,19 +271,19 @@ def create_order(
 def get_all_orders(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(db_connect.get_db)
+    db: Session = Depends(db_connect.get_read_db)
     ):
 
     try:
         if limit > 500:
             limit = 500
         
-        orders = db.query(Order).order_by(
+        orders = db.query(*ORDER_LIST_COLUMNS).order_by(
             Order.OrderTimestamp.desc()
         ).offset(skip).limit(limit).all()
         
         logger.info(f"تم جلب {len(orders)} طلب")
-        return orders
+        return fast_json_response(ORDER_LIST_ADAPTER, rows_to_dicts(orders))
         
     except SQLAlchemyError as e:
         logger.error(f"خطأ في قاعدة البيانات: {str(e)}")
@@ -228,20 +306,16 @@ def get_user_orders(
     user_id: str,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(db_connect.get_db)
+    token_user_id: Optional[uuid.UUID] = Depends(get_token_user_id),
+    db: Session = Depends(db_connect.get_read_db)
     ):
     """جلب طلبات مستخدم معين"""
     try:
         if limit > 500:
             limit = 500
         
-        # التحقق من وجود المستخدم
-        user = db.query(User).filter(User.UserID == user_id).first()
-        if not user:
-            logger.error(f"المستخدم غير موجود - UserID: {user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": "المستخدم غير موجود"})
+        # التحقق من وجود المستخدم (بدون استعلام إذا أرسل العميل token صالح)
+        _ensure_user_exists(db, user_id, token_user_id)
         
         orders = db.query(Order).filter(
             Order.UserID == user_id
@@ -273,7 +347,7 @@ def get_user_orders(
 @router.get("/order_details/{order_id}", response_model=orders_schema.OrderResponse)
 def get_order_details(
     order_id: int,
-    db: Session = Depends(db_connect.get_db)
+    db: Session = Depends(db_connect.get_read_db)
     ):
     """جلب تفاصيل طلب معين باستخدام OrderID فقط"""
     try:
@@ -314,17 +388,13 @@ def get_order_details(
 @router.get("/user/{user_id}/active", response_model=List[orders_schema.OrderListResponse])
 def get_user_active_orders(
     user_id: str,
-    db: Session = Depends(db_connect.get_db)
+    token_user_id: Optional[uuid.UUID] = Depends(get_token_user_id),
+    db: Session = Depends(db_connect.get_read_db)
     ):
     """جلب الطلبات النشطة لمستخدم معين"""
     try:
-        # التحقق من وجود المستخدم
-        user = db.query(User).filter(User.UserID == user_id).first()
-        if not user:
-            logger.error(f"المستخدم غير موجود - UserID: {user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": "المستخدم غير موجود"})
+        # التحقق من وجود المستخدم (بدون استعلام إذا أرسل العميل token صالح)
+        _ensure_user_exists(db, user_id, token_user_id)
         
         orders = db.query(Order).filter(
             Order.UserID == user_id,
@@ -366,33 +436,38 @@ def cancel_user_order(
     إلغاء طلب (مع التحقق من المستخدم)
     """
     try:
-        # جلب الطلب مع التحقق المباشر
-        order = db.query(Order).filter(
+        # الإلغاء مع التحقق المباشر في جملة واحدة (الطلب يخص المستخدم وليس في حالة نهائية)
+        order = update_returning(db, Order, [
             Order.OrderID == order_id,
-            Order.UserID == user_id  # ✅ تحقق مباشر
-        ).first()
+            Order.UserID == user_id,  # ✅ تحقق مباشر
+            Order.OrderStatus.notin_(FINAL_STATUSES)
+        ], {"OrderStatus": OrderStatus.CANCELLED}, ORDER_LIST_COLUMNS)
         
         if not order:
-            logger.error(f"الطلب غير موجود أو لا يخص المستخدم - OrderID: {order_id}, UserID: {user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": "الطلب غير موجود أو لا يخصك"})
-        
-        if order.OrderStatus == OrderStatus.CANCELLED:
-            logger.warning(f"الطلب ملغى مسبقاً - OrderID: {order_id}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={"error": "الطلب ملغى مسبقاً"})
-        
-        if order.OrderStatus == OrderStatus.DELIVERED:
+            # سبب الرفض فقط عند الفشل
+            current_status = db.query(Order.OrderStatus).filter(
+                Order.OrderID == order_id,
+                Order.UserID == user_id
+            ).scalar()
+            
+            if current_status is None:
+                logger.error(f"الطلب غير موجود أو لا يخص المستخدم - OrderID: {order_id}, UserID: {user_id}")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail={"error": "الطلب غير موجود أو لا يخصك"})
+            
+            if current_status == OrderStatus.CANCELLED:
+                logger.warning(f"الطلب ملغى مسبقاً - OrderID: {order_id}")
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={"error": "الطلب ملغى مسبقاً"})
+            
             logger.warning(f"لا يمكن إلغاء طلب مكتمل - OrderID: {order_id}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": "لا يمكن إلغاء طلب تم توصيله"})
         
-        order.OrderStatus = OrderStatus.CANCELLED
         db.commit()
-        db.refresh(order)
         
         logger.info(f"تم إلغاء الطلب {order_id} بواسطة المستخدم {user_id}")
         return order
@@ -423,7 +498,8 @@ def get_orders_by_status(
     order_status: OrderStatus,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(db_connect.get_db)
+    token_user_id: Optional[uuid.UUID] = Depends(get_token_user_id),
+    db: Session = Depends(db_connect.get_read_db)
     ):
     """
     Get user orders by status using user_id of the user
@@ -436,13 +512,8 @@ def get_orders_by_status(
         if limit > 500:
             limit = 500
         
-        # التحقق من وجود المستخدم
-        user = db.query(User).filter(User.UserID == user_id).first()
-        if not user:
-            logger.error(f"المستخدم غير موجود - UserID: {user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": "المستخدم غير موجود"})
+        # التحقق من وجود المستخدم (بدون استعلام إذا أرسل العميل token صالح)
+        _ensure_user_exists(db, user_id, token_user_id)
         
         orders = db.query(Order).filter(
             Order.UserID == user_id,
@@ -489,7 +560,8 @@ def update_order_status(
     """
     
     try:
-        order = db.query(Order).filter(Order.OrderID == order_id).first()
+        order = update_returning(db, Order, [Order.OrderID == order_id],
+                                 {"OrderStatus": new_status}, ORDER_LIST_COLUMNS)
         
         if not order:
             logger.error(f"الطلب غير موجود - OrderID: {order_id}")
@@ -498,12 +570,9 @@ def update_order_status(
                 detail={"error": "الطلب غير موجود"}
             )
         
-        old_status = order.OrderStatus
-        order.OrderStatus = new_status
         db.commit()
-        db.refresh(order)
         
-        logger.info(f"تم تحديث حالة الطلب {order_id} من {old_status} إلى {new_status}")
+        logger.info(f"تم تحديث حالة الطلب {order_id} إلى {new_status}")
         return order
         
     except HTTPException:
@@ -535,7 +604,7 @@ def get_orders_by_shift(
     shift_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(db_connect.get_db)
+    db: Session = Depends(db_connect.get_read_db)
     ):
     """
     جلب جميع الطلبات المرتبطة بشفت معين
@@ -580,3 +649,244 @@ def get_orders_by_shift(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": "حدث خطأ غير متوقع"}
         )
+
+#=======================================
+# 10. PATCH Bulk Update Orders Status (admin)
+#=======================================
+
+@router.patch("/status/bulk", response_model=orders_schema.OrderStatusBulkResponse)
+def bulk_update_order_status(
+    bulk_data: orders_schema.OrderStatusBulkUpdate,
+    db: Session = Depends(db_connect.get_db)
+    ):
+    """
+    تحديث حالة مجموعة طلبات مرة واحدة (مثلاً المطبخ يجهز عدة طلبات معاً)
+    - يتم التحديث في جملة UPDATE واحدة
+    - الطلبات المكتملة أو الملغاة أو التي لها نفس الحالة يتم رفضها
+    - يعرض نتيجة كل طلب على حدة
+    """
+    try:
+        new_status = OrderStatus(bulk_data.NewStatus.value)
+        order_ids = list(dict.fromkeys(bulk_data.OrderIDs))
+        ids_param = bindparam("order_ids", value=order_ids, type_=ARRAY(Integer))
+
+        updated_ids = set(db.execute(
+            update(Order)
+            .where(
+                Order.OrderID == any_(ids_param),
+                Order.OrderStatus.notin_(FINAL_STATUSES),
+                Order.OrderStatus != new_status
+            )
+            .values(OrderStatus=new_status)
+            .returning(Order.OrderID)
+            .execution_options(synchronize_session=False)
+        ).scalars().all())
+
+        # جلب الحالة الحالية للطلبات المرفوضة فقط لمعرفة سبب الرفض
+        rejected_ids = [order_id for order_id in order_ids if order_id not in updated_ids]
+        current_statuses = {}
+        if rejected_ids:
+            rejected_param = bindparam("rejected_ids", value=rejected_ids, type_=ARRAY(Integer))
+            current_statuses = dict(db.query(Order.OrderID, Order.OrderStatus).filter(
+                Order.OrderID == any_(rejected_param)
+            ).all())
+
+        db.commit()
+
+        results = []
+        for order_id in order_ids:
+            if order_id in updated_ids:
+                results.append(orders_schema.OrderStatusBulkItem(
+                    OrderID=order_id, Updated=True, CurrentStatus=new_status.value))
+                continue
+
+            current = current_statuses.get(order_id)
+            if current is None:
+                reason = "الطلب غير موجود"
+            elif current == new_status:
+                reason = "الطلب بالفعل بهذه الحالة"
+            elif current == OrderStatus.CANCELLED:
+                reason = "الطلب ملغى مسبقاً"
+            else:
+                reason = "لا يمكن تغيير حالة طلب تم توصيله"
+
+            results.append(orders_schema.OrderStatusBulkItem(
+                OrderID=order_id,
+                Updated=False,
+                CurrentStatus=current.value if current else None,
+                Reason=reason))
+
+        logger.info(f"تحديث جماعي إلى {new_status.value}: {len(updated_ids)} تم، {len(rejected_ids)} مرفوض")
+        return orders_schema.OrderStatusBulkResponse(
+            NewStatus=new_status.value,
+            UpdatedCount=len(updated_ids),
+            RejectedCount=len(rejected_ids),
+            results=results
+        )
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"خطأ في قاعدة البيانات: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "فشل تحديث حالة الطلبات"}
+        )
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"خطأ غير متوقع: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "حدث خطأ غير متوقع"}
+        )
+
+#=======================================
+# 11. POST Reorder (نسخ طلب سابق)
+#=======================================
+
+@router.post("/{order_id}/reorder", response_model=orders_schema.OrderListResponse, status_code=status.HTTP_201_CREATED)
+def reorder(
+    order_id: int,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    token_user_id: Optional[uuid.UUID] = Depends(get_token_user_id),
+    db: Session = Depends(db_connect.get_db)):
+    """
+    إنشاء طلب جديد بنفس منتجات طلب سابق (بدل إعادة بناء السلة من المنيو)
+    - نفس المستخدم والعنوان وطريقة الدفع والملاحظات (OrderNotes و ExternalNotes)
+    - الأسعار والتوفر الحالية من الكتالوج (استعلام واحد مع عناصر الطلب السابق)
+    - المنتجات "حسب الطلب" بنفس السعر المخصص السابق
+    - الطلب الجديد على الشفت المفتوح حالياً
+    - يدعم Idempotency-Key مثل /orders/create
+    """
+    try:
+        if idempotency_key:
+            replay = _begin_idempotent_order(db, idempotency_key, hash_request(f"reorder:{order_id}"))
+            if replay:
+                return replay
+
+        # الطلب السابق + منطقة العنوان + الشفت المفتوح حالياً في استعلام واحد
+        open_shift_id = select(Shift.ShiftID).where(
+            Shift.End_Time.is_(None),
+            Shift.IsActive.is_(True)
+        ).order_by(Shift.ShiftID.desc()).limit(1).scalar_subquery()
+
+        source = db.query(
+            Order.UserID,
+            Order.AddressID,
+            Order.PaymentID,
+            Order.OrderNotes,
+            Order.ExternalNotes,
+            Address.ZoneID,
+            open_shift_id.label("OpenShiftID")
+        ).join(Address, Address.AddressID == Order.AddressID).filter(Order.OrderID == order_id).first()
+
+        if source is None:
+            logger.warning("الطلب غير موجود - OrderID: %s", order_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"error": "الطلب غير موجود"})
+
+        if token_user_id is not None and source.UserID != token_user_id:
+            logger.warning("token لا يخص صاحب الطلب - OrderID: %s", order_id)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"error": "غير مسموح بإعادة طلب مستخدم آخر"})
+
+        if source.OpenShiftID is None:
+            logger.warning("لا يوجد شفت مفتوح لإعادة الطلب - OrderID: %s", order_id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"error": "لا يوجد شفت مفتوح حالياً"})
+
+        # عناصر الطلب السابق مع السعر والتوفر الحاليين للـ variant (استعلام واحد)
+        rows = db.query(
+            OrderItem.VariantID,
+            OrderItem.Quantity,
+            OrderItem.UnitPrice,
+            OrderItem.IsSada,
+            ProductVariant.Price,
+            ProductVariant.IsAvailable,
+            Sizes.SizeName
+        ).join(
+            ProductVariant, ProductVariant.VariantID == OrderItem.VariantID
+        ).outerjoin(
+            Sizes, Sizes.SizeID == ProductVariant.SizeID
+        ).filter(OrderItem.OrderID == order_id).order_by(OrderItem.OrderItemID).all()
+
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "الطلب السابق لا يحتوي على منتجات"})
+
+        variants = {
+            row.VariantID: VariantPrice(
+                Price=row.Price,
+                IsAvailable=row.IsAvailable,
+                IsCustomPrice=row.SizeName == CUSTOM_SIZE_NAME
+            )
+            for row in rows
+        }
+        # model_construct بدون تحقق الـ schema: سعر مخصص قديم أقل من الحد الأدنى (منتج تحول إلى "حسب الطلب")
+        # يرفضه price_order_items بـ PricingError (400) بدلاً من ValidationError (500)
+        items = [
+            orders_schema.OrderItemCreate.model_construct(
+                VariantID=row.VariantID,
+                Quantity=row.Quantity,
+                CustomPrice=row.UnitPrice if variants[row.VariantID].IsCustomPrice else None,
+                IsSada=row.IsSada
+            )
+            for row in rows
+        ]
+
+        try:
+            priced_items, items_total = price_order_items(items, variants)
+        except PricingError as e:
+            raise HTTPException(status_code=e.status_code, detail={"error": e.message})
+
+        delivery_cost = _delivery_cost(source.ZoneID)
+        total_price = items_total + delivery_cost
+
+        response_body = _insert_order(db, {
+            "UserID": source.UserID,
+            "AddressID": source.AddressID,
+            "PaymentID": source.PaymentID,
+            "ShiftID": source.OpenShiftID,
+            "DeliveryFee": delivery_cost,
+            "TotalPrice": total_price,
+            "OrderNotes": source.OrderNotes,
+            "ExternalNotes": source.ExternalNotes
+        }, priced_items)
+
+        if idempotency_key:
+            _store_order_response(db, idempotency_key, response_body)
+
+        db.commit()
+
+        logger.info("تم إعادة الطلب %s - OrderID الجديد: %s, الإجمالي: %s",
+                    order_id, response_body["OrderID"], total_price)
+        return response_body
+
+    except HTTPException:
+        db.rollback()
+        raise
+
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"خطأ IntegrityError: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "خطأ في البيانات المدخلة"})
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"خطأ SQLAlchemyError: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "فشل إعادة الطلب"})
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"خطأ غير متوقع: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "حدث خطأ غير متوقع"})
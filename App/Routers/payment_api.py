@@ -3,7 +3,8 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
 
-from Database.db_connect import get_db
+from Database.db_connect import get_db, get_read_db
+from Database.write_helpers import insert_returning
 from Database.models.payment_model import PaymentMethod # الجدول نفسه
 from Database.pydantic_schema.payment_schema import (
     PaymentCreate,
@@ -18,7 +19,7 @@ payment_router = APIRouter(prefix="/payment", tags=["Payment"])
 
 # Get All Payment Methods
 @payment_router.get("/all_payment_methods", response_model=List[PaymentResponse])
-def list_payment_methods(db: Session = Depends(get_db)):
+def list_payment_methods(db: Session = Depends(get_read_db)):
     return db.query(PaymentMethod).order_by(PaymentMethod.PaymentID.asc()).all()
 
 # Create Payment Method
@@ -27,10 +28,8 @@ def create_payment_method(
      payment_in: PaymentCreate,
      db: Session = Depends(get_db)):
     try:
-        payment = PaymentMethod(**payment_in.model_dump())
-        db.add(payment)
+        payment = insert_returning(db, PaymentMethod, payment_in.model_dump())
         db.commit()
-        db.refresh(payment)
         return payment
     except IntegrityError:
         db.rollback()
@@ -1,27 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
+from sqlalchemy import not_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List
 from datetime import datetime, date
 import logging
 
-from Database.db_connect import get_db
+from Database.db_connect import get_db, get_read_db
+from Database.write_helpers import insert_returning, update_returning
 from Database.models.shift_model import Shift
 from Database.pydantic_schema.shift_schema import ShiftStart, ShiftResponse
 from Database.pydantic_schema.shift_report_schema import ShiftReportResponse
 from Service.ShiftReport.shift_report_service import get_shift_report_data
-from Service.CreateDocx.shift_report_docx import create_shift_report_in_memory
+from Service import CreateDocx
 
 logger = logging.getLogger("shifts")
-logger.setLevel(logging.INFO)
-
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-
-if not logger.handlers:
-    logger.addHandler(console_handler)
 
 #======================================
 # Shifts API 
@@ -46,18 +40,16 @@ def start_shift(data: ShiftStart,
         raise HTTPException(400, f"وردية {data.Shift_Number} مفتوحة بالفعل")
     
     try:
-        shift = Shift(
-            Shift_Date=today,
-            Shift_Number=data.Shift_Number,
-            Start_Time=now,
-            End_Time=None,
-            IsActive=True
-        )
-        db.add(shift)
+        shift = insert_returning(db, Shift, {
+            "Shift_Date": today,
+            "Shift_Number": data.Shift_Number,
+            "Start_Time": now,
+            "End_Time": None,
+            "IsActive": True
+        })
         db.commit()
-        db.refresh(shift)
         
-        logger.info(f"✓ بدء وردية {shift.Shift_Number}")
+        logger.info(f"✓ بدء وردية {shift['Shift_Number']}")
         return shift
         
     except IntegrityError:
@@ -73,23 +65,21 @@ def start_shift(data: ShiftStart,
 @router.patch("/end_shift/{shift_id}")
 def end_shift(shift_id: int, db: Session = Depends(get_db)):
     
-    # البحث بـ ShiftID
-    shift = db.query(Shift).filter(
-        Shift.ShiftID == shift_id,
-        Shift.End_Time == None  # مفتوحة
-    ).first()
-    
-    if not shift:
-        raise HTTPException(404, f"لا توجد وردية بهذا الرقم أو أنها منتهية بالفعل")
-    
     try:
-        shift.End_Time = datetime.now().time()
-        shift.IsActive = False
-        db.commit()
-        db.refresh(shift)
+        # البحث بـ ShiftID (مفتوحة فقط) والإنهاء في جملة واحدة
+        shift = update_returning(db, Shift, [
+            Shift.ShiftID == shift_id,
+            Shift.End_Time == None  # مفتوحة
+        ], {"End_Time": datetime.now().time(), "IsActive": False})
+        
+        if not shift:
+            raise HTTPException(404, f"لا توجد وردية بهذا الرقم أو أنها منتهية بالفعل")
         
-        logger.info(f"✓ إنهاء وردية {shift.Shift_Number}")
+        db.commit()
+        logger.info(f"✓ إنهاء وردية {shift['Shift_Number']}")
         return shift
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(500, "فشل إنهاء الوردية")
@@ -99,30 +89,33 @@ def end_shift(shift_id: int, db: Session = Depends(get_db)):
 def toggle_active(shift_id: int, db: Session = Depends(get_db)):
     """إيقاف/استئناف الوردية"""
     
-    shift = db.query(Shift).filter(Shift.ShiftID == shift_id).first()
-    
-    if not shift:
-        raise HTTPException(404, "الوردية غير موجودة")
-    
-    if shift.End_Time:
-        raise HTTPException(400, "الوردية منتهية")
-    
     try:
-        shift.IsActive = not shift.IsActive
-        db.commit()
-        db.refresh(shift)
+        # القلب داخل قاعدة البيانات (IsActive = NOT IsActive) للوردية المفتوحة فقط
+        shift = update_returning(db, Shift, [
+            Shift.ShiftID == shift_id,
+            Shift.End_Time == None
+        ], {"IsActive": not_(Shift.IsActive)})
         
-        status = "نشطة" if shift.IsActive else "متوقفة"
-        logger.info(f"✓ تغيير حالة وردية {shift.Shift_Number} إلى {status}")
+        if not shift:
+            # سبب الرفض فقط عند الفشل: غير موجودة أم منتهية
+            if db.query(Shift.ShiftID).filter(Shift.ShiftID == shift_id).first() is None:
+                raise HTTPException(404, "الوردية غير موجودة")
+            raise HTTPException(400, "الوردية منتهية")
+        
+        db.commit()
+        status = "نشطة" if shift["IsActive"] else "متوقفة"
+        logger.info(f"✓ تغيير حالة وردية {shift['Shift_Number']} إلى {status}")
         return shift
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         logger.error(f"✗ خطأ: {e}")
         raise HTTPException(500, "فشل تغيير الحالة")
 
 @router.get("/all_shifts", response_model=List[ShiftResponse])
-def get_all_shifts(db: Session = Depends(get_db)):
+def get_all_shifts(db: Session = Depends(get_read_db)):
     """جلب كل الشفتات"""
     
     shifts = db.query(Shift).order_by(
@@ -135,7 +128,7 @@ def get_all_shifts(db: Session = Depends(get_db)):
 
 
 @router.get("/shifts_by_date/{shift_date}", response_model=List[ShiftResponse])
-def get_shifts_by_date(shift_date: date, db: Session = Depends(get_db)):
+def get_shifts_by_date(shift_date: date, db: Session = Depends(get_read_db)):
     """عرض ورديات يوم محدد"""
     
     shifts = db.query(Shift).filter(
@@ -151,7 +144,7 @@ def get_shifts_by_date(shift_date: date, db: Session = Depends(get_db)):
 #======================================
 
 @router.get("/report/{shift_id}", response_model=ShiftReportResponse)
-def get_shift_report(shift_id: int, db: Session = Depends(get_db)):
+def get_shift_report(shift_id: int, db: Session = Depends(get_read_db)):
     """
     جلب تقرير الشفت كـ JSON
     
@@ -178,7 +171,7 @@ def get_shift_report(shift_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/report/{shift_id}/download")
-def download_shift_report(shift_id: int, db: Session = Depends(get_db)):
+def download_shift_report(shift_id: int, db: Session = Depends(get_read_db)):
 
     try:
         # 1. جلب بيانات التقرير
@@ -188,7 +181,7 @@ def download_shift_report(shift_id: int, db: Session = Depends(get_db)):
             raise HTTPException(404, "الشفت غير موجود")
         
         # 2. إنشاء ملف DOCX
-        file_stream, filename = create_shift_report_in_memory(report_data)
+        file_stream, filename = CreateDocx.create_shift_report_in_memory(report_data)
         
         logger.info(f"✓ تم إنشاء تقرير DOCX للشفت {shift_id}")
         
@@ -5,21 +5,18 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from Database.db_connect import get_db
+from Database.db_connect import get_db, get_read_db
+from Database.write_helpers import insert_returning, update_returning
+from Service.Cache.catalog_cache import invalidate_catalog
+from Service.Cache.price_table import invalidate_price_table
 from Database.models.product_model import Sizes, Types
 from Database.pydantic_schema.product_schema import (
     SizeCreate, SizeResponse, SizeUpdate,
     TypeCreate, TypeResponse, TypeUpdate
 )
 
-# إعداد Logger
+# إعداد Logger (الـ handlers في config/logging_config.py)
 logger = logging.getLogger("size_type_api")
-logger.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-if not logger.handlers:
-    logger.addHandler(console_handler)
 
 size_router = APIRouter(prefix="/sizes", tags=["Sizes"])
 type_router = APIRouter(prefix="/types", tags=["Types"])
@@ -36,11 +33,9 @@ def add_size(size: SizeCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=f"الحجم '{size.SizeName}' موجود بالفعل")
     
     try:
-        new_size = Sizes(SizeName=size.SizeName)
-        db.add(new_size)
+        new_size = insert_returning(db, Sizes, {"SizeName": size.SizeName})
         db.commit()
-        db.refresh(new_size)
-        logger.info(f"✓ تم إضافة الحجم بنجاح - ID: {new_size.SizeID}, Name: '{new_size.SizeName}'")
+        logger.info(f"✓ تم إضافة الحجم بنجاح - ID: {new_size['SizeID']}, Name: '{new_size['SizeName']}'")
         return new_size
     except IntegrityError as e:
         db.rollback()
@@ -53,7 +48,7 @@ def add_size(size: SizeCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"فشل إضافة الحجم: {str(e)}")
 
 @size_router.get("/get_sizes", response_model=List[SizeResponse])
-def get_all_sizes(db: Session = Depends(get_db)):
+def get_all_sizes(db: Session = Depends(get_read_db)):
     return db.query(Sizes).order_by(Sizes.SizeID.asc()).all()
 
 @size_router.put("/update_size/{size_name}", response_model=SizeResponse)
@@ -62,14 +57,6 @@ def update_size(
     size_update: SizeUpdate,
     db: Session = Depends(get_db),
 ):
-    db_size = db.query(Sizes).filter(Sizes.SizeName == size_name).first()
-
-    if db_size is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Size with name '{size_name}' not found",
-        )
-
     update_data = size_update.model_dump(exclude_unset=True, exclude_none=True)
     if not update_data:
         raise HTTPException(
@@ -78,12 +65,20 @@ def update_size(
         )
 
     try:
-        if "SizeName" in update_data:
-            db_size.SizeName = update_data["SizeName"]
+        db_size = update_returning(db, Sizes, [Sizes.SizeName == size_name], update_data)
+        if db_size is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Size with name '{size_name}' not found",
+            )
         db.commit()
-        db.refresh(db_size)
+        invalidate_catalog()
+        invalidate_price_table()
         return db_size
 
+    except HTTPException:
+        raise
+
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -110,6 +105,8 @@ def delete_size(size_name: str, db: Session = Depends(get_db)):
     try:
         db.delete(db_size)
         db.commit()
+        invalidate_catalog()
+        invalidate_price_table()
         return None
         
     except Exception:
@@ -131,11 +128,9 @@ def add_type(type_data: TypeCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=f"النوع '{type_data.TypeName}' موجود بالفعل")
     
     try:
-        new_type = Types(TypeName=type_data.TypeName)
-        db.add(new_type)
+        new_type = insert_returning(db, Types, {"TypeName": type_data.TypeName})
         db.commit()
-        db.refresh(new_type)
-        logger.info(f"✓ تم إضافة النوع بنجاح - ID: {new_type.TypeID}, Name: '{new_type.TypeName}'")
+        logger.info(f"✓ تم إضافة النوع بنجاح - ID: {new_type['TypeID']}, Name: '{new_type['TypeName']}'")
         return new_type
     except IntegrityError as e:
         db.rollback()
@@ -148,7 +143,7 @@ def add_type(type_data: TypeCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"فشل إضافة النوع: {str(e)}")
 
 @type_router.get("/get_types", response_model=List[TypeResponse])
-def get_all_types(db: Session = Depends(get_db)):
+def get_all_types(db: Session = Depends(get_read_db)):
     return db.query(Types).order_by(Types.TypeID.asc()).all()
 
 @type_router.put("/update_type/{type_name}", response_model=TypeResponse)
@@ -157,14 +152,6 @@ def update_type(
     type_update: TypeUpdate,
     db: Session = Depends(get_db),
 ):
-    db_type = db.query(Types).filter(Types.TypeName == type_name).first()
-
-    if db_type is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Type with name '{type_name}' not found",
-        )
-
     update_data = type_update.model_dump(exclude_unset=True, exclude_none=True)
     if not update_data:
         raise HTTPException(
@@ -173,13 +160,19 @@ def update_type(
         )
 
     try:
-        if "TypeName" in update_data:
-            db_type.TypeName = update_data["TypeName"]
-
+        db_type = update_returning(db, Types, [Types.TypeName == type_name], update_data)
+        if db_type is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Type with name '{type_name}' not found",
+            )
         db.commit()
-        db.refresh(db_type)
+        invalidate_catalog()
         return db_type
 
+    except HTTPException:
+        raise
+
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -206,6 +199,7 @@ def delete_type(type_name: str, db: Session = Depends(get_db)):
     try:
         db.delete(db_type)
         db.commit()
+        invalidate_catalog()
         return None
     except Exception:
         db.rollback()
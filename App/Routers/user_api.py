@@ -1,25 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func, select, text, true, union
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+from typing import Optional
 import uuid
 import logging
 
 from Database.pydantic_schema import user_schema
 from Database.models.user_model import User
+from Database.models.address_zone_model import Address, DeliveryZone
+from Database.models.orders_info_model import Order, OrderStatus
 from Database import db_connect
+from Database.write_helpers import insert_returning, update_returning
 from config import response
+from Service.Auth import issue_token
+from config.fast_json import fast_json_response, rows_to_dicts
 
-# إعداد Logger
+# إعداد Logger (الـ handlers في config/logging_config.py)
 logger = logging.getLogger("user_api")
-logger.setLevel(logging.INFO)
-
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-
-if not logger.handlers:
-    logger.addHandler(console_handler)
 
 router = APIRouter(
      prefix="/users",
@@ -31,22 +32,137 @@ router = APIRouter(
      -> ثم تشغيلها من الملف الرئيسي
 """
 
+USER_LIST_ADAPTER = TypeAdapter(list[user_schema.UserResponse])
+USER_LOOKUP_ADAPTER = TypeAdapter(list[user_schema.UserLookupResponse])
+
+USER_COLUMNS = (
+     User.UserID,
+     User.FName,
+     User.LName,
+     User.PhoneNumber,
+     User.Email,
+     User.createdAt,
+     User.lastLogin
+)
+
+# أعمدة آخر طلب (LATERAL join) بأسماء last_<field> ثم تُجمع في last_order
+LAST_ORDER_FIELDS = ("OrderID", "OrderNumber", "UserID", "OrderStatus", "TotalPrice", "OrderTimestamp", "is_completed")
+
 @router.get("/all_users", response_model=list[user_schema.UserResponse])
-def get_all_users(db: Session = Depends(db_connect.get_db)):
-     users = db.query(User).all()
-     return users
+def get_all_users(db: Session = Depends(db_connect.get_read_db)):
+     users = db.query(*USER_COLUMNS).all()
+     return fast_json_response(USER_LIST_ADAPTER, rows_to_dicts(users))
+
+def _phone_conditions(column, phone_prefix: Optional[str], phone_suffix: Optional[str]) -> list:
+     """
+     شروط البحث في عمود هاتف (تستخدم الـ indexes من migration 0004):
+     - البداية: column LIKE 'prefix%' (text_pattern_ops)
+     - النهاية: reverse(column) LIKE 'reversed_suffix%' (index على reverse)
+     """
+     conditions = []
+     if phone_prefix:
+          conditions.append(column.like(f"{phone_prefix}%"))
+     if phone_suffix:
+          conditions.append(func.reverse(column).like(f"{phone_suffix[::-1]}%"))
+     return conditions
+
+
+def _lookup_result(row) -> dict:
+     user = row._asdict()
+     last_order = {field: user.pop(f"last_{field}") for field in LAST_ORDER_FIELDS}
+     user["last_order"] = last_order if last_order["OrderID"] is not None else None
+     return user
+
+
+@router.get("/lookup", response_model=list[user_schema.UserLookupResponse])
+def lookup_users_by_phone(
+     phone_prefix: Optional[str] = Query(None, pattern=r"^\d{3,11}$", description="أول أرقام الهاتف"),
+     phone_suffix: Optional[str] = Query(None, pattern=r"^\d{3,11}$", description="آخر أرقام الهاتف"),
+     limit: int = Query(10, ge=1, le=50),
+     db: Session = Depends(db_connect.get_read_db)):
+     """
+     البحث عن عميل بجزء من رقم الهاتف (شاشة الكاشير)
+     - يطابق هاتف المستخدم أو هاتف المستلم في أي من عناوينه
+     - phone_prefix و phone_suffix معاً = نفس الرقم يبدأ وينتهي بهما
+     - النتيجة في استعلام واحد: المستخدم + العناوين مع المناطق (json_agg) + آخر طلب (LATERAL)
+     - المستخدمين المطابقين = UNION لاستعلامين كل منهما على index (users بالهاتف، address بالمستلم)
+       ثم join على users (OR مع IN subquery كان يتحول إلى seq scan على users)
+     """
+     if not phone_prefix and not phone_suffix:
+          raise HTTPException(
+               status_code=status.HTTP_400_BAD_REQUEST,
+               detail={"error": "يجب إرسال phone_prefix أو phone_suffix"})
+
+     try:
+          candidates = union(
+               select(User.UserID).where(
+                    and_(*_phone_conditions(User.PhoneNumber, phone_prefix, phone_suffix))),
+               select(Address.UserID).where(
+                    and_(*_phone_conditions(Address.RecipientPhone, phone_prefix, phone_suffix)))
+          ).subquery("candidates")
+
+          address_json = func.json_build_object(
+               "AddressID", Address.AddressID,
+               "UserID", Address.UserID,
+               "RecipientName", Address.RecipientName,
+               "Street", Address.Street,
+               "Building", Address.Building,
+               "City", Address.City,
+               "RecipientPhone", Address.RecipientPhone,
+               "Phone2", Address.Phone2,
+               "DeliveryNotes", Address.DeliveryNotes,
+               "ZoneID", Address.ZoneID,
+               "delivery_zone", func.json_build_object(
+                    "ZoneID", DeliveryZone.ZoneID,
+                    "ZoneName", DeliveryZone.ZoneName,
+                    "DeliveryCost", DeliveryZone.DeliveryCost
+               )
+          )
+          addresses = select(
+               func.coalesce(func.json_agg(aggregate_order_by(address_json, Address.AddressID)), text("'[]'::json"))
+          ).join_from(
+               Address, DeliveryZone, DeliveryZone.ZoneID == Address.ZoneID
+          ).where(Address.UserID == User.UserID).scalar_subquery()
+
+          last_order = select(
+               Order.OrderID,
+               Order.OrderNumber,
+               Order.UserID,
+               Order.OrderStatus,
+               Order.TotalPrice,
+               Order.OrderTimestamp,
+               (Order.OrderStatus == OrderStatus.DELIVERED).label("is_completed")
+          ).where(
+               Order.UserID == User.UserID
+          ).order_by(Order.OrderTimestamp.desc(), Order.OrderID.desc()).limit(1).lateral("last_order")
+
+          rows = db.query(
+               *USER_COLUMNS,
+               addresses.label("addresses"),
+               *(last_order.c[field].label(f"last_{field}") for field in LAST_ORDER_FIELDS)
+          ).select_from(candidates).join(
+               User, User.UserID == candidates.c.UserID
+          ).outerjoin(last_order, true()).order_by(User.PhoneNumber).limit(limit).all()
+
+          logger.info("بحث بالهاتف: %s نتيجة", len(rows))
+          return fast_json_response(USER_LOOKUP_ADAPTER, [_lookup_result(row) for row in rows])
+
+     except SQLAlchemyError as e:
+          logger.error(f"خطأ في قاعدة البيانات: {str(e)}")
+          raise HTTPException(
+               status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+               detail={"error": response.DATABASE_ERROR})
 
 @router.post("/register", response_model=user_schema.UserResponse, status_code=status.HTTP_201_CREATED)
 def register_user(user: user_schema.UserCreate,
                   db: Session=Depends(db_connect.get_db)):
      
      try:
-          logger.info(f"محاولة تسجيل مستخدم جديد: {user.PhoneNumber}")
           
           # التحقق من وجود المستخدم
           existing_user = db.query(User).filter(User.PhoneNumber == user.PhoneNumber).first()
           if existing_user:
-               logger.warning(f"المستخدم موجود بالفعل: {user.PhoneNumber}")
+               logger.warning("محاولة تسجيل برقم مسجل مسبقاً")
                raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
                     detail={
@@ -57,17 +173,12 @@ def register_user(user: user_schema.UserCreate,
 
           # إنشاء مستخدم جديد
           user_data = user.model_dump()
-          logger.info(f"بيانات المستخدم: {user_data}")
-          
-          # لا تضيف UserID يدوياً - دع SQLAlchemy يولده تلقائياً
-          new_user = User(**user_data)
           
-          logger.info(f"إضافة المستخدم إلى قاعدة البيانات...")
-          db.add(new_user)
+          # لا تضيف UserID يدوياً - دع SQLAlchemy يولده تلقائياً (ويرجع مع createdAt عبر RETURNING)
+          new_user = insert_returning(db, User, user_data)
           db.commit()
-          db.refresh(new_user)
           
-          logger.info(f"✓ تم تسجيل المستخدم بنجاح: {new_user.UserID}")
+          logger.info("✓ تم تسجيل المستخدم بنجاح: %s", new_user["UserID"])
           return new_user
           
      except HTTPException:
@@ -97,24 +208,21 @@ def register_user(user: user_schema.UserCreate,
           )
 
 
-@router.post("/login", response_model=user_schema.UserResponse)
+@router.post("/login", response_model=user_schema.LoginResponse)
 def login_user(data: user_schema.UserLogin, db: Session = Depends(db_connect.get_db)):
 
     try:
-        # البحث عن المستخدم
-        user = db.query(User).filter(User.PhoneNumber == data.PhoneNumber).first()
+        # البحث عن المستخدم وتحديث تاريخ آخر تسجيل دخول في جملة واحدة
+        user = update_returning(db, User, [User.PhoneNumber == data.PhoneNumber], {"lastLogin": datetime.now()})
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail={"error": response.USER_NOT_FOUND}
             )
-        
-        # تحديث تاريخ آخر تسجيل دخول
-        user.lastLogin = datetime.now()
         db.commit()
-        db.refresh(user)
         
-        return user
+        # session token موقّع: endpoints الطلبات تتحقق منه بدون استعلام عن المستخدم
+        return user_schema.LoginResponse(**user, access_token=issue_token(user["UserID"]))
         
     except HTTPException:
         raise
@@ -134,7 +242,7 @@ def login_user(data: user_schema.UserLogin, db: Session = Depends(db_connect.get
 
 
 @router.get("/{user_id}", response_model=user_schema.UserGetResponse)
-def get_user_by_id(user_id: str, db: Session = Depends(db_connect.get_db)):
+def get_user_by_id(user_id: str, db: Session = Depends(db_connect.get_read_db)):
     """
     الحصول على بيانات المستخدم (الاسم، البريد الإلكتروني، الهاتف)
     """
@@ -181,15 +289,6 @@ def update_user(user_id: str,
                 user_update: user_schema.UserUpdate,
                 db: Session = Depends(db_connect.get_db)):
     try:
-        # البحث عن المستخدم
-        user = db.query(User).filter(User.UserID == user_id).first()
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error": response.USER_NOT_FOUND}
-            )
-        
         # التحقق من وجود بيانات للتحديث
         update_data = user_update.model_dump(exclude_unset=True)
         
@@ -216,13 +315,16 @@ def update_user(user_id: str,
                         "error": response.USER_ALREADY_EXISTS}
                 )
         
-        # تحديث البيانات
-        for field, value in update_data.items():
-            setattr(user, field, value)
+        # تحديث البيانات (البحث عن المستخدم والتحديث والاستجابة في جملة واحدة)
+        user = update_returning(db, User, [User.UserID == user_id], update_data)
         
-        db.commit()
-        db.refresh(user)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"error": response.USER_NOT_FOUND}
+            )
         
+        db.commit()
         return user
         
     except HTTPException:
@@ -0,0 +1,9 @@
+from .session_token import (
+    InvalidTokenError,
+    tokens_enabled,
+    issue_token,
+    verify_token,
+    get_token_user_id
+)
+
+__all__ = ['InvalidTokenError', 'tokens_enabled', 'issue_token', 'verify_token', 'get_token_user_id']
\ No newline at end of file
@@ -0,0 +1,119 @@
+from fastapi import Header, HTTPException, status
+from typing import Optional
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+import os
+
+"""
+Session token موقّع (stateless) يحمل UserID:
+    base64url(payload) . base64url(HMAC-SHA256(payload))
+    payload = {"uid": "<UserID>", "exp": <unix time>}
+
+- يصدر عند /users/login ويتم التحقق منه بدون أي استعلام (CPU فقط)
+- endpoints الطلبات تتخطى SELECT المستخدم إذا كان الـ token صالحاً لنفس المستخدم
+- بدون SESSION_TOKEN_SECRET لا يتم إصدار tokens وتعمل الـ endpoints كما كانت (استعلام المستخدم)
+- نفس القيمة يجب أن تكون في كل الـ workers
+"""
+
+SESSION_TOKEN_SECRET = os.getenv("SESSION_TOKEN_SECRET", "").encode("utf-8")
+SESSION_TOKEN_TTL_SECONDS = int(float(os.getenv("SESSION_TOKEN_TTL_HOURS", "720")) * 3600)
+
+
+class InvalidTokenError(Exception):
+    """token تالف / توقيعه غير صحيح / منتهي الصلاحية"""
+
+
+def tokens_enabled() -> bool:
+    return bool(SESSION_TOKEN_SECRET)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(SESSION_TOKEN_SECRET, payload, hashlib.sha256).digest()
+
+
+def issue_token(user_id: uuid.UUID) -> Optional[str]:
+    """
+    Returns:
+        الـ token، أو None إذا لم يتم ضبط SESSION_TOKEN_SECRET
+    """
+    if not tokens_enabled():
+        return None
+
+    payload = json.dumps(
+        {"uid": str(user_id), "exp": int(time.time()) + SESSION_TOKEN_TTL_SECONDS},
+        separators=(",", ":")
+    ).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def verify_token(token: str) -> uuid.UUID:
+    """
+    Returns:
+        UserID الموجود في الـ token
+
+    Raises:
+        InvalidTokenError: الـ token غير صالح أو منتهي أو لا يوجد SESSION_TOKEN_SECRET
+    """
+    if not tokens_enabled():
+        raise InvalidTokenError("session tokens are disabled")
+
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError:
+        raise InvalidTokenError("malformed token")
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidTokenError("bad signature")
+
+    try:
+        claims = json.loads(payload)
+        user_id = uuid.UUID(claims["uid"])
+        expires_at = int(claims["exp"])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidTokenError("malformed payload")
+
+    if expires_at < time.time():
+        raise InvalidTokenError("token expired")
+
+    return user_id
+
+
+def get_token_user_id(authorization: Optional[str] = Header(None)) -> Optional[uuid.UUID]:
+    """
+    Dependency: UserID من "Authorization: Bearer <token>"
+
+    Returns:
+        None إذا لم يتم إرسال token (العميل القديم) -> الـ endpoint يستعلم عن المستخدم كالمعتاد
+
+    Raises:
+        HTTPException 401: تم إرسال token غير صالح أو منتهي
+    """
+    if not authorization:
+        return None
+
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        return verify_token(token.strip())
+    except InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"error": "جلسة الدخول غير صالحة أو منتهية، يرجى تسجيل الدخول مرة أخرى"},
+            headers={"WWW-Authenticate": "Bearer"}
+        )
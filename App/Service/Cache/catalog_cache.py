@@ -0,0 +1,121 @@
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Optional
+from time import monotonic
+import threading
+import hashlib
+import os
+
+from Database import db_connect
+from Service.Compression import choose_encoding, compress_body
+from Service.Compression.compression_middleware import brotli
+
+"""
+كاش الكتالوج (المنتجات، الأصناف، الفئات) في الذاكرة:
+- يتم بناء JSON مرة واحدة ثم ضغطه مسبقاً (gzip + brotli بأعلى مستوى)
+  فلا يعاد الضغط مع كل طلب
+- البناء دائماً من الـ primary (وليس الـ read replica): نسخة متأخرة بعد تعديل
+  كانت ستبقى في الكاش طوال الـ TTL
+- يتم مسحه فوراً عند أي تعديل على الكتالوج في نفس الـ worker
+- CATALOG_CACHE_TTL_SECONDS يحدد أقصى مدة قبل إعادة البناء
+  (لأن الـ workers الأخرى لا تعرف بالتعديل)
+"""
+
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+
+# الضغط مرة واحدة فقط، لذلك نستخدم أعلى مستوى
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 11
+
+
+class CachedBody:
+    """JSON جاهز + نسخه المضغوطة"""
+    __slots__ = ("raw", "encoded", "etag", "created_at")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.etag = '"' + hashlib.blake2b(raw, digest_size=12).hexdigest() + '"'
+        self.created_at = monotonic()
+        self.encoded = {"gzip": compress_body(raw, "gzip", PRECOMPRESS_GZIP_LEVEL)}
+        if brotli is not None:
+            self.encoded["br"] = compress_body(raw, "br", PRECOMPRESS_BROTLI_QUALITY)
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() - self.created_at > CATALOG_CACHE_TTL
+
+
+_entries: Dict[str, CachedBody] = {}
+# _lock فقط لقراءة الـ generation ونشر/مسح الـ entries (لا يتم البناء أثناء الإمساك به)
+_lock = threading.Lock()
+_generation = 0
+# lock لكل كتالوج: بناء واحد في نفس الوقت لكل key، والـ keys المختلفة تُبنى بالتوازي
+_build_locks: Dict[str, threading.Lock] = {}
+
+
+def invalidate_catalog() -> None:
+    """مسح الكاش بعد أي تعديل على المنتجات أو الأصناف أو الفئات (لا ينتظر أي بناء جارٍ)"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+
+
+def _fresh(key: str) -> Optional[CachedBody]:
+    entry = _entries.get(key)
+    if entry is not None and not entry.expired:
+        return entry
+    return None
+
+
+def _get_entry(key: str, build: Callable[[Session], bytes]) -> CachedBody:
+    entry = _fresh(key)
+    if entry is not None:
+        return entry
+
+    with _lock:
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    with build_lock:
+        # طلب آخر ربما بنى الكاش أثناء الانتظار
+        entry = _fresh(key)
+        if entry is not None:
+            return entry
+
+        with _lock:
+            generation = _generation
+
+        with db_connect.Session() as db:
+            raw = build(db)
+        entry = CachedBody(raw)
+
+        # لا نخزن نتيجة تم بناؤها قبل تعديل حدث أثناء البناء (الطلب الحالي يأخذها، والتالي يعيد البناء)
+        with _lock:
+            if generation == _generation:
+                _entries[key] = entry
+        return entry
+
+
+def catalog_response(request: Request, key: str, build: Callable[[Session], bytes]) -> Response:
+    """
+    إرجاع استجابة الكتالوج من الكاش مع الترميز المناسب للعميل
+
+    Args:
+        request: الطلب (لقراءة Accept-Encoding و If-None-Match)
+        key: اسم الكتالوج في الكاش
+        build: دالة تبني JSON bytes عند عدم وجود الكاش (تستقبل Session على الـ primary)
+    """
+    entry = _get_entry(key, build)
+    headers = {"ETag": entry.etag, "Vary": "Accept-Encoding"}
+
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+
+    body = entry.raw
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding in entry.encoded:
+        body = entry.encoded[encoding]
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
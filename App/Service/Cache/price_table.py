@@ -0,0 +1,126 @@
+from sqlalchemy.orm import Session
+from array import array
+from decimal import Decimal
+from time import monotonic
+from typing import Any, Iterable, NamedTuple, Optional
+import threading
+import logging
+import os
+
+from Database.models.product_model import ProductVariant, Sizes
+from Service.Orders.order_pricing import CUSTOM_SIZE_NAME
+
+"""
+جدول أسعار وتوفر الـ variants في الذاكرة (لتسعير الطلبات بدون قراءة جداول الكتالوج):
+- مصفوفات مضغوطة مفهرسة بالـ VariantID: السعر بالقروش (array 'q') + flags (bytearray)
+- علامة "السعر حسب الطلب" محسوبة مرة واحدة عند البناء بدلاً من مقارنة SizeName مع كل عنصر
+- version يزيد مع كل إعادة بناء (للتتبع في الـ logs)
+- يتم مسحه عند أي تعديل على الـ variants أو الأحجام في نفس الـ worker،
+  و PRICE_TABLE_TTL_SECONDS يحدد أقصى مدة قبل إعادة البناء (لأن الـ workers الأخرى لا تعرف بالتعديل)
+"""
+
+PRICE_TABLE_TTL = float(os.getenv("PRICE_TABLE_TTL_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+_EXISTS = 1
+_AVAILABLE = 2
+_CUSTOM_PRICE = 4
+
+
+class VariantPrice(NamedTuple):
+    Price: Decimal
+    IsAvailable: bool
+    IsCustomPrice: bool
+
+
+class PriceTable:
+    """VariantID -> VariantPrice (نفس واجهة dict.get التي يستخدمها price_order_items)"""
+    __slots__ = ("version", "created_at", "_cents", "_flags", "_count")
+
+    def __init__(self, rows: Iterable[Any], version: int):
+        """
+        Args:
+            rows: صفوف تحتوي على VariantID و Price و IsAvailable و SizeName
+        """
+        rows = list(rows)
+        size = max((row.VariantID for row in rows), default=0) + 1
+
+        self._cents = array("q", bytes(8 * size))
+        self._flags = bytearray(size)
+        for row in rows:
+            self._cents[row.VariantID] = int(Decimal(str(row.Price)) * 100)
+            flags = _EXISTS
+            if row.IsAvailable:
+                flags |= _AVAILABLE
+            if row.SizeName == CUSTOM_SIZE_NAME:
+                flags |= _CUSTOM_PRICE
+            self._flags[row.VariantID] = flags
+
+        self._count = len(rows)
+        self.version = version
+        self.created_at = monotonic()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, variant_id: int, default=None) -> Optional[VariantPrice]:
+        if not 0 <= variant_id < len(self._flags):
+            return default
+
+        flags = self._flags[variant_id]
+        if not flags & _EXISTS:
+            return default
+
+        return VariantPrice(
+            Price=Decimal(self._cents[variant_id]).scaleb(-2),
+            IsAvailable=bool(flags & _AVAILABLE),
+            IsCustomPrice=bool(flags & _CUSTOM_PRICE)
+        )
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() - self.created_at > PRICE_TABLE_TTL
+
+
+_table: Optional[PriceTable] = None
+# البناء والمسح تحت نفس الـ lock: المسح ينتظر انتهاء أي بناء جارٍ فلا يبقى جدول قديم
+_lock = threading.Lock()
+_version = 0
+
+
+def invalidate_price_table() -> None:
+    """مسح الجدول بعد أي تعديل على الـ variants أو الأحجام"""
+    global _table
+    with _lock:
+        _table = None
+
+
+def _load_rows(db: Session):
+    return db.query(
+        ProductVariant.VariantID,
+        ProductVariant.Price,
+        ProductVariant.IsAvailable,
+        Sizes.SizeName
+    ).outerjoin(Sizes, Sizes.SizeID == ProductVariant.SizeID).all()
+
+
+def get_price_table(db: Session) -> PriceTable:
+    """الجدول الحالي، أو إعادة بنائه (استعلام واحد) إذا تم مسحه أو انتهت مدته"""
+    global _table, _version
+
+    table = _table
+    if table is not None and not table.expired:
+        return table
+
+    with _lock:
+        # طلب آخر ربما بنى الجدول أثناء الانتظار
+        table = _table
+        if table is not None and not table.expired:
+            return table
+
+        _version += 1
+        _table = PriceTable(_load_rows(db), _version)
+
+        logger.debug("تم بناء جدول الأسعار - version: %s, variants: %s", _table.version, len(_table))
+        return _table
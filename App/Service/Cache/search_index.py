@@ -0,0 +1,174 @@
+from bisect import bisect_left
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional
+import threading
+import logging
+import os
+
+from Database import db_connect
+from Database.models.product_model import Products
+
+"""
+فهرس بحث المنتجات في الذاكرة (بديل الـ trigram index للكتالوج الصغير):
+- كل كلمة من NormalizedName (وبدون "ال" في أولها) في قائمة مرتبة،
+  والبحث بـ bisect عن الكلمات التي تبدأ بكل كلمة من النص
+  (البحث أثناء الكتابة: "فول اس" يطابق "فول اسكندراني"، و "عسل" يطابق "فطيره بالعسل")
+- لا يتم بناؤه إذا زاد عدد المنتجات عن SEARCH_INDEX_MAX_PRODUCTS على Postgres
+  (get_search_index ترجع None ويستخدم الـ router الـ trigram index)
+- البناء دائماً من الـ primary (وليس الـ read replica) حتى لا يبقى في الفهرس كتالوج متأخر طوال الـ TTL
+- يتم مسحه عند أي تعديل على المنتجات في نفس الـ worker،
+  و SEARCH_INDEX_TTL_SECONDS يحدد أقصى مدة قبل إعادة البناء (لأن الـ workers الأخرى لا تعرف بالتعديل)
+"""
+
+SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL_SECONDS", "60"))
+SEARCH_INDEX_MAX_PRODUCTS = int(os.getenv("SEARCH_INDEX_MAX_PRODUCTS", "5000"))
+
+logger = logging.getLogger(__name__)
+
+# أعمدة ProductResponse (نتيجة البحث)
+SEARCH_COLUMNS = (
+    Products.ProductID,
+    Products.CategoryID,
+    Products.Name,
+    Products.Description,
+    Products.ImageUrl,
+)
+
+# أكبر من أي حرف في الأسماء: نهاية نطاق الكلمات التي تبدأ بـ prefix
+_PREFIX_END = "\uffff"
+
+# الكلمة تُفهرس أيضاً بدون "ال" وما يسبقها ("بالعسل" تطابق "عسل")
+_ARTICLE_PREFIXES = ("بال", "وال", "فال", "كال", "لل", "ال")
+
+
+def _index_tokens(name: str) -> set:
+    tokens = set()
+    for word in name.split():
+        tokens.add(word)
+        for prefix in _ARTICLE_PREFIXES:
+            if word.startswith(prefix) and len(word) - len(prefix) >= 2:
+                tokens.add(word[len(prefix):])
+                break
+    return tokens
+
+
+class ProductSearchIndex:
+    __slots__ = ("created_at", "_products", "_names", "_tokens", "_positions")
+
+    def __init__(self, rows: Iterable[Any]):
+        """
+        Args:
+            rows: صفوف تحتوي على أعمدة SEARCH_COLUMNS و NormalizedName
+        """
+        self._products: List[Dict[str, Any]] = []
+        self._names: List[str] = []
+        entries = []
+
+        for position, row in enumerate(rows):
+            product = row._asdict()
+            name = product.pop("NormalizedName")
+            self._products.append(product)
+            self._names.append(name)
+            entries.extend((token, position) for token in _index_tokens(name))
+
+        entries.sort()
+        self._tokens = [token for token, _ in entries]
+        self._positions = [position for _, position in entries]
+        self.created_at = monotonic()
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() - self.created_at > SEARCH_INDEX_TTL
+
+    def _starting_with(self, prefix: str) -> set:
+        start = bisect_left(self._tokens, prefix)
+        end = bisect_left(self._tokens, prefix + _PREFIX_END, start)
+        return set(self._positions[start:end])
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Args:
+            query: نص البحث بعد normalize_arabic
+
+        Returns:
+            المنتجات التي تحتوي على كلمة تبدأ بكل كلمة من النص،
+            الأسماء التي تبدأ بالنص كاملاً أولاً ثم الأقصر
+        """
+        matches = None
+        for prefix in query.split():
+            found = self._starting_with(prefix)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        ranked = sorted(matches or (), key=lambda position: (
+            not self._names[position].startswith(query),
+            len(self._names[position]),
+            self._products[position]["ProductID"]
+        ))
+        return [self._products[position] for position in ranked[:limit]]
+
+
+_index: Optional[ProductSearchIndex] = None
+# الكتالوج أكبر من الحد: لا يتم إعادة المحاولة قبل انتهاء الـ TTL
+_too_large_at: Optional[float] = None
+# البناء والمسح تحت نفس الـ lock: المسح ينتظر انتهاء أي بناء جارٍ فلا يبقى فهرس قديم
+_lock = threading.Lock()
+
+
+def invalidate_search_index() -> None:
+    """مسح الفهرس بعد أي تعديل على المنتجات"""
+    global _index, _too_large_at
+    with _lock:
+        _index = None
+        _too_large_at = None
+
+
+def _fresh() -> Optional[ProductSearchIndex]:
+    if _index is not None and not _index.expired:
+        return _index
+    return None
+
+
+def get_search_index() -> Optional[ProductSearchIndex]:
+    """
+    الفهرس الحالي، أو إعادة بنائه (استعلام واحد على الـ primary)
+
+    Returns:
+        None إذا كان الكتالوج أكبر من SEARCH_INDEX_MAX_PRODUCTS على Postgres
+        (بدون Postgres يتم بناء الفهرس دائماً لعدم وجود pg_trgm)
+    """
+    global _index, _too_large_at
+
+    index = _fresh()
+    if index is not None:
+        return index
+    if _too_large_at is not None and monotonic() - _too_large_at <= SEARCH_INDEX_TTL:
+        return None
+
+    with _lock:
+        # طلب آخر ربما بنى الفهرس أثناء الانتظار
+        index = _fresh()
+        if index is not None:
+            return index
+
+        use_trigram = db_connect.engine.dialect.name == "postgresql"
+        with db_connect.Session() as db:
+            query = db.query(*SEARCH_COLUMNS, Products.NormalizedName)
+            if use_trigram:
+                query = query.limit(SEARCH_INDEX_MAX_PRODUCTS + 1)
+            rows = query.all()
+
+        if use_trigram and len(rows) > SEARCH_INDEX_MAX_PRODUCTS:
+            _index = None
+            _too_large_at = monotonic()
+            logger.info("عدد المنتجات أكبر من %s، البحث عبر الـ trigram index", SEARCH_INDEX_MAX_PRODUCTS)
+            return None
+
+        _index = ProductSearchIndex(rows)
+        _too_large_at = None
+        logger.debug("تم بناء فهرس البحث - المنتجات: %s", len(_index))
+        return _index
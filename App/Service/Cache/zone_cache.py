@@ -0,0 +1,83 @@
+from decimal import Decimal
+from time import monotonic
+from typing import Dict, NamedTuple, Optional
+import threading
+import logging
+import os
+
+from Database import db_connect
+from Database.models.address_zone_model import DeliveryZone
+
+"""
+جدول مناطق التوصيل في الذاكرة (ZoneID -> الاسم وتكلفة التوصيل):
+- يتم تحميله مع أول طلب يحتاجه في كل worker (وليس عند التشغيل، حتى لا يبطئ أو يوقف التشغيل)
+- التحميل دائماً من الـ primary (وليس الـ read replica): نسخة متأخرة من الـ replica بعد تعديل
+  كانت ستبقى في الكاش طوال الـ TTL وتُستخدم في حساب تكلفة التوصيل للطلبات
+- يتم مسحه عند أي تعديل على المناطق في نفس الـ worker،
+  و ZONE_CACHE_TTL_SECONDS يحدد أقصى مدة قبل إعادة التحميل (لأن الـ workers الأخرى لا تعرف بالتعديل)
+- منطقة غير موجودة في الجدول تسبب إعادة تحميل (منطقة جديدة من worker آخر)،
+  مرة واحدة على الأكثر كل ZONE_MISS_RELOAD_SECONDS حتى لا يسبب كل ZoneID خاطئ تحميل الجدول كاملاً
+"""
+
+ZONE_CACHE_TTL = float(os.getenv("ZONE_CACHE_TTL_SECONDS", "300"))
+ZONE_MISS_RELOAD_INTERVAL = float(os.getenv("ZONE_MISS_RELOAD_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+class ZoneInfo(NamedTuple):
+    ZoneID: int
+    ZoneName: str
+    DeliveryCost: Decimal
+
+
+_zones: Optional[Dict[int, ZoneInfo]] = None
+_loaded_at = 0.0
+# التحميل والمسح تحت نفس الـ lock: المسح ينتظر انتهاء أي تحميل جارٍ فلا يبقى جدول قديم
+_lock = threading.Lock()
+
+
+def invalidate_zones() -> None:
+    """مسح الجدول بعد أي تعديل على المناطق"""
+    global _zones
+    with _lock:
+        _zones = None
+
+
+def _load() -> Dict[int, ZoneInfo]:
+    global _zones, _loaded_at
+    with db_connect.Session() as db:
+        rows = db.query(DeliveryZone.ZoneID, DeliveryZone.ZoneName, DeliveryZone.DeliveryCost).all()
+    _zones = {row.ZoneID: ZoneInfo(*row) for row in rows}
+    _loaded_at = monotonic()
+    logger.debug("تم تحميل %s منطقة توصيل", len(_zones))
+    return _zones
+
+
+def get_zones() -> Dict[int, ZoneInfo]:
+    zones = _zones
+    if zones is not None and monotonic() - _loaded_at <= ZONE_CACHE_TTL:
+        return zones
+
+    with _lock:
+        zones = _zones
+        if zones is not None and monotonic() - _loaded_at <= ZONE_CACHE_TTL:
+            return zones
+        return _load()
+
+
+def get_zone(zone_id: int) -> Optional[ZoneInfo]:
+    """
+    Returns:
+        بيانات المنطقة، أو None إذا لم تكن موجودة حتى بعد إعادة التحميل
+    """
+    zone = get_zones().get(zone_id)
+    if zone is not None or monotonic() - _loaded_at < ZONE_MISS_RELOAD_INTERVAL:
+        return zone
+
+    with _lock:
+        # طلب آخر ربما أعاد التحميل أثناء الانتظار
+        if _zones is not None and monotonic() - _loaded_at < ZONE_MISS_RELOAD_INTERVAL:
+            return _zones.get(zone_id)
+        return _load().get(zone_id)
+
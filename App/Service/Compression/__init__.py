@@ -0,0 +1,3 @@
+from .compression_middleware import CompressionMiddleware, choose_encoding, compress_body
+
+__all__ = ['CompressionMiddleware', 'choose_encoding', 'compress_body']
\ No newline at end of file
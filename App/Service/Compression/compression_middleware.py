@@ -0,0 +1,164 @@
+from starlette.datastructures import Headers, MutableHeaders
+from typing import Optional, Dict
+import zlib
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli اختياري، بدونه نستخدم gzip فقط
+    brotli = None
+
+"""
+ضغط الاستجابات حسب Accept-Encoding (brotli أو gzip):
+- لا يتم ضغط الاستجابات الأصغر من COMPRESSION_MIN_SIZE
+- مستوى الضغط يختلف حسب نوع المحتوى
+- الأنواع المضغوطة أصلاً (docx = zip، الصور) لا يعاد ضغطها لأن الفائدة شبه معدومة
+- الاستجابات التي تحمل Content-Encoding بالفعل (مثل الكتالوج المضغوط مسبقاً) تمر كما هي
+"""
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# مستوى الضغط لكل نوع محتوى: (gzip level, brotli quality)
+# مستويات متوسطة لأن الضغط يتم مع كل طلب
+COMPRESSION_LEVELS: Dict[str, tuple] = {
+    "application/json": (6, 5),
+    "text/csv": (5, 4),
+    "text/html": (6, 5),
+    "text/plain": (6, 5),
+    "application/javascript": (6, 5),
+    "text/css": (6, 5),
+}
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """اختيار أفضل ترميز يقبله العميل: br ثم gzip"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(name.strip())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress_body(body: bytes, encoding: str, level: int) -> bytes:
+    """ضغط body كامل مرة واحدة"""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+class _StreamCompressor:
+    """ضغط تدريجي للاستجابات المتدفقة (StreamingResponse)"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        # flush بعد كل جزء حتى يصل للعميل فوراً بدون انتظار امتلاء الـ buffer
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.finish()
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware للضغط مع دعم الاستجابات المتدفقة"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+        started = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough, started
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message.get("headers", []))
+                content_type = headers.get("content-type", "").split(";")[0].strip()
+                passthrough = (
+                    "content-encoding" in headers
+                    or content_type not in COMPRESSION_LEVELS
+                )
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                if not started and start_message is not None:
+                    started = True
+                    await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if not started:
+                started = True
+                headers = MutableHeaders(raw=start_message["headers"])
+                content_type = headers.get("content-type", "").split(";")[0].strip()
+
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start_message)
+                    await send(message)
+                    passthrough = True
+                    return
+
+                gzip_level, br_quality = COMPRESSION_LEVELS[content_type]
+                level = br_quality if encoding == "br" else gzip_level
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+
+                if not more_body:
+                    body = compress_body(body, encoding, level)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                del headers["Content-Length"]
+                compressor = _StreamCompressor(encoding, level)
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressor.chunk(body), "more_body": True})
+                return
+
+            if more_body:
+                await send({"type": "http.response.body", "body": compressor.chunk(body), "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.finish(body)})
+
+        await self.app(scope, receive, send_wrapper)
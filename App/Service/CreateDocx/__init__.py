@@ -1,4 +1,25 @@
-from .extract_data import extract_order_data
-from .create_docx import create_invoice_in_memory
+import importlib
 
-__all__ = ['extract_order_data', 'create_invoice_in_memory']
\ No newline at end of file
+# python-docx و lxml ثقيلة في الاستيراد، فيتم تحميل كل دالة عند أول استخدام فقط (PEP 562)
+# الاستخدام: from Service import CreateDocx ثم CreateDocx.create_invoice_in_memory(...) داخل الـ endpoint
+_LAZY_ATTRIBUTES = {
+    'extract_order_data': '.extract_data',
+    'create_invoice_in_memory': '.create_docx',
+    'create_shift_report_in_memory': '.shift_report_docx',
+}
+
+__all__ = ['extract_order_data', 'create_invoice_in_memory', 'create_shift_report_in_memory']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
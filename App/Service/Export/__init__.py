@@ -0,0 +1,4 @@
+from .order_export import (stream_orders_csv, stream_orders_xlsx, xlsx_available,
+                           build_export_query, ExportLevel)
+
+__all__ = ['stream_orders_csv', 'stream_orders_xlsx', 'xlsx_available', 'build_export_query', 'ExportLevel']
\ No newline at end of file
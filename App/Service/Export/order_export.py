@@ -0,0 +1,166 @@
+from sqlalchemy import select
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Literal
+from decimal import Decimal
+import importlib.util
+import tempfile
+import csv
+import io
+import os
+
+from Database import db_connect
+from Database.models.orders_info_model import Order
+from Database.models.order_item_model import OrderItem
+from Database.models.address_zone_model import Address, DeliveryZone
+from Database.models.payment_model import PaymentMethod
+from Database.models.product_model import Products, ProductVariant, Sizes, Types
+
+"""
+تصدير الطلبات لفترة زمنية (CSV أو XLSX) للحسابات:
+- الاستعلام يعمل بـ server-side cursor (yield_per) فالذاكرة ثابتة مهما كان عدد الطلبات
+- CSV يبدأ الإرسال فوراً (سطر العناوين ثم دفعة بعد دفعة)
+- XLSX يُكتب في ملف مؤقت (openpyxl write_only) ثم يُرسل على أجزاء
+"""
+
+ExportLevel = Literal["orders", "items"]
+
+# عدد الصفوف في كل دفعة من قاعدة البيانات
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# حجم الجزء عند إرسال ملف XLSX
+FILE_CHUNK_SIZE = 64 * 1024
+
+ORDER_COLUMNS = [
+    Order.OrderID,
+    Order.OrderNumber,
+    Order.OrderTimestamp,
+    Order.OrderStatus,
+    Order.ShiftID,
+    Order.UserID,
+    DeliveryZone.ZoneName,
+    PaymentMethod.PaymentName,
+    Order.DeliveryFee,
+    Order.TotalPrice,
+]
+
+ITEM_COLUMNS = [
+    OrderItem.OrderItemID,
+    Products.Name.label("ProductName"),
+    Sizes.SizeName,
+    Types.TypeName,
+    OrderItem.Quantity,
+    OrderItem.UnitPrice,
+    OrderItem.Subtotal,
+    OrderItem.IsSada,
+]
+
+
+def build_export_query(date_from: date, date_to: date, level: ExportLevel):
+    """
+    استعلام التصدير (التاريخان شاملان)
+
+    - orders: صف لكل طلب
+    - items: صف لكل صنف مع بيانات الطلب (الطلب بدون أصناف يظهر بصف واحد)
+    """
+    start = datetime.combine(date_from, time.min)
+    end = datetime.combine(date_to + timedelta(days=1), time.min)
+
+    columns = ORDER_COLUMNS + (ITEM_COLUMNS if level == "items" else [])
+    query = (
+        select(*columns)
+        .join(Address, Order.AddressID == Address.AddressID)
+        .join(DeliveryZone, Address.ZoneID == DeliveryZone.ZoneID)
+        .join(PaymentMethod, Order.PaymentID == PaymentMethod.PaymentID)
+        .where(Order.OrderTimestamp >= start, Order.OrderTimestamp < end)
+    )
+
+    if level == "items":
+        query = (
+            query
+            .outerjoin(OrderItem, OrderItem.OrderID == Order.OrderID)
+            .outerjoin(ProductVariant, OrderItem.VariantID == ProductVariant.VariantID)
+            .outerjoin(Products, ProductVariant.ProductID == Products.ProductID)
+            .outerjoin(Sizes, ProductVariant.SizeID == Sizes.SizeID)
+            .outerjoin(Types, ProductVariant.TypeID == Types.TypeID)
+            .order_by(Order.OrderTimestamp, Order.OrderID, OrderItem.OrderItemID)
+        )
+    else:
+        query = query.order_by(Order.OrderTimestamp, Order.OrderID)
+
+    return query
+
+
+def _cell(value):
+    """تحويل القيمة لشكل مناسب للملف"""
+    if value is None:
+        return ""
+    if hasattr(value, "value"):  # Enum
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, Decimal):
+        return value
+    return value if isinstance(value, (int, float, bool)) else str(value)
+
+
+def _iter_batches(query) -> Iterator[list]:
+    """
+    دفعات الصفوف من cursor على السيرفر
+
+    يفتح Session خاصة به لأن الـ Session الخاصة بالطلب
+    تُغلق قبل أن ينتهي إرسال الاستجابة (على الـ read replica إذا كان متاحاً)
+    """
+    db = db_connect.open_read_session()
+    try:
+        result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for batch in result.partitions():
+            yield batch
+    finally:
+        db.close()
+
+
+def stream_orders_csv(date_from: date, date_to: date, level: ExportLevel) -> Iterator[bytes]:
+    """CSV بترميز UTF-8 مع BOM (حتى يفتحه Excel بالعربي بشكل صحيح)"""
+    query = build_export_query(date_from, date_to, level)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    headers = [column.key for column in query.selected_columns]
+    writer.writerow(headers)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+    for batch in _iter_batches(query):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_cell(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def xlsx_available() -> bool:
+    """openpyxl اختيارية، ويتم التحقق منها قبل بدء الاستجابة"""
+    return importlib.util.find_spec("openpyxl") is not None
+
+
+def stream_orders_xlsx(date_from: date, date_to: date, level: ExportLevel) -> Iterator[bytes]:
+    """
+    XLSX عبر openpyxl (write_only لا يحتفظ بالصفوف في الذاكرة)
+
+    Raises:
+        ImportError: إذا لم تكن openpyxl مثبتة (راجع xlsx_available)
+    """
+    from openpyxl import Workbook
+
+    query = build_export_query(date_from, date_to, level)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("orders")
+    sheet.append([column.key for column in query.selected_columns])
+
+    for batch in _iter_batches(query):
+        for row in batch:
+            sheet.append([_cell(v) for v in row])
+
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(FILE_CHUNK_SIZE):
+            yield chunk
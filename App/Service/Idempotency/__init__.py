@@ -0,0 +1,9 @@
+from .idempotency_service import (
+    hash_request,
+    get_stored_response,
+    claim_key,
+    store_response,
+    purge_expired_keys
+)
+
+__all__ = ['hash_request', 'get_stored_response', 'claim_key', 'store_response', 'purge_expired_keys']
@@ -0,0 +1,88 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func, null
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any
+import hashlib
+import random
+import os
+
+from Database.models.idempotency_model import IdempotencyKey
+
+# مدة صلاحية المفتاح (بالساعات)
+IDEMPOTENCY_TTL = timedelta(hours=float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24")))
+
+# نسبة الطلبات التي تقوم بتنظيف المفاتيح المنتهية (بدلاً من مهمة مجدولة)
+PURGE_PROBABILITY = 0.01
+
+
+def hash_request(raw_body: str) -> str:
+    """بصمة جسم الطلب للتأكد من أن المفتاح لم يُستخدم مع طلب مختلف"""
+    return hashlib.sha256(raw_body.encode("utf-8")).hexdigest()
+
+
+def get_stored_response(db: Session, key: str) -> Optional[IdempotencyKey]:
+    """
+    البحث عن استجابة مخزنة لمفتاح غير منتهي الصلاحية
+
+    Returns:
+        السجل إذا كان موجوداً، أو None
+    """
+    return db.execute(
+        select(IdempotencyKey).where(
+            IdempotencyKey.Key == key,
+            IdempotencyKey.ExpiresAt > func.now()
+        )
+    ).scalar_one_or_none()
+
+
+def claim_key(db: Session, key: str, request_hash: str) -> bool:
+    """
+    حجز المفتاح داخل نفس المعاملة (Transaction) الخاصة بالطلب
+
+    - الطلبات المتزامنة بنفس المفتاح تنتظر على قيد المفتاح الأساسي
+      حتى تنتهي المعاملة الأولى (commit أو rollback)
+    - المفتاح المنتهي يتم إعادة استخدامه
+
+    Returns:
+        True إذا تم حجز المفتاح لهذا الطلب، False إذا كان محجوزاً بطلب آخر
+    """
+    now = datetime.now(timezone.utc)
+    stmt = insert(IdempotencyKey).values(
+        Key=key,
+        RequestHash=request_hash,
+        ExpiresAt=now + IDEMPOTENCY_TTL
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.Key],
+        set_={
+            "RequestHash": stmt.excluded.RequestHash,
+            "StatusCode": None,
+            "ResponseBody": null(),
+            "CreatedAt": func.now(),
+            "ExpiresAt": stmt.excluded.ExpiresAt
+        },
+        where=IdempotencyKey.ExpiresAt <= func.now()
+    ).returning(IdempotencyKey.Key)
+
+    return db.execute(stmt).first() is not None
+
+
+def store_response(db: Session, key: str, status_code: int, body: Dict[str, Any]) -> None:
+    """حفظ الاستجابة الأصلية (يتم الـ commit مع الطلب نفسه)"""
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.Key == key)
+        .values(StatusCode=status_code, ResponseBody=body)
+    )
+
+    if random.random() < PURGE_PROBABILITY:
+        purge_expired_keys(db)
+
+
+def purge_expired_keys(db: Session) -> int:
+    """حذف المفاتيح المنتهية الصلاحية"""
+    result = db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.ExpiresAt <= func.now())
+    )
+    return result.rowcount
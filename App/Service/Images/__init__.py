@@ -0,0 +1,6 @@
+from .image_urls import image_variant_urls, IMAGE_SIZES
+from .image_index import build_image_index, digest_for, path_for, IMAGES_DIR
+from .image_service import get_or_create_variant, generate_all_variants, ImageNotFound
+
+__all__ = ['image_variant_urls', 'IMAGE_SIZES', 'build_image_index', 'digest_for', 'path_for', 'IMAGES_DIR',
+           'get_or_create_variant', 'generate_all_variants', 'ImageNotFound']
\ No newline at end of file
@@ -0,0 +1,114 @@
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+import threading
+import hashlib
+
+from Service.Cache.catalog_cache import invalidate_catalog
+
+"""
+فهرس hash محتوى صور المنتجات:
+- يُبنى عند تشغيل التطبيق (build_image_index) ويتحدث عند الاستخدام
+- path -> digest لبناء روابط ثابتة (immutable) تتغير فقط بتغير محتوى الصورة
+- digest -> path لخدمة الصورة من الرابط
+- مع كل استخدام تتم مقارنة mtime والحجم (stat فقط): صورة تم استبدالها بنفس الاسم
+  يُعاد حساب الـ hash لها فتأخذ رابطاً جديداً، والرابط القديم لا يخدم المحتوى الجديد
+- تغير hash صورة معروفة (أو حذفها) يمسح كاش الكتالوج حتى لا تبقى فيه روابط ImageVariants القديمة
+  (باقي الـ workers: عند اكتشافهم التغيير أو بعد CATALOG_CACHE_TTL_SECONDS)
+"""
+
+APP_DIR = Path(__file__).resolve().parent.parent.parent
+IMAGES_DIR = APP_DIR / "Static_Data" / "images"
+
+# الصيغ التي يمكن توليد نسخ مصغرة منها
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+# أول 20 حرف hex من sha256 المحتوى
+DIGEST_LENGTH = 20
+
+
+class _Entry(NamedTuple):
+    path: Path
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+_entries: Dict[str, _Entry] = {}
+_relative_by_digest: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def _hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:DIGEST_LENGTH]
+
+
+def _forget(relative: str) -> None:
+    entry = _entries.pop(relative, None)
+    if entry is not None and _relative_by_digest.get(entry.digest) == relative:
+        del _relative_by_digest[entry.digest]
+
+
+def _refresh(relative: str, path: Path) -> Optional[str]:
+    """
+    الـ digest الحالي للملف (إعادة الحساب فقط إذا تغير mtime أو الحجم)
+
+    Returns:
+        None إذا لم يعد الملف موجوداً
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        with _lock:
+            forgotten = relative in _entries
+            _forget(relative)
+        if forgotten:
+            invalidate_catalog()
+        return None
+
+    entry = _entries.get(relative)
+    if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+        return entry.digest
+
+    digest = _hash_file(path)
+    with _lock:
+        previous = _entries.get(relative)
+        _forget(relative)
+        _entries[relative] = _Entry(path, stat.st_mtime_ns, stat.st_size, digest)
+        _relative_by_digest[digest] = relative
+
+    if previous is not None and previous.digest != digest:
+        invalidate_catalog()
+    return digest
+
+
+def build_image_index() -> int:
+    """حساب hash كل الملفات في Static_Data/images، ويرجع عددها"""
+    count = 0
+    for path in IMAGES_DIR.rglob("*"):
+        if path.is_file():
+            _refresh(path.relative_to(IMAGES_DIR).as_posix(), path)
+            count += 1
+    return count
+
+
+def digest_for(relative: str) -> Optional[str]:
+    """hash الصورة الحالي (صورة أضيفت أو تغيرت بعد التشغيل يتم حسابها عند أول استخدام)"""
+    entry = _entries.get(relative)
+    if entry is not None:
+        return _refresh(relative, entry.path)
+
+    path = (IMAGES_DIR / relative).resolve()
+    if IMAGES_DIR not in path.parents or not path.is_file():
+        return None
+    return _refresh(relative, path)
+
+
+def path_for(digest: str) -> Optional[Path]:
+    """مسار الصورة الأصلية من الـ hash (None إذا تغير محتوى الملف منذ حساب هذا الـ hash)"""
+    relative = _relative_by_digest.get(digest)
+    if relative is None:
+        return None
+
+    entry = _entries.get(relative)
+    if entry is None or _refresh(relative, entry.path) != digest:
+        return None
+    return entry.path
@@ -0,0 +1,93 @@
+from pathlib import Path
+from typing import Dict, Tuple
+import threading
+import os
+
+from .image_urls import IMAGE_SIZES
+from .image_index import APP_DIR, IMAGE_EXTENSIONS, path_for
+
+"""
+معالجة صور المنتجات:
+- توليد نسخ thumb / medium / full بصيغة WebP أو JPEG
+- النسخ تُحفظ في مجلد حسب hash محتوى الصورة الأصلية (content-addressed)
+  فتغيير الصورة ينتج نسخاً جديدة تلقائياً ولا يتم التوليد مرتين لنفس المحتوى
+- التوليد يتم عند أول طلب، أو مسبقاً عبر Static_Data/generate_image_variants.py
+"""
+
+VARIANTS_DIR = Path(os.getenv("IMAGE_VARIANTS_DIR", str(APP_DIR / "Static_Data" / "image_variants")))
+
+# الصيغة: (اسم Pillow, media type, الجودة)
+IMAGE_FORMATS: Dict[str, Tuple[str, str, int]] = {
+    "webp": ("WEBP", "image/webp", 80),
+    "jpg": ("JPEG", "image/jpeg", 82),
+}
+
+_generate_lock = threading.Lock()
+
+
+class ImageNotFound(Exception):
+    pass
+
+
+def resolve_source(digest: str) -> Path:
+    """مسار الصورة الأصلية من الـ hash"""
+    path = path_for(digest)
+    if path is None or not path.is_file() or path.suffix.lower() not in IMAGE_EXTENSIONS:
+        raise ImageNotFound(digest)
+    return path
+
+
+def variant_path(digest: str, size: str, fmt: str) -> Path:
+    return VARIANTS_DIR / digest[:2] / f"{digest}_{size}.{fmt}"
+
+
+def _render_variant(source: Path, target: Path, size: str, fmt: str) -> None:
+    from PIL import Image  # تحميل Pillow فقط عند الحاجة للتوليد
+
+    pil_format, _, quality = IMAGE_FORMATS[fmt]
+    max_edge = IMAGE_SIZES[size]
+
+    with Image.open(source) as image:
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # كتابة لملف مؤقت ثم rename حتى لا يقرأ طلب آخر ملفاً ناقصاً
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        image.save(tmp_path, pil_format, quality=quality, optimize=True)
+        os.replace(tmp_path, target)
+
+
+def get_or_create_variant(digest: str, size: str, fmt: str) -> Tuple[Path, str]:
+    """
+    إرجاع مسار نسخة الصورة (وتوليدها إذا لم تكن موجودة)
+
+    Returns:
+        Tuple[Path, str]: (مسار الملف, media type)
+    """
+    if size not in IMAGE_SIZES or fmt not in IMAGE_FORMATS:
+        raise ImageNotFound(f"{size}.{fmt}")
+
+    source = resolve_source(digest)
+    target = variant_path(digest, size, fmt)
+
+    if not target.exists():
+        with _generate_lock:
+            if not target.exists():
+                _render_variant(source, target, size, fmt)
+
+    return target, IMAGE_FORMATS[fmt][1]
+
+
+def generate_all_variants(digest: str) -> int:
+    """توليد كل المقاسات والصيغ لصورة واحدة، ويرجع عدد النسخ الجديدة"""
+    source = resolve_source(digest)
+    created = 0
+    for size in IMAGE_SIZES:
+        for fmt in IMAGE_FORMATS:
+            target = variant_path(digest, size, fmt)
+            if not target.exists():
+                _render_variant(source, target, size, fmt)
+                created += 1
+    return created
@@ -0,0 +1,54 @@
+from typing import Dict, Optional
+import os
+
+from .image_index import digest_for, IMAGE_EXTENSIONS
+
+"""
+بناء روابط صور المنتجات (بدون تحميل Pillow)
+ImageUrl في قاعدة البيانات بالشكل: Static_Data/images/sandwiches/س فول.jpg
+
+الروابط تحتوي على hash المحتوى، لذلك يمكن تخزينها في المتصفح بشكل دائم:
+/image_variants/{digest}/thumb.webp
+"""
+
+IMAGES_URL_PREFIX = "Static_Data/images/"
+
+# أقصى طول للضلع الأكبر (بالبكسل) لكل مقاس
+IMAGE_SIZES: Dict[str, int] = {
+    "thumb": 160,
+    "medium": 480,
+    "full": 1200,
+}
+
+DEFAULT_IMAGE_FORMAT = "webp"
+
+
+def image_relative_path(image_url: Optional[str]) -> Optional[str]:
+    """المسار داخل مجلد الصور، أو None إذا كان الرابط خارجياً"""
+    if not image_url or "://" in image_url:
+        return None
+    path = image_url.lstrip("/")
+    if path.startswith(IMAGES_URL_PREFIX):
+        path = path[len(IMAGES_URL_PREFIX):]
+    elif path.startswith("images/"):
+        path = path[len("images/"):]
+    return path
+
+
+def image_variant_urls(image_url: Optional[str], fmt: str = DEFAULT_IMAGE_FORMAT) -> Optional[Dict[str, str]]:
+    """روابط كل المقاسات + الصورة الأصلية لصورة منتج"""
+    relative = image_relative_path(image_url)
+    if relative is None:
+        return None
+
+    digest = digest_for(relative)
+    if digest is None:
+        return None
+
+    urls = {"original": f"/image_variants/{digest}/original"}
+
+    # صيغ لا يستطيع Pillow قراءتها (مثل avif) تعرض بالصورة الأصلية فقط
+    if os.path.splitext(relative)[1].lower() in IMAGE_EXTENSIONS:
+        for size in IMAGE_SIZES:
+            urls[size] = f"/image_variants/{digest}/{size}.{fmt}"
+    return urls
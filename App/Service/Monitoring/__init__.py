@@ -0,0 +1,4 @@
+from .metrics import MetricsMiddleware, render_metrics, CONTENT_TYPE_LATEST
+from .sql_timing import SQLTimingMiddleware, install_sql_hooks
+
+__all__ = ['MetricsMiddleware', 'render_metrics', 'CONTENT_TYPE_LATEST', 'SQLTimingMiddleware', 'install_sql_hooks']
\ No newline at end of file
@@ -0,0 +1,84 @@
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    REGISTRY,
+    CONTENT_TYPE_LATEST
+)
+from time import perf_counter
+import os
+
+"""
+مقاييس الأداء لكل endpoint بصيغة Prometheus:
+- عدد الطلبات وأكواد الاستجابة
+- توزيع زمن الاستجابة (histogram)
+
+التجميع يتم داخل كل worker في الذاكرة (بدون I/O لكل طلب).
+عند التشغيل بأكثر من worker يجب ضبط PROMETHEUS_MULTIPROC_DIR
+(مجلد فارغ يتم مسحه قبل كل تشغيل) ليتم دمج قيم كل الـ workers عند القراءة.
+"""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Total HTTP requests",
+    ["method", "route", "status"]
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+
+# المسارات غير المعروفة تُجمع تحت اسم واحد حتى لا يتضخم عدد السلاسل
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def render_metrics() -> bytes:
+    """إخراج كل المقاييس بصيغة Prometheus text"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware خفيف لتسجيل عدد الطلبات وزمنها حسب قالب المسار
+    (مثلاً /orders/{order_id}/status وليس /orders/15/status)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # الـ router يضيف المسار المطابق إلى scope أثناء التنفيذ
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+
+            REQUESTS_TOTAL.labels(method, route_path, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, route_path).observe(perf_counter() - start)
+
@@ -0,0 +1,120 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+import logging
+import re
+import os
+
+"""
+قياس استعلامات SQL لكل طلب HTTP:
+- عدد الاستعلامات وإجمالي وقت قاعدة البيانات لكل طلب
+- يضاف للاستجابة كـ header: Server-Timing: db;dur=12.5;desc="7 queries"
+  (ما عدا الاستجابات المتدفقة: الـ headers تُرسل قبل أن يبدأ الـ generator استعلاماته)
+- أي استعلام أبطأ من SLOW_QUERY_MS يتم تسجيله بعد تبسيط نص الـ SQL
+
+مفيد لاكتشاف مشاكل N+1 (عدد استعلامات كبير لطلب واحد)
+"""
+
+logger = logging.getLogger("sql_timing")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%\([^)]+\)s|%s)(?:\s*,\s*(?:\?|%\([^)]+\)s|%s))+\s*\)")
+
+
+class QueryStats:
+    """إحصائيات الاستعلامات لطلب واحد"""
+    __slots__ = ("count", "total_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+
+
+# الـ endpoints المتزامنة تعمل في threadpool مع نسخة من الـ context،
+# لذلك نخزن كائن قابل للتعديل ليتم تحديثه من أي thread
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    """تبسيط نص الاستعلام لتجميع الاستعلامات المتشابهة في السجل"""
+    sql = _STRING_RE.sub("?", statement)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def _record(elapsed: float, statement: str) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning("استعلام بطيء (%.1f ms): %s", elapsed_ms, normalize_sql(statement))
+
+
+# الاستعلامات على نفس الاتصال متتالية، لذلك قيمة واحدة لكل اتصال (وليس قائمة)
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start_time"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("query_start_time", None)
+    if start is not None:
+        _record(perf_counter() - start, statement)
+
+
+def _handle_error(context):
+    # الاستعلام الذي فشل (مثل IntegrityError) لا يصل إلى after_cursor_execute:
+    # نحذف وقت البداية حتى لا يبقى على الاتصال في الـ pool، ونحسبه ضمن وقت قاعدة البيانات
+    if context.connection is None:
+        return
+    start = context.connection.info.pop("query_start_time", None)
+    if start is not None:
+        _record(perf_counter() - start, context.statement or "")
+
+
+def install_sql_hooks(engine: Engine) -> None:
+    """ربط أحداث القياس بالـ engine (مرة واحدة عند التشغيل)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class SQLTimingMiddleware:
+    """ASGI middleware يجمع إحصائيات SQL للطلب ويضيفها في Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            # بدون Content-Length = استجابة متدفقة: استعلاماتها لم تحدث بعد، فلا نرسل رقماً مضللاً
+            if message["type"] == "http.response.start" and any(
+                    name.lower() == b"content-length" for name, _ in message.get("headers", [])):
+                timing = f'db;dur={stats.total_seconds * 1000:.2f};desc="{stats.count} queries"'
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
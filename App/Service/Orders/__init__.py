@@ -0,0 +1,3 @@
+from .order_pricing import price_order_items, PricedItem, PricingError, CUSTOM_SIZE_NAME
+
+__all__ = ['price_order_items', 'PricedItem', 'PricingError', 'CUSTOM_SIZE_NAME']
\ No newline at end of file
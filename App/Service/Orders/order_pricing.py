@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Iterable, List, Mapping, Tuple
+
+"""
+حساب أسعار عناصر الطلب بدون أي اتصال بقاعدة البيانات
+(يستدعيها create_order مع جدول الأسعار في الذاكرة،
+ويمكن قياسها في Performance/benchmarks.py)
+"""
+
+# الحجم الذي يحدد العميل سعره بنفسه
+CUSTOM_SIZE_NAME = "حسب الطلب"
+MIN_CUSTOM_PRICE = Decimal("10")
+
+
+class PricingError(Exception):
+    """خطأ في بيانات عنصر الطلب، يتحول إلى HTTPException في الـ router"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+@dataclass(slots=True)
+class PricedItem:
+    VariantID: int
+    Quantity: int
+    UnitPrice: Decimal
+    Subtotal: Decimal
+    IsSada: bool
+
+
+def price_order_items(items: Iterable[Any], variants: Mapping[int, Any]) -> Tuple[List[PricedItem], Decimal]:
+    """
+    حساب سعر كل عنصر ومجموع العناصر
+
+    Args:
+        items: عناصر الطلب (OrderItemCreate)
+        variants: VariantID -> صف يحتوي على Price (Decimal) و IsAvailable و IsCustomPrice
+                  (عادةً PriceTable من Service.Cache.price_table)
+
+    Returns:
+        (العناصر بعد التسعير، مجموع العناصر بدون التوصيل)
+
+    Raises:
+        PricingError: منتج غير موجود / غير متوفر / سعر مخصص ناقص أو أقل من الحد الأدنى
+    """
+    priced = []
+    items_total = Decimal("0.00")
+
+    for item in items:
+        variant = variants.get(item.VariantID)
+
+        if variant is None:
+            raise PricingError(404, f"المنتج رقم {item.VariantID} غير موجود")
+
+        if not variant.IsAvailable:
+            raise PricingError(400, f"المنتج رقم {item.VariantID} غير متوفر حالياً")
+
+        # التحقق: إذا كان الحجم "حسب الطلب"، يجب إرسال CustomPrice
+        if variant.IsCustomPrice:
+            if not item.CustomPrice:
+                raise PricingError(400, f"المنتج رقم {item.VariantID} يتطلب تحديد السعر (الحد الأدنى 10 ج.م)")
+
+            if item.CustomPrice < MIN_CUSTOM_PRICE:
+                raise PricingError(400, "السعر المخصص يجب أن يكون 10 ج.م على الأقل")
+
+            unit_price = item.CustomPrice
+        else:
+            # منتج عادي - استخدم السعر من قاعدة البيانات
+            unit_price = variant.Price
+
+        subtotal = unit_price * item.Quantity
+        items_total += subtotal
+
+        priced.append(PricedItem(
+            VariantID=item.VariantID,
+            Quantity=item.Quantity,
+            UnitPrice=unit_price,
+            Subtotal=subtotal,
+            IsSada=bool(item.IsSada)
+        ))
+
+    return priced, items_total
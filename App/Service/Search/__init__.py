@@ -0,0 +1,3 @@
+from .arabic_text import normalize_arabic
+
+__all__ = ['normalize_arabic']
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+توحيد النص العربي للبحث (نفس الدالة للاسم المخزن في NormalizedName ولنص البحث):
+- حذف التشكيل (U+064B - U+065F) والألف الخنجرية والتطويل (ـ)
+- أ إ آ ٱ -> ا ، ة -> ه ، ى -> ي ، ؤ -> و ، ئ -> ي
+- حروف لاتينية صغيرة ومسافة واحدة بين الكلمات
+
+أي تعديل هنا يتطلب migration يعيد حساب NormalizedName للمنتجات الموجودة
+(مثل 0003_product_search في Database/migrations/versions)
+"""
+
+_CHARACTER_MAP = {
+    **{alef: "ا" for alef in "أإآٱ"},
+    "ة": "ه",
+    "ى": "ي",
+    "ؤ": "و",
+    "ئ": "ي",
+    # التشكيل + الألف الخنجرية + التطويل
+    **{chr(code): None for code in range(0x064B, 0x0660)},
+    "ٰ": None,
+    "ـ": None,
+}
+
+_TRANSLATION = str.maketrans(_CHARACTER_MAP)
+
+
+def normalize_arabic(text: str) -> str:
+    """
+    مثال:
+        normalize_arabic("  فَطِيرَة  بالـجبنة ") -> "فطيره بالجبنه"
+    """
+    return " ".join(text.translate(_TRANSLATION).lower().split())
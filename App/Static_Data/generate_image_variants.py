@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+# إضافة المجلد الأب (App) إلى Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Service.Images import build_image_index, generate_all_variants, digest_for, IMAGES_DIR
+from Service.Images.image_index import IMAGE_EXTENSIONS
+
+# توليد نسخ thumb / medium / full لكل صور المنتجات مسبقاً
+# (بدلاً من توليدها عند أول طلب)
+# cd App\Static_Data
+# python generate_image_variants.py
+
+count = build_image_index()
+print(f"📂 Found {count} images in: {IMAGES_DIR}")
+
+created = 0
+failed = 0
+for image_path in IMAGES_DIR.rglob("*"):
+    if not image_path.is_file() or image_path.suffix.lower() not in IMAGE_EXTENSIONS:
+        continue
+    relative = image_path.relative_to(IMAGES_DIR).as_posix()
+    digest = digest_for(relative)
+    if digest is None:
+        continue
+    try:
+        created += generate_all_variants(digest)
+    except Exception as exc:
+        failed += 1
+        print(f"⚠️ Failed: {relative} -> {exc}")
+
+print(f"✅ Generated {created} new variants ({failed} failed)")
@@ -0,0 +1,249 @@
+import argparse
+import itertools
+import json
+import sys
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import select, or_, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+# إضافة المجلد الأب (App) إلى Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Database.db_connect import engine
+
+import Database.models.user_model
+import Database.models.shift_model
+import Database.models.payment_model
+import Database.models.address_zone_model
+import Database.models.orders_info_model
+import Database.models.order_item_model
+from Database.models.product_model import Category, Products, ProductVariant, Sizes, Types
+from Service.Search import normalize_arabic
+
+# استيراد المنيو كاملاً من ملفات JSON (يمكن تشغيله أكثر من مرة بأمان):
+# - الأقسام والأحجام والأنواع والمنتجات والـ variants بـ INSERT ... ON CONFLICT على دفعات
+# - الربط بين الجداول بالاسم (وليس بـ ID ثابت)
+# - يطبع عدد السجلات الجديدة / المعدلة / بدون تغيير لكل جدول
+#
+# يتطلب الـ unique indexes في Database/migrations/add_catalog_unique_indexes.py
+# الكاش في السيرفر يتحدث خلال CATALOG_CACHE_TTL_SECONDS
+#
+# cd App\Static_Data
+# python import_catalog.py
+# python import_catalog.py --dry-run
+
+JSON_DIR = Path(__file__).resolve().parent / "json"
+
+DEFAULT_NAME = "افتراضي"
+DEFAULT_DESCRIPTION = "لا وصف"
+
+# ملف المنتجات -> اسم القسم
+PRODUCT_FILES = {
+    "sandwiches.json": "السندوتشات",
+    "dishes.json": "الأطباق و العلب",
+    "bakery.json": "مخبوزات",
+}
+
+
+@dataclass
+class ImportCounts:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __str__(self):
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
+
+def load_json(name: str) -> list:
+    with (JSON_DIR / name).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def normalize_product(record: dict) -> dict:
+    """
+    توحيد شكل المنتج من الملفات المختلفة:
+    - Name/ImageUrl أو title/image (مخبوزات)
+    - price واحد أو size: [{name, price}]
+    - type: [..] اختياري
+    """
+    name = (record.get("Name") or record.get("title") or "").strip()
+    image = record.get("ImageUrl") or record.get("image")
+    if not name or not image:
+        raise ValueError(f"منتج بدون اسم أو صورة: {record}")
+
+    if "size" in record:
+        sizes = [(s["name"].strip(), Decimal(str(s["price"]))) for s in record["size"]]
+    else:
+        sizes = [(DEFAULT_NAME, Decimal(str(record["price"])))]
+    types = [t.strip() for t in record.get("type") or [DEFAULT_NAME]]
+
+    return {
+        "Name": name,
+        "ImageUrl": image,
+        "Description": record.get("Description") or DEFAULT_DESCRIPTION,
+        "variants": [
+            (size, type_name, price)
+            for (size, price), type_name in itertools.product(sizes, types)
+        ],
+    }
+
+
+def dedupe(rows: list, key_cols: list) -> list:
+    """ON CONFLICT لا يسمح بتكرار نفس المفتاح في نفس الأمر، آخر سجل هو المعتمد"""
+    unique = {}
+    for row in rows:
+        key = tuple(row[c] for c in key_cols)
+        if key in unique:
+            print(f"⚠️ Duplicate in source, last one wins: {key}")
+        unique[key] = row
+    return list(unique.values())
+
+
+def upsert(session: Session, model, rows: list, key_cols: list, update_cols: list, batch_size: int) -> ImportCounts:
+    """
+    INSERT ... ON CONFLICT على دفعات
+    - update_cols فارغة: السجلات الموجودة تبقى كما هي (DO NOTHING)
+    - غير ذلك: التحديث فقط إذا تغيرت القيمة (IS DISTINCT FROM)
+    - xmax = 0 في RETURNING يعني أن السجل جديد
+    """
+    counts = ImportCounts()
+    rows = dedupe(rows, key_cols)
+    table = model.__table__
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        stmt = insert(table).values(batch)
+        key_elements = [table.c[c] for c in key_cols]
+
+        if update_cols:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=key_elements,
+                set_={c: stmt.excluded[c] for c in update_cols},
+                where=or_(*[table.c[c].is_distinct_from(stmt.excluded[c]) for c in update_cols])
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=key_elements)
+
+        returned = session.execute(
+            stmt.returning(literal_column("xmax = 0").label("inserted"))
+        ).scalars().all()
+
+        inserted = sum(1 for is_new in returned if is_new)
+        counts.inserted += inserted
+        counts.updated += len(returned) - inserted
+        counts.unchanged += len(batch) - len(returned)
+
+    return counts
+
+
+def import_catalog(session: Session, batch_size: int) -> dict:
+    categories = [c["CategoryName"].strip() for c in load_json("category.json")]
+    products_by_category = {
+        category: [normalize_product(r) for r in load_json(file_name)]
+        for file_name, category in PRODUCT_FILES.items()
+    }
+
+    all_products = [p for products in products_by_category.values() for p in products]
+    size_names = sorted({size for p in all_products for size, _, _ in p["variants"]})
+    type_names = sorted({type_name for p in all_products for _, type_name, _ in p["variants"]})
+    categories += [c for c in products_by_category if c not in categories]
+
+    results = {}
+
+    # 1. الجداول المرجعية (بالاسم فقط)
+    results["categories"] = upsert(
+        session, Category, [{"CategoryName": c} for c in categories],
+        ["CategoryName"], [], batch_size
+    )
+    results["sizes"] = upsert(
+        session, Sizes, [{"SizeName": s} for s in size_names], ["SizeName"], [], batch_size
+    )
+    results["types"] = upsert(
+        session, Types, [{"TypeName": t} for t in type_names], ["TypeName"], [], batch_size
+    )
+
+    category_ids = dict(session.execute(select(Category.CategoryName, Category.CategoryID)).all())
+    size_ids = dict(session.execute(select(Sizes.SizeName, Sizes.SizeID)).all())
+    type_ids = dict(session.execute(select(Types.TypeName, Types.TypeID)).all())
+
+    # 2. المنتجات (الوصف لا يتم تعديله حتى لا نمسح تعديلات لوحة التحكم)
+    #    NormalizedName للبحث، الفهرس في السيرفر يتحدث خلال SEARCH_INDEX_TTL_SECONDS
+    product_rows = [
+        {
+            "CategoryID": category_ids[category],
+            "Name": p["Name"],
+            "NormalizedName": normalize_arabic(p["Name"]),
+            "ImageUrl": p["ImageUrl"],
+            "Description": p["Description"],
+        }
+        for category, products in products_by_category.items()
+        for p in products
+    ]
+    results["products"] = upsert(
+        session, Products, product_rows, ["CategoryID", "Name"], ["ImageUrl", "NormalizedName"], batch_size
+    )
+
+    product_ids = {
+        (category_id, name): product_id
+        for product_id, category_id, name in session.execute(
+            select(Products.ProductID, Products.CategoryID, Products.Name)
+            .where(Products.CategoryID.in_([category_ids[c] for c in products_by_category]))
+        ).all()
+    }
+
+    # 3. الـ variants (IsAvailable لا يتم تعديله لأنه حالة تشغيلية)
+    variant_rows = [
+        {
+            "ProductID": product_ids[(category_ids[category], p["Name"])],
+            "SizeID": size_ids[size],
+            "TypeID": type_ids[type_name],
+            "Price": price,
+            "IsAvailable": True,
+        }
+        for category, products in products_by_category.items()
+        for p in products
+        for size, type_name, price in p["variants"]
+    ]
+    results["variants"] = upsert(
+        session, ProductVariant, variant_rows, ["ProductID", "SizeID", "TypeID"], ["Price"], batch_size
+    )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the full menu from Static_Data/json")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per INSERT statement")
+    parser.add_argument("--dry-run", action="store_true", help="run everything, then roll back")
+    args = parser.parse_args()
+
+    print(f"📂 Reading catalog from: {JSON_DIR}")
+
+    with Session(engine) as session:
+        try:
+            results = import_catalog(session, args.batch_size)
+        except Exception as exc:
+            session.rollback()
+            print(f"⚠️ Import failed: {exc}")
+            sys.exit(1)
+
+        if args.dry_run:
+            session.rollback()
+        else:
+            session.commit()
+
+    for table, counts in results.items():
+        print(f"   {table:<11} {counts}")
+    if args.dry_run:
+        print("🔎 Dry run: changes rolled back")
+    else:
+        print("✅ Catalog imported successfully!")
+
+
+if __name__ == "__main__":
+    main()
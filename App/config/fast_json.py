@@ -0,0 +1,35 @@
+"""
+مسار سريع (اختياري لكل endpoint) لتحويل القوائم الكبيرة إلى JSON:
+- الـ endpoint يجلب الأعمدة المطلوبة فقط (tuples بدلاً من ORM objects)
+- التحقق والتحويل إلى bytes يتم مرة واحدة عبر pydantic TypeAdapter (Rust)
+  بدلاً من from_attributes على كل object ثم json.dumps
+- الـ endpoints التي لا تستدعي fast_json_response تبقى على المسار العادي لـ FastAPI
+- الناتج هو نفس JSON الـ response_model (by_alias)، لذلك لا يوجد مفتاح تشغيل عام:
+  الـ endpoint يختار المسار عند كتابته، والـ response_model يبقى للتوثيق فقط
+
+الاستخدام داخل الـ router:
+    ORDERS_ADAPTER = TypeAdapter(List[OrderListResponse])
+    return fast_json_response(ORDERS_ADAPTER, rows)
+"""
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from typing import Any, Iterable
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> list:
+    """تحويل صفوف SQLAlchemy (Row) إلى dicts بأسماء الأعمدة"""
+    return [row._asdict() for row in rows]
+
+
+def fast_json_bytes(adapter: TypeAdapter, data: Any) -> bytes:
+    """التحقق من البيانات وتحويلها إلى JSON bytes في خطوة واحدة"""
+    return adapter.dump_json(adapter.validate_python(data), by_alias=True)
+
+
+def fast_json_response(adapter: TypeAdapter, data: Any, status_code: int = 200) -> Response:
+    """استجابة JSON جاهزة من fast_json_bytes"""
+    return Response(
+        content=fast_json_bytes(adapter, data),
+        status_code=status_code,
+        media_type="application/json"
+    )
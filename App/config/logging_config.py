@@ -0,0 +1,92 @@
+"""
+إعداد الـ logging المركزي للتطبيق:
+- الـ handlers الفعلية (ملف + console) تعمل في thread منفصل عبر QueueHandler/QueueListener
+  فلا ينتظر الطلب الكتابة على القرص
+- ملف السجل بصيغة JSON (سطر لكل حدث) مع تدوير حسب الحجم
+- مستوى لكل module عبر LOG_LEVELS
+
+يتم استدعاء setup_logging() مرة واحدة من main.py،
+وباقي الملفات تستخدم logging.getLogger(...) فقط بدون handlers خاصة بها.
+"""
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from datetime import datetime, timezone
+import logging
+import atexit
+import queue
+import json
+import os
+
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_CONSOLE_FORMAT = os.getenv("LOG_CONSOLE_FORMAT", "text").lower()
+
+# مثال: LOG_LEVELS="Routers.order_api=WARNING,sql_timing=INFO"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """سطر JSON لكل سجل (يحافظ على النص العربي كما هو)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _parse_module_levels(value: str) -> dict:
+    levels = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    """تهيئة الـ logging مرة واحدة (الاستدعاءات التالية لا تفعل شيئاً)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    file_handler = RotatingFileHandler(
+        LOG_FILE,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler()
+    if LOG_CONSOLE_FORMAT == "json":
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
+
+    for name, level in _parse_module_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
@@ -0,0 +1,75 @@
+"""
+قياس زمن بدء تشغيل الـ worker (استيراد main.py حتى تجهيز الـ app):
+- startup_checkpoint("phase") تسجل الزمن منذ الـ checkpoint السابق
+  والـ modules الجديدة التي تم تحميلها في هذه المرحلة (مجمعة حسب الـ package)
+- report_startup() تسجل الإجمالي دائماً، وتحذر إذا تجاوز STARTUP_BUDGET_MS
+- STARTUP_PROFILE=1 لطباعة التفصيل الكامل (المراحل + أثقل الـ packages)
+
+يجب استيراد هذا الملف أولاً في main.py (يعتمد على stdlib فقط) حتى يشمل القياس استيراد fastapi نفسه.
+للتفصيل على مستوى كل module:  python -X importtime -c "import main" 2> importtime.log
+"""
+from collections import Counter
+from typing import List, Tuple
+import logging
+import time
+import sys
+import os
+
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "").lower() in ("1", "true", "yes")
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "2000"))
+
+# عدد الـ packages الأثقل (حسب عدد الـ modules المحملة) في التقرير
+TOP_PACKAGES = 10
+
+logger = logging.getLogger("startup")
+
+_started = time.perf_counter()
+_last = _started
+_seen_modules = set(sys.modules)
+_phases: List[Tuple[str, float, Counter]] = []
+
+
+def startup_checkpoint(phase: str) -> None:
+    """إنهاء المرحلة الحالية باسم phase وبدء مرحلة جديدة"""
+    global _last, _seen_modules
+
+    now = time.perf_counter()
+    loaded = set(sys.modules)
+    packages = Counter(name.partition(".")[0] for name in loaded - _seen_modules)
+
+    _phases.append((phase, (now - _last) * 1000, packages))
+    _last = now
+    _seen_modules = loaded
+
+
+def total_startup_ms() -> float:
+    return (_last - _started) * 1000
+
+
+def format_startup_report() -> str:
+    lines = [f"Startup breakdown ({total_startup_ms():.0f} ms, budget {STARTUP_BUDGET_MS:.0f} ms):"]
+    for phase, elapsed_ms, packages in _phases:
+        lines.append(f"  {phase:<24} {elapsed_ms:8.1f} ms  {sum(packages.values()):4d} modules")
+
+    all_packages = sum((packages for _, _, packages in _phases), Counter())
+    if all_packages:
+        lines.append("  Heaviest packages (modules loaded):")
+        for package, count in all_packages.most_common(TOP_PACKAGES):
+            lines.append(f"    {package:<22} {count:4d}")
+    return "\n".join(lines)
+
+
+def report_startup() -> None:
+    """يُستدعى مرة واحدة في نهاية main.py بعد آخر checkpoint"""
+    total = total_startup_ms()
+
+    if STARTUP_PROFILE:
+        # print وليس logger: التقرير مطلوب حتى لو كان مستوى الـ logging أعلى من INFO
+        print(format_startup_report(), file=sys.stderr, flush=True)
+
+    if total > STARTUP_BUDGET_MS:
+        slowest = max(_phases, key=lambda phase: phase[1])[0] if _phases else "-"
+        logger.warning("زمن بدء التشغيل %.0f ms تجاوز الحد %.0f ms (أبطأ مرحلة: %s)",
+                       total, STARTUP_BUDGET_MS, slowest)
+    else:
+        logger.info("زمن بدء التشغيل %.0f ms (الحد %.0f ms)", total, STARTUP_BUDGET_MS)
@@ -1,11 +1,27 @@
+# يجب أن يكون أول import حتى يشمل قياس بدء التشغيل استيراد fastapi نفسه
+from config.startup_profiler import startup_checkpoint, report_startup
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from Database.db_connect import Base, engine
+from config.logging_config import setup_logging
+setup_logging()
+startup_checkpoint("framework + logging")
+
+from Database.db_connect import engine, read_engine
+from Database.schema_check import check_schema_revision
 from config import response
+from Service.Compression import CompressionMiddleware
+from Service.Images import build_image_index
+from Service.Monitoring import (MetricsMiddleware,
+                               SQLTimingMiddleware,
+                               install_sql_hooks,
+                               render_metrics,
+                               CONTENT_TYPE_LATEST)
+startup_checkpoint("database + services")
 from Routers import (category_api,
                      size_type_api,
                      user_api,
@@ -14,15 +30,25 @@ from Routers import (category_api,
                      payment_api,
                      shift_management,
                      order_api,
-                     invoice_api)
+                     invoice_api,
+                     image_api,
+                     export_api)
+startup_checkpoint("routers")
 
-# حذف الجداول القديمة وإعادة إنشائها (مؤقتاً للتطوير)
-# Base.metadata.drop_all(bind=engine)
+# الجداول تُنشأ وتُعدل عبر Alembic (cd App && alembic upgrade head)
+# هنا فقط نتأكد أن قاعدة البيانات على آخر migration ونتوقف فوراً إذا لم تكن
+check_schema_revision(engine)
+startup_checkpoint("schema check")
+
+# فهرس hash الصور لبناء روابط ثابتة (immutable) للصور
+build_image_index()
+startup_checkpoint("image index")
 
-Base.metadata.create_all(bind=engine)
 app = FastAPI(title="E-Commerce System 'Wempy'")
 
 # Static Files - لعرض الصور
+# روابط ImageUrl العادية (بدون hash) للتوافق مع العملاء الحاليين، لذلك بدون Cache-Control immutable
+# الروابط الثابتة (hash المحتوى) في ImageVariants عبر /image_variants
 app.mount("/images", StaticFiles(directory="Static_Data/images"), name="images")
 
 # Include routers
@@ -39,6 +65,8 @@ app.include_router(payment_api.payment_router)
 app.include_router(shift_management.router)
 app.include_router(order_api.router)
 app.include_router(invoice_api.router)
+app.include_router(image_api.router)
+app.include_router(export_api.router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -48,6 +76,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics - عدد الطلبات وزمن الاستجابة لكل endpoint
+app.add_middleware(MetricsMiddleware)
+
+# SQL - عدد الاستعلامات ووقتها لكل طلب (Server-Timing) + سجل الاستعلامات البطيئة
+install_sql_hooks(engine)
+if read_engine is not None:
+    install_sql_hooks(read_engine)
+app.add_middleware(SQLTimingMiddleware)
+
+# Compression - gzip/brotli حسب Accept-Encoding (الكتالوج يأتي مضغوطاً مسبقاً من الكاش)
+app.add_middleware(CompressionMiddleware)
+startup_checkpoint("app setup")
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request, exc):
     if "/register" in request.url.path:
@@ -56,4 +101,6 @@ async def validation_exception_handler(request, exc):
         message = response.LOGIN_VALIDATION_ERROR
     else:
         message = "البيانات غير صحيحة"
-    return JSONResponse(status_code=422, content={"error": message})
\ No newline at end of file
+    return JSONResponse(status_code=422, content={"error": message})
+
+report_startup()
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Unit tests للأجزاء التي لا تحتاج قاعدة بيانات
+
+cd App
+python -m pytest -q
+"""
+from pathlib import Path
+import sys
+import os
+
+# إضافة مجلد App إلى Python path (نفس Performance/benchmarks.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# استيراد الـ models يتطلب DATABASE_URL، الاختبارات لا تتصل بقاعدة البيانات
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,67 @@
+import threading
+import pytest
+
+from Service.Cache import catalog_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    catalog_cache.invalidate_catalog()
+    yield
+    catalog_cache.invalidate_catalog()
+
+
+def test_entry_is_cached():
+    calls = []
+
+    def build(db) -> bytes:
+        calls.append(db)
+        return b'[{"id": 1}]'
+
+    first = catalog_cache._get_entry("products", build)
+    second = catalog_cache._get_entry("products", build)
+
+    assert first is second
+    assert first.raw == b'[{"id": 1}]'
+    assert "gzip" in first.encoded
+    assert len(calls) == 1
+
+
+def test_invalidate_during_build_is_not_stored():
+    def build(db) -> bytes:
+        # تعديل على الكتالوج أثناء البناء
+        catalog_cache.invalidate_catalog()
+        return b"[]"
+
+    entry = catalog_cache._get_entry("products", build)
+
+    assert entry.raw == b"[]"
+    assert "products" not in catalog_cache._entries
+
+
+def test_invalidate_does_not_wait_for_build():
+    building = threading.Event()
+    release = threading.Event()
+
+    def slow_build(db) -> bytes:
+        building.set()
+        release.wait(5)
+        return b"[]"
+
+    thread = threading.Thread(target=catalog_cache._get_entry, args=("variants", slow_build))
+    thread.start()
+    assert building.wait(5)
+
+    invalidated = threading.Thread(target=catalog_cache.invalidate_catalog)
+    invalidated.start()
+    invalidated.join(1)
+    # البناء ما زال جارياً والمسح انتهى
+    assert not invalidated.is_alive()
+
+    # كتالوج آخر يُبنى بدون انتظار البناء الجاري
+    other = catalog_cache._get_entry("categories", lambda db: b"[1]")
+    assert other.raw == b"[1]"
+
+    release.set()
+    thread.join(5)
+    assert "variants" not in catalog_cache._entries
@@ -0,0 +1,120 @@
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+import gzip
+import pytest
+
+from Service.Compression import CompressionMiddleware, choose_encoding
+from Service.Compression import compression_middleware
+
+LARGE_JSON = b'{"items": [' + b",".join(b'{"id": %d, "name": "test"}' % i for i in range(200)) + b"]}"
+
+
+@pytest.fixture
+def no_brotli(monkeypatch):
+    monkeypatch.setattr(compression_middleware, "brotli", None)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=1.0, gzip;q=0.8", "br"),
+    ("BR", "br"),
+    ("gzip", "gzip"),
+    ("*", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=abc", None),
+    ("deflate", None),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_choose_encoding_without_brotli(no_brotli):
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+
+
+def _client() -> TestClient:
+    def large(request):
+        return Response(LARGE_JSON, media_type="application/json")
+
+    def small(request):
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    def image(request):
+        return Response(b"\xff\xd8" * 1000, media_type="image/jpeg")
+
+    def precompressed(request):
+        return Response(gzip.compress(LARGE_JSON), media_type="application/json",
+                        headers={"Content-Encoding": "gzip"})
+
+    def stream(request):
+        return StreamingResponse(iter([b"a,b\r\n"] + [b"1,2\r\n"] * 500), media_type="text/csv")
+
+    app = Starlette(routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/image", image),
+        Route("/precompressed", precompressed),
+        Route("/stream", stream),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def _get(client: TestClient, path: str, accept_encoding: str):
+    # decode_content=False حتى نقرأ الـ body كما أرسله الـ middleware
+    request = client.build_request("GET", path, headers={"Accept-Encoding": accept_encoding})
+    response = client.send(request, stream=True)
+    body = b"".join(response.iter_raw())
+    return response, body
+
+
+def test_large_json_gzip(no_brotli):
+    response, body = _get(_client(), "/large", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(body)
+    assert gzip.decompress(body) == LARGE_JSON
+
+
+def test_large_json_brotli():
+    brotli = pytest.importorskip("brotli")
+    response, body = _get(_client(), "/large", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(body) == LARGE_JSON
+
+
+def test_no_accepted_encoding_passthrough():
+    response, body = _get(_client(), "/large", "identity")
+    assert "content-encoding" not in response.headers
+    assert body == LARGE_JSON
+
+
+def test_small_body_not_compressed():
+    response, body = _get(_client(), "/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == b'{"ok": true}'
+
+
+def test_image_not_compressed():
+    response, body = _get(_client(), "/image", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == b"\xff\xd8" * 1000
+
+
+def test_precompressed_passthrough():
+    response, body = _get(_client(), "/precompressed", "gzip, br")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == LARGE_JSON
+
+
+def test_streaming_response_gzip(no_brotli):
+    response, body = _get(_client(), "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body) == b"a,b\r\n" + b"1,2\r\n" * 500
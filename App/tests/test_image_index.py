@@ -0,0 +1,82 @@
+import os
+import pytest
+
+from Service.Images import image_index
+
+
+@pytest.fixture
+def images_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_index, "IMAGES_DIR", tmp_path)
+    monkeypatch.setattr(image_index, "_entries", {})
+    monkeypatch.setattr(image_index, "_relative_by_digest", {})
+    (tmp_path / "bakery").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    calls = []
+    monkeypatch.setattr(image_index, "invalidate_catalog", lambda: calls.append(1))
+    return calls
+
+
+def _replace(path, content: bytes):
+    stat = path.stat()
+    path.write_bytes(content)
+    # نفس الثانية على بعض أنظمة الملفات: نضمن تغير mtime
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_build_and_lookup(images_dir, invalidations):
+    image = images_dir / "bakery" / "x.jpg"
+    image.write_bytes(b"one")
+
+    assert image_index.build_image_index() == 1
+    digest = image_index.digest_for("bakery/x.jpg")
+    assert len(digest) == image_index.DIGEST_LENGTH
+    assert image_index.path_for(digest) == image
+    assert invalidations == []
+
+
+def test_replaced_image_gets_new_digest(images_dir, invalidations):
+    image = images_dir / "bakery" / "x.jpg"
+    image.write_bytes(b"one")
+    old = image_index.digest_for("bakery/x.jpg")
+
+    _replace(image, b"two")
+
+    # الرابط القديم لا يخدم المحتوى الجديد
+    assert image_index.path_for(old) is None
+    new = image_index.digest_for("bakery/x.jpg")
+    assert new != old
+    assert image_index.path_for(new) == image
+    assert invalidations == [1]
+
+
+def test_touch_without_content_change(images_dir, invalidations):
+    image = images_dir / "bakery" / "x.jpg"
+    image.write_bytes(b"one")
+    digest = image_index.digest_for("bakery/x.jpg")
+
+    _replace(image, b"one")
+
+    assert image_index.digest_for("bakery/x.jpg") == digest
+    assert invalidations == []
+
+
+def test_deleted_image(images_dir, invalidations):
+    image = images_dir / "bakery" / "x.jpg"
+    image.write_bytes(b"one")
+    digest = image_index.digest_for("bakery/x.jpg")
+
+    image.unlink()
+
+    assert image_index.path_for(digest) is None
+    assert image_index.digest_for("bakery/x.jpg") is None
+    assert invalidations == [1]
+
+
+def test_path_outside_images_dir(images_dir, invalidations):
+    (images_dir.parent / "secret.txt").write_bytes(b"x")
+    assert image_index.digest_for("../secret.txt") is None
+    assert image_index.digest_for("bakery/missing.jpg") is None
@@ -0,0 +1,74 @@
+from decimal import Decimal
+import pytest
+
+from Database.pydantic_schema.orders_schema import OrderItemCreate
+from Service.Cache.price_table import VariantPrice
+from Service.Orders import price_order_items, PricedItem, PricingError
+
+VARIANTS = {
+    1: VariantPrice(Price=Decimal("10.00"), IsAvailable=True, IsCustomPrice=False),
+    2: VariantPrice(Price=Decimal("0.00"), IsAvailable=True, IsCustomPrice=True),
+    3: VariantPrice(Price=Decimal("25.50"), IsAvailable=False, IsCustomPrice=False),
+    4: VariantPrice(Price=Decimal("7.25"), IsAvailable=True, IsCustomPrice=False),
+}
+
+
+def test_regular_and_custom_price_items():
+    items = [
+        OrderItemCreate(VariantID=1, Quantity=2),
+        OrderItemCreate(VariantID=2, Quantity=1, CustomPrice=Decimal("15")),
+        OrderItemCreate(VariantID=4, Quantity=3, IsSada=True),
+    ]
+
+    priced, total = price_order_items(items, VARIANTS)
+
+    assert priced == [
+        PricedItem(VariantID=1, Quantity=2, UnitPrice=Decimal("10.00"), Subtotal=Decimal("20.00"), IsSada=False),
+        PricedItem(VariantID=2, Quantity=1, UnitPrice=Decimal("15"), Subtotal=Decimal("15"), IsSada=False),
+        PricedItem(VariantID=4, Quantity=3, UnitPrice=Decimal("7.25"), Subtotal=Decimal("21.75"), IsSada=True),
+    ]
+    assert total == Decimal("56.75")
+
+
+def test_custom_price_ignored_for_regular_variant():
+    priced, total = price_order_items(
+        [OrderItemCreate(VariantID=1, Quantity=1, CustomPrice=Decimal("99"))], VARIANTS)
+    assert priced[0].UnitPrice == Decimal("10.00")
+    assert total == Decimal("10.00")
+
+
+def test_empty_order():
+    assert price_order_items([], VARIANTS) == ([], Decimal("0.00"))
+
+
+def test_missing_variant():
+    with pytest.raises(PricingError) as error:
+        price_order_items([OrderItemCreate(VariantID=99, Quantity=1)], VARIANTS)
+    assert error.value.status_code == 404
+    assert "99" in error.value.message
+
+
+def test_unavailable_variant():
+    with pytest.raises(PricingError) as error:
+        price_order_items([OrderItemCreate(VariantID=3, Quantity=1)], VARIANTS)
+    assert error.value.status_code == 400
+
+
+def test_custom_price_required():
+    with pytest.raises(PricingError) as error:
+        price_order_items([OrderItemCreate(VariantID=2, Quantity=1)], VARIANTS)
+    assert error.value.status_code == 400
+
+
+def test_custom_price_minimum():
+    # الـ schema يرفض أقل من 10، model_construct لاختبار التحقق داخل price_order_items نفسها
+    item = OrderItemCreate.model_construct(VariantID=2, Quantity=1, CustomPrice=Decimal("9.99"), IsSada=False)
+    with pytest.raises(PricingError) as error:
+        price_order_items([item], VARIANTS)
+    assert error.value.status_code == 400
+
+
+def test_error_stops_at_first_invalid_item():
+    items = [OrderItemCreate(VariantID=1, Quantity=1), OrderItemCreate(VariantID=99, Quantity=1)]
+    with pytest.raises(PricingError):
+        price_order_items(items, VARIANTS)
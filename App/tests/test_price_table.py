@@ -0,0 +1,73 @@
+from collections import namedtuple
+from decimal import Decimal
+import pytest
+
+from Database.pydantic_schema.orders_schema import OrderItemCreate
+from Service.Cache.price_table import PriceTable, VariantPrice
+from Service.Orders import CUSTOM_SIZE_NAME, price_order_items
+
+Row = namedtuple("Row", ["VariantID", "Price", "IsAvailable", "SizeName"])
+
+ROWS = [
+    Row(1, Decimal("12.50"), True, "صغير"),
+    Row(2, Decimal("0.00"), True, CUSTOM_SIZE_NAME),
+    Row(3, Decimal("99999999.99"), False, "كبير"),
+    # variant بدون حجم (NULL من الـ outer join مع sizes)
+    Row(7, Decimal("5.05"), True, None),
+]
+
+
+@pytest.fixture
+def table() -> PriceTable:
+    return PriceTable(ROWS, version=1)
+
+
+def test_decimal_cents_round_trip(table):
+    price = table.get(1).Price
+    assert price == Decimal("12.50")
+    assert str(price) == "12.50"
+    assert table.get(3).Price == Decimal("99999999.99")
+    assert table.get(7).Price == Decimal("5.05")
+
+
+def test_float_price_from_driver():
+    # بعض الـ drivers (SQLite) ترجع Numeric كـ float
+    assert PriceTable([Row(1, 19.99, True, None)], version=1).get(1).Price == Decimal("19.99")
+
+
+def test_flags(table):
+    assert table.get(1) == VariantPrice(Decimal("12.50"), IsAvailable=True, IsCustomPrice=False)
+    assert table.get(2).IsCustomPrice is True
+    assert table.get(3).IsAvailable is False
+    assert table.get(7) == VariantPrice(Decimal("5.05"), IsAvailable=True, IsCustomPrice=False)
+
+
+@pytest.mark.parametrize("variant_id", [0, 4, 6, 8, 1000, -1, -7])
+def test_missing_variant_returns_default(table, variant_id):
+    assert table.get(variant_id) is None
+    assert table.get(variant_id, "missing") == "missing"
+
+
+def test_len_and_version(table):
+    assert len(table) == 4
+    assert table.version == 1
+
+
+def test_empty_table():
+    table = PriceTable([], version=1)
+    assert len(table) == 0
+    assert table.get(0) is None
+    assert table.get(1) is None
+
+
+def test_pricing_with_table(table):
+    items = [
+        OrderItemCreate(VariantID=1, Quantity=2),
+        OrderItemCreate(VariantID=2, Quantity=1, CustomPrice=Decimal("15")),
+        OrderItemCreate(VariantID=7, Quantity=3),
+    ]
+
+    priced, total = price_order_items(items, table)
+
+    assert [item.UnitPrice for item in priced] == [Decimal("12.50"), Decimal("15"), Decimal("5.05")]
+    assert total == Decimal("55.15")
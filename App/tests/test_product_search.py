@@ -0,0 +1,78 @@
+from collections import namedtuple
+import pytest
+
+from Service.Search import normalize_arabic
+from Service.Cache.search_index import ProductSearchIndex
+
+Row = namedtuple("Row", ["ProductID", "CategoryID", "Name", "Description", "ImageUrl", "NormalizedName"])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("  فَطِيرَة  بالـجبنة ", "فطيره بالجبنه"),
+    ("أإآٱ", "اااا"),
+    ("مكرونة بشاميل", "مكرونه بشاميل"),
+    ("حلوى", "حلوي"),
+    ("مؤمن شاطئ", "مومن شاطي"),
+    ("رحمٰن", "رحمن"),
+    ("Pizza  MARGHERITA", "pizza margherita"),
+    ("فول ١٢٣", "فول ١٢٣"),
+    ("", ""),
+])
+def test_normalize_arabic(text, expected):
+    assert normalize_arabic(text) == expected
+
+
+def _index(*names: str) -> ProductSearchIndex:
+    return ProductSearchIndex(
+        Row(product_id, 1, name, None, None, normalize_arabic(name))
+        for product_id, name in enumerate(names, start=1)
+    )
+
+
+def _ids(results) -> list:
+    return [product["ProductID"] for product in results]
+
+
+def test_search_prefix_of_each_word():
+    index = _index("فول اسكندراني", "فول سادة", "طعمية")
+
+    assert _ids(index.search(normalize_arabic("فول اس"), 10)) == [1]
+    assert _ids(index.search(normalize_arabic("اسكن"), 10)) == [1]
+    assert index.search(normalize_arabic("فول ط"), 10) == []
+
+
+def test_search_without_article():
+    index = _index("فطيرة بالعسل", "عسل أبيض", "الجبنة الرومي")
+
+    assert sorted(_ids(index.search("عسل", 10))) == [1, 2]
+    assert _ids(index.search("جبن", 10)) == [3]
+    assert _ids(index.search("الجبن", 10)) == [3]
+
+
+def test_search_normalized_spelling():
+    index = _index("فطيرة", "مُهلبيّة")
+
+    assert _ids(index.search(normalize_arabic("فطيره"), 10)) == [1]
+    assert _ids(index.search(normalize_arabic("مهلبية"), 10)) == [2]
+
+
+def test_search_ranking_and_limit():
+    index = _index("ساندوتش فول بالبيض", "فول بالزيت الحار", "فول")
+
+    # الأسماء التي تبدأ بالنص أولاً ثم الأقصر
+    assert _ids(index.search("فول", 10)) == [3, 2, 1]
+    assert _ids(index.search("فول", 2)) == [3, 2]
+
+
+def test_search_result_columns():
+    index = _index("طعمية")
+    assert index.search("طعم", 10) == [
+        {"ProductID": 1, "CategoryID": 1, "Name": "طعمية", "Description": None, "ImageUrl": None}
+    ]
+    assert len(index) == 1
+
+
+def test_search_no_match_or_empty_query():
+    index = _index("طعمية")
+    assert index.search("بيتزا", 10) == []
+    assert index.search("", 10) == []
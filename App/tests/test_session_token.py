@@ -0,0 +1,95 @@
+from fastapi import HTTPException
+import base64
+import json
+import uuid
+import pytest
+
+from Service.Auth import session_token
+from Service.Auth import InvalidTokenError, issue_token, verify_token, get_token_user_id
+
+USER_ID = uuid.UUID("3f0e7a52-2c1b-4d8e-9a6f-1b2c3d4e5f60")
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(session_token, "SESSION_TOKEN_SECRET", b"test-secret")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def test_issue_and_verify():
+    token = issue_token(USER_ID)
+    assert verify_token(token) == USER_ID
+
+
+def test_tokens_disabled_without_secret(monkeypatch):
+    token = issue_token(USER_ID)
+    monkeypatch.setattr(session_token, "SESSION_TOKEN_SECRET", b"")
+
+    assert issue_token(USER_ID) is None
+    with pytest.raises(InvalidTokenError):
+        verify_token(token)
+
+
+def test_tampered_payload():
+    payload, signature = issue_token(USER_ID).split(".")
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    claims["uid"] = str(uuid.uuid4())
+
+    with pytest.raises(InvalidTokenError):
+        verify_token(f"{_b64(json.dumps(claims).encode())}.{signature}")
+
+
+def test_tampered_signature():
+    payload, signature = issue_token(USER_ID).split(".")
+    forged = "A" if signature[0] != "A" else "B"
+
+    with pytest.raises(InvalidTokenError):
+        verify_token(f"{payload}.{forged}{signature[1:]}")
+
+
+def test_other_secret(monkeypatch):
+    token = issue_token(USER_ID)
+    monkeypatch.setattr(session_token, "SESSION_TOKEN_SECRET", b"another-secret")
+
+    with pytest.raises(InvalidTokenError):
+        verify_token(token)
+
+
+def test_expired(monkeypatch):
+    monkeypatch.setattr(session_token, "SESSION_TOKEN_TTL_SECONDS", -1)
+    token = issue_token(USER_ID)
+
+    with pytest.raises(InvalidTokenError):
+        verify_token(token)
+
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b.c", "!!!.???"])
+def test_malformed(token):
+    with pytest.raises(InvalidTokenError):
+        verify_token(token)
+
+
+def test_signed_payload_without_uid():
+    payload = b'{"exp":99999999999}'
+    token = f"{_b64(payload)}.{_b64(session_token._sign(payload))}"
+
+    with pytest.raises(InvalidTokenError):
+        verify_token(token)
+
+
+def test_dependency():
+    token = issue_token(USER_ID)
+
+    assert get_token_user_id(f"Bearer {token}") == USER_ID
+    assert get_token_user_id(f"bearer {token}") == USER_ID
+    # بدون token أو بصيغة أخرى: الـ endpoint يستعلم عن المستخدم كالمعتاد
+    assert get_token_user_id(None) is None
+    assert get_token_user_id(f"Basic {token}") is None
+
+    with pytest.raises(HTTPException) as error:
+        get_token_user_id("Bearer invalid.token")
+    assert error.value.status_code == 401
+    assert error.value.headers == {"WWW-Authenticate": "Bearer"}
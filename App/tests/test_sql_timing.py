@@ -0,0 +1,66 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+import pytest
+
+from Service.Monitoring import SQLTimingMiddleware, install_sql_hooks
+from Service.Monitoring.sql_timing import normalize_sql
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    install_sql_hooks(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+    yield engine
+    engine.dispose()
+
+
+def test_failed_statement_does_not_leave_start_time(engine):
+    with engine.connect() as connection:
+        connection.execute(text("INSERT INTO items (id) VALUES (1)"))
+        for _ in range(3):
+            with pytest.raises(IntegrityError):
+                connection.execute(text("INSERT INTO items (id) VALUES (1)"))
+        assert "query_start_time" not in connection.info
+
+        connection.execute(text("SELECT 1"))
+        assert "query_start_time" not in connection.info
+
+
+def _client(engine) -> TestClient:
+    def regular(request):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return JSONResponse({"ok": True})
+
+    def streamed(request):
+        def rows():
+            with engine.connect() as connection:
+                yield str(connection.execute(text("SELECT 1")).scalar()).encode()
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    app = Starlette(routes=[Route("/regular", regular), Route("/streamed", streamed)])
+    app.add_middleware(SQLTimingMiddleware)
+    return TestClient(app)
+
+
+def test_server_timing_counts_queries(engine):
+    response = _client(engine).get("/regular")
+    assert response.headers["server-timing"].endswith('desc="2 queries"')
+
+
+def test_no_server_timing_for_streamed_body(engine):
+    response = _client(engine).get("/streamed")
+    assert response.text == "1"
+    assert "server-timing" not in response.headers
+
+
+def test_normalize_sql():
+    sql = "SELECT *  FROM t\n WHERE a = 'x''y' AND b IN (?, ?, ?) AND c = 12.5"
+    assert normalize_sql(sql) == "SELECT * FROM t WHERE a = ? AND b IN (...) AND c = ?"
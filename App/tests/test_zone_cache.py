@@ -0,0 +1,58 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from time import monotonic
+import pytest
+
+from Service.Cache import zone_cache
+from Service.Cache.zone_cache import ZoneInfo
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """_load بدون قاعدة بيانات: يرجع محتوى table ويسجل عدد مرات التحميل"""
+    table = {1: ZoneInfo(1, "منطقة أ", Decimal("20.00"))}
+    calls = []
+
+    def fake_load():
+        calls.append(1)
+        zone_cache._zones = dict(table)
+        zone_cache._loaded_at = monotonic()
+        return zone_cache._zones
+
+    monkeypatch.setattr(zone_cache, "_load", fake_load)
+    monkeypatch.setattr(zone_cache, "_zones", None)
+    monkeypatch.setattr(zone_cache, "_loaded_at", 0.0)
+    return SimpleNamespace(calls=calls, table=table)
+
+
+def test_known_zone_loads_once(loads):
+    assert zone_cache.get_zone(1).DeliveryCost == Decimal("20.00")
+    assert zone_cache.get_zone(1).ZoneName == "منطقة أ"
+    assert len(loads.calls) == 1
+
+
+def test_unknown_zone_does_not_reload_every_call(loads):
+    for _ in range(20):
+        assert zone_cache.get_zone(99) is None
+    assert len(loads.calls) == 1
+
+
+def test_unknown_zone_reloads_after_interval(loads, monkeypatch):
+    assert zone_cache.get_zone(2) is None
+
+    # منطقة جديدة من worker آخر، بعد انتهاء ZONE_MISS_RELOAD_SECONDS
+    loads.table[2] = ZoneInfo(2, "منطقة ب", Decimal("15.00"))
+    monkeypatch.setattr(zone_cache, "_loaded_at", monotonic() - zone_cache.ZONE_MISS_RELOAD_INTERVAL - 1)
+
+    assert zone_cache.get_zone(2).ZoneName == "منطقة ب"
+    assert len(loads.calls) == 2
+
+
+def test_invalidate_reloads_immediately(loads):
+    assert zone_cache.get_zone(3) is None
+    loads.table[3] = ZoneInfo(3, "منطقة ج", Decimal("10.00"))
+
+    zone_cache.invalidate_zones()
+
+    assert zone_cache.get_zone(3).ZoneID == 3
+    assert len(loads.calls) == 2